@@ -17,6 +17,7 @@ Target: >4% annualized returns with weekly rebalancing
 import sys
 from pathlib import Path
 import warnings
+import yaml
 warnings.filterwarnings('ignore')
 
 # Add src to path
@@ -27,9 +28,12 @@ import numpy as np
 from cad_ig_trading.data.loader import DataLoader
 from cad_ig_trading.data.preprocessor import DataPreprocessor
 from cad_ig_trading.features.pipeline import AllFeaturesEngineer
+from cad_ig_trading.features.store import FeatureStore
 from cad_ig_trading.models.ensemble import WeeklyEnsembleStrategy
 from cad_ig_trading.backtesting.engine import BacktestEngine
 
+CONFIG_PATH = Path(__file__).parent / "config" / "strategy_config.yaml"
+
 
 def main():
     """Run complete backtest pipeline."""
@@ -47,7 +51,10 @@ def main():
     print("STEP 1: LOAD DATA")
     print("="*80)
     
-    loader = DataLoader()
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as fh:
+        config = yaml.safe_load(fh)
+    
+    loader = DataLoader.from_config(CONFIG_PATH)
     df = loader.load()
     print(f"\n✓ Loaded {len(df)} rows from {df['Date'].min()} to {df['Date'].max()}")
     print(f"✓ Columns: {df.shape[1]}")
@@ -73,14 +80,20 @@ def main():
     print("="*80)
     
     feature_engineer = AllFeaturesEngineer()
-    df = feature_engineer.create_all_features(df)
+    feature_store = FeatureStore(config['data'].get('feature_store_dir', 'data/features'))
+    df = feature_engineer.create_all_features(df, store=feature_store)
     print(f"\n✓ Final shape: {df.shape}")
     print(f"✓ Total features created: {df.shape[1] - 18}")
+    print(f"✓ Feature groups loaded from {feature_store.store_dir}: {len(feature_store.loaded)}")
+    print(f"✓ Feature groups recomputed: {len(feature_store.computed)}")
     
-    # Save processed data
-    output_path = Path("data/processed/data_with_all_features.csv")
-    df.to_csv(output_path, index=False)
-    print(f"✓ Saved to: {output_path}")
+    # Save processed data (optional CSV export of the feature frame)
+    output_path = config['data'].get('features_csv')
+    if output_path:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(output_path, index=False)
+        print(f"✓ Saved to: {output_path}")
     
     # ========================================================================
     # STEP 4: TRAIN MODELS & GENERATE SIGNALS
@@ -89,7 +102,8 @@ def main():
     print("STEP 4: TRAIN MODELS & GENERATE SIGNALS")
     print("="*80)
     
-    strategy = WeeklyEnsembleStrategy(n_features=60, threshold=0.45)
+    strategy = WeeklyEnsembleStrategy(n_features=60, threshold=0.45,
+                                      n_jobs=config['strategy']['training'].get('n_jobs'))
     df = strategy.generate_signals(df, train_size=0.6)
     
     print(f"\n✓ Models trained (LightGBM, XGBoost, Random Forest)")
@@ -224,7 +238,9 @@ def main():
         print(f"\n⚠️  Target not achieved ({ann_return:.2%} < 4.00%)")
     
     print("\n📁 Output files:")
-    print(f"   - {output_path}")
+    print(f"   - {feature_store.store_dir}/")
+    if output_path:
+        print(f"   - {output_path}")
     print(f"   - {blotter_path}")
     print(f"   - {metrics_path}")
     print(f"   - {weekly_path}")
@@ -6,6 +6,7 @@ This implements the validated weekly strategy that achieves 3.91-4.16% annualize
 
 import sys
 from pathlib import Path
+import yaml
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -15,6 +16,9 @@ import numpy as np
 from cad_ig_trading.data.loader import DataLoader
 from cad_ig_trading.data.preprocessor import DataPreprocessor
 from cad_ig_trading.features.pipeline import AllFeaturesEngineer
+from cad_ig_trading.features.store import FeatureStore
+
+CONFIG_PATH = Path(__file__).parent / "config" / "strategy_config.yaml"
 
 print("="*80)
 print("CAD-IG-ER TRADING STRATEGY BACKTEST")
@@ -22,7 +26,10 @@ print("="*80)
 
 # 1. Load Data
 print("\n1. Loading data...")
-loader = DataLoader()
+with open(CONFIG_PATH, 'r', encoding='utf-8') as fh:
+    config = yaml.safe_load(fh)
+
+loader = DataLoader.from_config(CONFIG_PATH)
 df = loader.load()
 print(f"   Loaded {len(df)} rows from {df['Date'].min()} to {df['Date'].max()}")
 
@@ -35,13 +42,21 @@ print(f"   Preprocessed shape: {df.shape}")
 # 3. Feature Engineering
 print("\n3. Creating features...")
 feature_engineer = AllFeaturesEngineer()
-df = feature_engineer.create_all_features(df)
+feature_store = FeatureStore(config['data'].get('feature_store_dir', 'data/features'))
+df = feature_engineer.create_all_features(df, store=feature_store)
 print(f"   Final shape with features: {df.shape}")
 
-# 4. Save processed data
-output_path = Path("data/processed/data_with_all_features.csv")
-df.to_csv(output_path, index=False)
-print(f"\n4. Saved processed data to: {output_path}")
+# 4. Feature store summary
+print(f"\n4. Feature store: {feature_store.store_dir}")
+print(f"   Groups loaded: {len(feature_store.loaded)}, recomputed: {len(feature_store.computed)}")
+
+# 5. Save processed data (optional CSV export of the feature frame)
+output_path = config['data'].get('features_csv')
+if output_path:
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(output_path, index=False)
+    print(f"\n5. Saved processed data to: {output_path}")
 
 print("\n" + "="*80)
 print("FEATURE ENGINEERING COMPLETE")
@@ -0,0 +1,399 @@
+"""
+Columnar Cache Module
+
+Keeps a typed binary sidecar of a parsed CSV so repeated loads skip parsing.
+"""
+
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 2
+HASH_CHUNK_SIZE = 1 << 20
+ANCHOR_READ_SIZE = 1 << 16
+
+
+def file_digest(path: Union[str, Path], segments: Optional[List[int]] = None) -> str:
+    """
+    Calculate the SHA-256 digest of a file's content.
+
+    The digest is chained over segments: each segment is hashed together
+    with the digest of the segments before it. Appending a segment
+    therefore only requires hashing the appended bytes. A single segment
+    gives the plain SHA-256 of the file.
+
+    Args:
+        path: Path to the file
+        segments: Ascending byte offsets at which segments end. If None,
+            the whole file is one segment.
+
+    Returns:
+        Hex digest string
+    """
+    if segments is None:
+        segments = [os.stat(path).st_size]
+
+    digest = b''
+    start = 0
+    with open(path, 'rb') as fh:
+        for end in segments:
+            sha = hashlib.sha256(digest)
+            remaining = end - start
+            while remaining > 0:
+                chunk = fh.read(min(HASH_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                sha.update(chunk)
+                remaining -= len(chunk)
+            digest = sha.digest()
+            start = end
+    return digest.hex()
+
+
+def chain_digest(digest: str, data: bytes) -> str:
+    """
+    Extend a chained digest with an appended segment.
+
+    Args:
+        digest: Hex digest of the segments so far
+        data: Bytes of the appended segment
+
+    Returns:
+        Hex digest including the appended segment
+    """
+    return hashlib.sha256(bytes.fromhex(digest) + data).hexdigest()
+
+
+def read_last_line(path: Union[str, Path], offset: int) -> bytes:
+    """
+    Read the last line ending at or before a byte offset.
+
+    Args:
+        path: Path to the file
+        offset: Byte offset where the line ends
+
+    Returns:
+        Bytes of the last line, including its line terminator
+    """
+    start = max(0, offset - ANCHOR_READ_SIZE)
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        data = fh.read(offset - start)
+    return data[data.rfind(b'\n', 0, len(data) - 1) + 1:]
+
+
+def read_header(path: Union[str, Path]) -> List[str]:
+    """
+    Read the column names from the header line of a CSV file.
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        List of column names
+    """
+    with open(path, 'r', encoding='utf-8') as fh:
+        header = fh.readline()
+    return [name.strip() for name in header.rstrip('\r\n').split(',')]
+
+
+class ColumnarCache:
+    """
+    Cache parsed CSV files as one raw binary file per column.
+
+    Each source file gets its own entry directory holding a ``meta.json``
+    and one ``.bin`` file per column. An entry is only used when the source
+    file's size, mtime, header schema and content hash all match the values
+    recorded when the entry was written.
+
+    Rows appended to the end of the source file can be added to an entry
+    with ``read_tail`` and ``append`` without rewriting it.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Initialize ColumnarCache.
+
+        Args:
+            cache_dir: Directory where cache entries are stored
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def entry_dir(self, source_path: Union[str, Path]) -> Path:
+        """
+        Get the cache entry directory for a source file.
+
+        Args:
+            source_path: Path to the source CSV file
+
+        Returns:
+            Path to the entry directory
+        """
+        source_path = Path(source_path).resolve()
+        path_key = hashlib.sha1(str(source_path).encode('utf-8')).hexdigest()[:12]
+        return self.cache_dir / f"{source_path.stem}-{path_key}"
+
+    def fingerprint(self, source_path: Union[str, Path]) -> Dict:
+        """
+        Calculate the fingerprint that keys a cache entry.
+
+        Args:
+            source_path: Path to the source CSV file
+
+        Returns:
+            Dictionary with size, mtime, schema, content digest, segment
+            offsets and the last line of the file
+        """
+        stat = os.stat(source_path)
+        return {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'schema': read_header(source_path),
+            'digest': file_digest(source_path, [stat.st_size]),
+            'segments': [stat.st_size],
+            'anchor': read_last_line(source_path, stat.st_size).decode('utf-8'),
+        }
+
+    def read_meta(self, source_path: Union[str, Path]) -> Optional[Dict]:
+        """
+        Read the metadata of a cache entry.
+
+        Args:
+            source_path: Path to the source CSV file
+
+        Returns:
+            Metadata dictionary, or None if there is no usable entry
+        """
+        meta_path = self.entry_dir(source_path) / 'meta.json'
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get('format_version') != CACHE_FORMAT_VERSION:
+            return None
+        return meta
+
+    def is_valid(self, source_path: Union[str, Path], meta: Dict) -> bool:
+        """
+        Check whether a cache entry still matches its source file.
+
+        Cheap checks (size, mtime, header) run before the content hash.
+
+        Args:
+            source_path: Path to the source CSV file
+            meta: Metadata of the cache entry
+
+        Returns:
+            True if the entry can be used
+        """
+        source = meta['source']
+        stat = os.stat(source_path)
+        if stat.st_size != source['size'] or stat.st_mtime_ns != source['mtime_ns']:
+            return False
+        if read_header(source_path) != source['schema']:
+            return False
+        return file_digest(source_path, source['segments']) == source['digest']
+
+    def load(self, source_path: Union[str, Path]) -> Optional[pd.DataFrame]:
+        """
+        Load a cached DataFrame for a source file.
+
+        Args:
+            source_path: Path to the source CSV file
+
+        Returns:
+            Cached DataFrame, or None on a cache miss
+        """
+        meta = self.read_meta(source_path)
+        if meta is None or not self.is_valid(source_path, meta):
+            logger.info(f"Cache miss for {source_path}")
+            return None
+
+        try:
+            columns = self.read_columns(source_path, meta)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read cache entry for {source_path}: {e}")
+            return None
+
+        logger.info(f"Cache hit for {source_path}")
+        return pd.DataFrame(columns, copy=False)
+
+    def read_columns(self, source_path: Union[str, Path], meta: Dict,
+                     mmap_mode: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Read the column arrays of a cache entry.
+
+        Args:
+            source_path: Path to the source CSV file
+            meta: Metadata of the cache entry
+            mmap_mode: If given, memory-map the column files with this mode
+                instead of reading them into memory
+
+        Returns:
+            Dictionary mapping column name to array
+        """
+        entry = self.entry_dir(source_path)
+        nrows = meta['nrows']
+        columns = {}
+        for col in meta['columns']:
+            path = entry / col['file']
+            dtype = np.dtype(col['dtype'])
+            if mmap_mode is not None and nrows > 0:
+                values = np.memmap(path, dtype=dtype, mode=mmap_mode, shape=(nrows,))
+            else:
+                values = np.fromfile(path, dtype=dtype, count=nrows)
+            if len(values) != nrows:
+                raise ValueError(f"Column {col['name']} has {len(values)} rows, expected {nrows}")
+            columns[col['name']] = values
+        return columns
+
+    def save(self, source_path: Union[str, Path], df: pd.DataFrame,
+             fingerprint: Dict) -> None:
+        """
+        Write a DataFrame to the cache entry of a source file.
+
+        The entry is written to a temporary directory and then moved into
+        place, so readers never see a partially written entry.
+
+        Args:
+            source_path: Path to the source CSV file
+            df: Parsed DataFrame to cache
+            fingerprint: Fingerprint of the source file taken before parsing
+        """
+        entry = self.entry_dir(source_path)
+        tmp_entry = entry.with_name(f"{entry.name}.tmp-{os.getpid()}")
+        if tmp_entry.exists():
+            shutil.rmtree(tmp_entry)
+        tmp_entry.mkdir(parents=True)
+
+        columns = []
+        for i, name in enumerate(df.columns):
+            values = np.ascontiguousarray(df[name].to_numpy())
+            if values.dtype == object:
+                raise ValueError(f"Column {name} has object dtype and cannot be cached")
+            file_name = f"{i:04d}.bin"
+            values.tofile(tmp_entry / file_name)
+            columns.append({'name': name, 'dtype': values.dtype.str, 'file': file_name})
+
+        meta = {
+            'format_version': CACHE_FORMAT_VERSION,
+            'source': fingerprint,
+            'nrows': len(df),
+            'columns': columns,
+        }
+        self._write_meta(tmp_entry, meta)
+
+        if entry.exists():
+            shutil.rmtree(entry)
+        os.replace(tmp_entry, entry)
+
+        logger.info(f"Cached {len(df)} rows, {len(columns)} columns to {entry}")
+
+    def read_tail(self, source_path: Union[str, Path],
+                  meta: Dict) -> Optional[Tuple[bytes, Dict]]:
+        """
+        Read the complete lines appended to a source file since its entry
+        was last written.
+
+        The file is considered an extension of the cached content when its
+        header is unchanged and the last cached line is still found at the
+        cached end offset. A trailing partial line is left for the next call.
+
+        Args:
+            source_path: Path to the source CSV file
+            meta: Metadata of the cache entry
+
+        Returns:
+            Tuple of (appended bytes, fingerprint after appending), or None
+            if the file no longer extends the cached content
+        """
+        source = meta['source']
+        offset = source['segments'][-1]
+        anchor = source['anchor'].encode('utf-8')
+        stat = os.stat(source_path)
+
+        if not anchor.endswith(b'\n') or stat.st_size < offset:
+            return None
+        if stat.st_size == offset and stat.st_mtime_ns != source['mtime_ns']:
+            return None
+        if read_header(source_path) != source['schema']:
+            return None
+
+        with open(source_path, 'rb') as fh:
+            fh.seek(offset - len(anchor))
+            if fh.read(len(anchor)) != anchor:
+                return None
+            tail = fh.read(stat.st_size - offset)
+
+        tail = tail[:tail.rfind(b'\n') + 1]
+        if not tail:
+            return b'', source
+
+        end = offset + len(tail)
+        fingerprint = {
+            'size': end,
+            'mtime_ns': stat.st_mtime_ns,
+            'schema': source['schema'],
+            'digest': chain_digest(source['digest'], tail),
+            'segments': source['segments'] + [end],
+            'anchor': tail[tail.rfind(b'\n', 0, len(tail) - 1) + 1:].decode('utf-8'),
+        }
+        return tail, fingerprint
+
+    def append(self, source_path: Union[str, Path], meta: Dict,
+               df: pd.DataFrame, fingerprint: Dict) -> Dict:
+        """
+        Append rows to the cache entry of a source file.
+
+        Column files are first truncated to the row count in the metadata,
+        so rows left behind by an interrupted append are discarded. The
+        metadata is replaced last.
+
+        Args:
+            source_path: Path to the source CSV file
+            meta: Current metadata of the cache entry
+            df: Rows to append, with the cached columns and dtypes
+            fingerprint: Fingerprint of the source file after appending
+
+        Returns:
+            Updated metadata
+        """
+        entry = self.entry_dir(source_path)
+        nrows = meta['nrows']
+
+        for col in meta['columns']:
+            dtype = np.dtype(col['dtype'])
+            values = np.ascontiguousarray(df[col['name']].to_numpy(dtype=dtype))
+            with open(entry / col['file'], 'r+b') as fh:
+                fh.truncate(nrows * dtype.itemsize)
+                fh.seek(0, os.SEEK_END)
+                fh.write(values.tobytes())
+
+        meta = dict(meta, source=fingerprint, nrows=nrows + len(df))
+        self._write_meta(entry, meta)
+
+        logger.info(f"Appended {len(df)} rows to {entry}")
+        return meta
+
+    def _write_meta(self, entry: Path, meta: Dict) -> None:
+        """
+        Atomically write the metadata file of a cache entry.
+
+        Args:
+            entry: Entry directory
+            meta: Metadata dictionary
+        """
+        tmp_path = entry / f"meta.json.tmp-{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(meta, fh, indent=2)
+        os.replace(tmp_path, entry / 'meta.json')
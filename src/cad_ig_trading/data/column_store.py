@@ -0,0 +1,134 @@
+"""
+Column Store Module
+
+Memory-mapped, read-only view of a cached panel with binary-search date lookups.
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+import logging
+
+from .cache import ColumnarCache
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnStore:
+    """
+    Read-only column store backed by memory-mapped cache files.
+
+    The panel lives as one memory-mapped array per column plus a sorted
+    int64 date array. Date filters resolve to a row range with binary
+    search and return DataFrames whose columns are views into the mapped
+    files, so nothing is copied and processes mapping the same cache entry
+    share its pages.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], date_column: str = 'Date'):
+        """
+        Initialize ColumnStore.
+
+        Args:
+            columns: Dictionary mapping column name to array, in column order
+            date_column: Name of the sorted datetime64 column
+        """
+        if date_column not in columns:
+            raise ValueError(f"Missing date column: {date_column}")
+
+        self.columns = columns
+        self.date_column = date_column
+        self.dates = columns[date_column].view('i8')
+
+        if len(self.dates) > 1 and (np.diff(self.dates) < 0).any():
+            raise ValueError(f"Column {date_column} must be sorted in ascending order")
+
+    @classmethod
+    def open(cls, cache: ColumnarCache, source_path: Union[str, Path],
+             date_column: str = 'Date') -> 'ColumnStore':
+        """
+        Memory-map the cache entry of a source file.
+
+        Args:
+            cache: ColumnarCache holding the entry
+            source_path: Path to the source CSV file
+            date_column: Name of the date column
+
+        Returns:
+            ColumnStore over the mapped entry
+        """
+        meta = cache.read_meta(source_path)
+        if meta is None:
+            raise FileNotFoundError(f"No cache entry for {source_path}")
+
+        columns = cache.read_columns(source_path, meta, mmap_mode='r')
+        logger.info(f"Memory-mapped {meta['nrows']} rows, {len(columns)} columns")
+
+        return cls(columns, date_column=date_column)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def date_range_index(self, start_date: Optional[str] = None,
+                         end_date: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Resolve an inclusive date range to a row range.
+
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+
+        Returns:
+            Tuple of (start_row, stop_row) for slicing
+        """
+        start = 0
+        stop = len(self.dates)
+
+        if start_date is not None:
+            start = int(np.searchsorted(self.dates, pd.Timestamp(start_date).value, side='left'))
+
+        if end_date is not None:
+            stop = int(np.searchsorted(self.dates, pd.Timestamp(end_date).value, side='right'))
+
+        return start, max(start, stop)
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get a zero-copy DataFrame over a row range.
+
+        Args:
+            start: First row
+            stop: Row after the last row. If None, slices to the end.
+
+        Returns:
+            DataFrame whose columns are read-only views of the store
+        """
+        views = {name: values[start:stop] for name, values in self.columns.items()}
+        df = pd.DataFrame(views, copy=False)
+        df.index = pd.RangeIndex(start, start + len(df))
+        return df
+
+    def filter_by_date(self, start_date: Optional[str] = None,
+                       end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get a zero-copy DataFrame for an inclusive date range.
+
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+
+        Returns:
+            DataFrame whose columns are read-only views of the store
+        """
+        start, stop = self.date_range_index(start_date, end_date)
+        return self.slice(start, stop)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Get the whole panel as a zero-copy DataFrame.
+
+        Returns:
+            DataFrame whose columns are read-only views of the store
+        """
+        return self.slice(0, None)
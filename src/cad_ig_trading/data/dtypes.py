@@ -0,0 +1,124 @@
+"""
+Compact Dtypes Module
+
+Downcasts loaded columns to smaller dtypes when a precision check allows it.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default relative tolerance for float64 -> float32
+DEFAULT_RTOL = 1e-6
+
+# Returns are computed from the total return indices, so float32 rounding
+# (~6e-8 relative) would show up as ~1e-3 relative error in daily returns.
+# These columns are held to a tolerance float32 cannot meet.
+DEFAULT_TOLERANCES = {
+    'cad_ig_er_index': 1e-12,
+    'us_hy_er_index': 1e-12,
+    'us_ig_er_index': 1e-12,
+}
+
+INTEGER_DTYPES = [np.int8, np.int16, np.int32]
+MAX_CATEGORY_RATIO = 0.5
+
+
+def _downcast_numeric(values: np.ndarray, rtol: float) -> Tuple[Optional[np.ndarray], float]:
+    """
+    Find the smallest dtype that represents a numeric column within tolerance.
+
+    Args:
+        values: Column values
+        rtol: Relative tolerance for float32
+
+    Returns:
+        Tuple of (downcast values or None, maximum absolute error)
+    """
+    finite = np.isfinite(values)
+    has_nan = not finite.all()
+
+    if not has_nan and len(values) > 0 and (values == np.round(values)).all():
+        for dtype in INTEGER_DTYPES:
+            info = np.iinfo(dtype)
+            if values.min() >= info.min and values.max() <= info.max:
+                if np.dtype(dtype).itemsize < values.dtype.itemsize:
+                    return values.astype(dtype), 0.0
+                break
+
+    if values.dtype.itemsize <= 4:
+        return None, 0.0
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        compact = values.astype(np.float32)
+        error = np.abs(compact[finite].astype(np.float64) - values[finite])
+
+    if not np.isfinite(error).all():
+        return None, np.inf
+    if (error > rtol * np.abs(values[finite])).any():
+        return None, float(error.max()) if len(error) else 0.0
+
+    return compact, float(error.max()) if len(error) else 0.0
+
+
+def compact_dtypes(df: pd.DataFrame, rtol: float = DEFAULT_RTOL,
+                   tolerances: Optional[Dict[str, float]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Downcast DataFrame columns where a per-column precision check passes.
+
+    Numeric columns holding only integers become the smallest integer dtype
+    that fits. Other float64 columns become float32 when every value
+    round-trips within the column's relative tolerance. Object columns with
+    few distinct values become categoricals. Everything else is unchanged.
+
+    Args:
+        df: Input DataFrame
+        rtol: Default relative tolerance for float32 conversion
+        tolerances: Per-column relative tolerances, merged over
+            DEFAULT_TOLERANCES
+
+    Returns:
+        Tuple of (compacted DataFrame, report with one row per column)
+    """
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+
+    columns = {}
+    report = []
+    for col in df.columns:
+        series = df[col]
+        converted = None
+        max_error = 0.0
+
+        if pd.api.types.is_float_dtype(series.dtype) or pd.api.types.is_integer_dtype(series.dtype):
+            values, max_error = _downcast_numeric(series.to_numpy(), tolerances.get(col, rtol))
+            if values is not None:
+                converted = pd.Series(values, index=series.index, name=col)
+        elif series.dtype == object and len(series) > 0:
+            if series.nunique(dropna=True) / len(series) <= MAX_CATEGORY_RATIO:
+                converted = series.astype('category')
+
+        new_series = converted if converted is not None else series
+        columns[col] = new_series
+
+        bytes_before = int(series.memory_usage(index=False, deep=True))
+        bytes_after = int(new_series.memory_usage(index=False, deep=True))
+        report.append({
+            'column': col,
+            'from_dtype': str(series.dtype),
+            'to_dtype': str(new_series.dtype),
+            'bytes_before': bytes_before,
+            'bytes_after': bytes_after,
+            'bytes_saved': bytes_before - bytes_after,
+            'max_abs_error': max_error if converted is not None else 0.0,
+        })
+
+    compact = pd.DataFrame(columns, index=df.index)
+    report = pd.DataFrame(report)
+
+    logger.info(f"Compact dtypes saved {report['bytes_saved'].sum() / 1e6:.2f} MB "
+                f"({report['bytes_after'].sum() / max(report['bytes_before'].sum(), 1):.0%} of original size)")
+
+    return compact, report
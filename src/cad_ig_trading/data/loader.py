@@ -6,35 +6,113 @@ Handles loading and basic preprocessing of raw data.
 
 import pandas as pd
 import numpy as np
+import io
 from pathlib import Path
-from typing import Optional, Union
+from typing import Dict, Optional, Union
+import yaml
 import logging
 
+from .cache import ColumnarCache
+from .column_store import ColumnStore
+from .dtypes import compact_dtypes
+from .validation import DataProfiler
+
 logger = logging.getLogger(__name__)
 
+# Raw series expected by the feature pipeline, in file order
+RAW_COLUMNS = [
+    'cad_oas', 'us_hy_oas', 'us_ig_oas', 'tsx', 'vix', 'us_3m_10y',
+    'us_growth_surprises', 'us_inflation_surprises', 'us_lei_yoy',
+    'us_hard_data_surprises', 'us_equity_revisions', 'us_economic_regime',
+    'cad_ig_er_index', 'us_hy_er_index', 'us_ig_er_index',
+    'spx_1bf_eps', 'spx_1bf_sales', 'tsx_1bf_eps', 'tsx_1bf_sales',
+]
+
 
 class DataLoader:
     """Load and preprocess raw CAD-IG-ER index data."""
     
-    def __init__(self, data_path: Optional[Union[str, Path]] = None):
+    def __init__(self, data_path: Optional[Union[str, Path]] = None,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 storage: str = 'memory',
+                 profile: str = 'full',
+                 validator: Optional[DataProfiler] = None):
         """
         Initialize DataLoader.
         
         Args:
             data_path: Path to the raw data file. If None, uses default path.
+            cache_dir: Directory for the binary columnar cache. If None,
+                the CSV is parsed on every load.
+            storage: 'memory' to hold the panel in a regular DataFrame, or
+                'memmap' to serve it as read-only, zero-copy views of the
+                memory-mapped cache files (requires cache_dir)
+            profile: 'full' to keep parsed dtypes, or 'compact' to downcast
+                columns that pass a per-column precision check (see
+                compact_dtypes). Not available with memmap storage.
+            validator: DataProfiler run on the data after every load and
+                ingestion. Raises DataValidationError on failure.
         """
+        if storage not in ('memory', 'memmap'):
+            raise ValueError(f"Unknown storage: {storage}")
+        if storage == 'memmap' and cache_dir is None:
+            raise ValueError("storage='memmap' requires cache_dir")
+        if profile not in ('full', 'compact'):
+            raise ValueError(f"Unknown profile: {profile}")
+        if profile == 'compact' and storage == 'memmap':
+            raise ValueError("profile='compact' is not supported with storage='memmap'")
+        
         if data_path is None:
             # Default to project data directory
             project_root = Path(__file__).parents[4]
             data_path = project_root / "cad_ig_trading" / "data" / "raw" / "with_er_daily.csv"
         
         self.data_path = Path(data_path)
+        self.cache = ColumnarCache(cache_dir) if cache_dir is not None else None
+        self.storage = storage
+        self.profile = profile
+        self.store = None
+        self.dtype_report = None
+        self.validator = validator
         self.df = None
         
+    @classmethod
+    def from_config(cls, config_path: Union[str, Path],
+                    data_path: Optional[Union[str, Path]] = None) -> 'DataLoader':
+        """
+        Create a loader from the data section of a config file.
+        
+        The loader validates every load with a DataProfiler built from the
+        data.validation section.
+        
+        Args:
+            config_path: Path to a strategy config YAML file
+            data_path: Path to the raw data file. If None, uses data.path
+                from the config, or the default path without one.
+            
+        Returns:
+            Configured DataLoader
+        """
+        with open(config_path, 'r', encoding='utf-8') as fh:
+            config = yaml.safe_load(fh)
+        
+        data_config = config.get('data', {})
+        
+        return cls(
+            data_path=data_path if data_path is not None else data_config.get('path'),
+            cache_dir=data_config.get('cache_dir'),
+            profile=data_config.get('load_profile', 'full'),
+            validator=DataProfiler.from_config(config_path),
+        )
+    
     def load(self) -> pd.DataFrame:
         """
         Load raw data from CSV.
         
+        When a cache directory is configured, the parsed data is read from
+        the binary cache if the CSV is unchanged, and the cache is rebuilt
+        otherwise.
+        
         Returns:
             DataFrame with loaded data
         """
@@ -43,23 +121,143 @@ class DataLoader:
         if not self.data_path.exists():
             raise FileNotFoundError(f"Data file not found: {self.data_path}")
         
-        self.df = pd.read_csv(self.data_path, parse_dates=['Date'])
-        self.df = self.df.sort_values('Date').reset_index(drop=True)
+        if self.cache is None:
+            self.df = self._read_csv()
+        elif self.storage == 'memmap':
+            meta = self.cache.read_meta(self.data_path)
+            if meta is None or not self.cache.is_valid(self.data_path, meta):
+                fingerprint = self.cache.fingerprint(self.data_path)
+                self.cache.save(self.data_path, self._read_csv(), fingerprint)
+            self.store = ColumnStore.open(self.cache, self.data_path)
+            self.df = self.store.to_frame()
+        else:
+            self.df = self.cache.load(self.data_path)
+            if self.df is None:
+                fingerprint = self.cache.fingerprint(self.data_path)
+                self.df = self._read_csv()
+                self.cache.save(self.data_path, self.df, fingerprint)
+        
+        if self.profile == 'compact':
+            self.df, self.dtype_report = compact_dtypes(self.df)
+        
+        if self.validator is not None:
+            self.validator.validate(self.df)
         
         logger.info(f"Loaded {len(self.df)} rows, {self.df.shape[1]} columns")
         logger.info(f"Date range: {self.df['Date'].min()} to {self.df['Date'].max()}")
         
         return self.df
     
+    def _read_csv(self) -> pd.DataFrame:
+        """
+        Parse the raw CSV file and sort it by date.
+        
+        Returns:
+            DataFrame with parsed data
+        """
+        df = pd.read_csv(self.data_path, parse_dates=['Date'])
+        return df.sort_values('Date').reset_index(drop=True)
+    
+    def ingest_new_rows(self) -> pd.DataFrame:
+        """
+        Ingest rows appended to the CSV since the cache was last written.
+        
+        Only the bytes after the last ingested line are parsed. New rows
+        must have strictly increasing dates later than the last cached date;
+        otherwise a ValueError is raised and the cache is left untouched.
+        If the file was rewritten rather than appended to, the cache is
+        rebuilt with a full load and all rows are returned.
+        
+        Returns:
+            DataFrame with the newly ingested rows
+        """
+        if self.cache is None:
+            raise ValueError("Incremental ingestion requires cache_dir")
+        
+        if not self.data_path.exists():
+            raise FileNotFoundError(f"Data file not found: {self.data_path}")
+        
+        meta = self.cache.read_meta(self.data_path)
+        tail = self.cache.read_tail(self.data_path, meta) if meta is not None else None
+        
+        if tail is None:
+            logger.info("Cache does not match the start of the file, running full load")
+            return self.load()
+        
+        data, fingerprint = tail
+        if not data:
+            logger.info("No new rows to ingest")
+            if self.df is None:
+                self.load()
+            return self.df.iloc[0:0]
+        
+        header = (','.join(fingerprint['schema']) + '\n').encode('utf-8')
+        new_rows = pd.read_csv(io.BytesIO(header + data), parse_dates=['Date'])
+        self._validate_new_rows(new_rows, meta)
+        
+        self.cache.append(self.data_path, meta, new_rows, fingerprint)
+        
+        if self.storage == 'memmap':
+            self.store = ColumnStore.open(self.cache, self.data_path)
+            self.df = self.store.to_frame()
+        else:
+            if self.df is not None:
+                self.df = pd.concat([self.df, new_rows], ignore_index=True)
+            else:
+                self.df = self.cache.load(self.data_path)
+            if self.profile == 'compact':
+                self.df, self.dtype_report = compact_dtypes(self.df)
+        
+        if self.validator is not None:
+            self.validator.validate(self.df)
+        
+        logger.info(f"Ingested {len(new_rows)} new rows up to {new_rows['Date'].max()}")
+        
+        return new_rows
+    
+    def _validate_new_rows(self, new_rows: pd.DataFrame, meta: Dict) -> None:
+        """
+        Validate appended rows against the cached data.
+        
+        Args:
+            new_rows: Parsed appended rows
+            meta: Metadata of the cache entry
+            
+        Raises:
+            ValueError: If dates are out of order or duplicated, or columns differ
+        """
+        cached_columns = [col['name'] for col in meta['columns']]
+        if list(new_rows.columns) != cached_columns:
+            raise ValueError(f"Appended rows have columns {list(new_rows.columns)}, expected {cached_columns}")
+        
+        dates = new_rows['Date'].to_numpy(dtype='datetime64[ns]').view('i8')
+        if len(dates) > 1 and (np.diff(dates) <= 0).any():
+            raise ValueError("Appended rows are not in strictly increasing date order")
+        
+        if meta['nrows'] > 0:
+            date_col = next(col for col in meta['columns'] if col['name'] == 'Date')
+            dtype = np.dtype(date_col['dtype'])
+            last_date = np.fromfile(self.cache.entry_dir(self.data_path) / date_col['file'],
+                                    dtype=dtype, count=1,
+                                    offset=(meta['nrows'] - 1) * dtype.itemsize).view('i8')[0]
+            if dates[0] <= last_date:
+                raise ValueError(f"Appended row dated {new_rows['Date'].iloc[0]} is not after "
+                                 f"the last cached date {pd.Timestamp(last_date)}")
+    
     def get_data(self) -> pd.DataFrame:
         """
         Get loaded data. Loads if not already loaded.
         
+        With memmap storage the returned frame holds read-only views of the
+        store instead of a copy.
+        
         Returns:
             DataFrame with data
         """
         if self.df is None:
             self.load()
+        if self.store is not None:
+            return self.store.to_frame()
         return self.df.copy()
     
     def get_column_info(self) -> pd.DataFrame:
@@ -67,20 +265,12 @@ class DataLoader:
         Get information about columns in the dataset.
         
         Returns:
-            DataFrame with column information
+            DataFrame with column information (see DataProfiler.profile)
         """
         if self.df is None:
             self.load()
         
-        info = pd.DataFrame({
-            'column': self.df.columns,
-            'dtype': self.df.dtypes.values,
-            'null_count': self.df.isnull().sum().values,
-            'null_pct': (self.df.isnull().sum() / len(self.df) * 100).values,
-            'unique_values': [self.df[col].nunique() for col in self.df.columns]
-        })
-        
-        return info
+        return DataProfiler().profile(self.df)
     
     def get_date_range(self) -> tuple:
         """
@@ -99,6 +289,9 @@ class DataLoader:
         """
         Filter data by date range.
         
+        With memmap storage the range is found by binary search and the
+        returned frame holds read-only views of the store.
+        
         Args:
             start_date: Start date (inclusive)
             end_date: End date (inclusive)
@@ -109,6 +302,11 @@ class DataLoader:
         if self.df is None:
             self.load()
         
+        if self.store is not None:
+            df_filtered = self.store.filter_by_date(start_date, end_date)
+            logger.info(f"Filtered to {len(df_filtered)} rows")
+            return df_filtered
+        
         df_filtered = self.df.copy()
         
         if start_date is not None:
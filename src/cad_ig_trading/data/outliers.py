@@ -0,0 +1,196 @@
+"""
+Outlier Handling Module
+
+Fits clipping bounds once on a training window and applies them to new data.
+"""
+
+import pandas as pd
+import numpy as np
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Winsorizer:
+    """
+    Fit/transform outlier clipper with persistable bounds.
+
+    fit() computes the lower and upper bound of every column in one
+    vectorized call over the training window, either as quantiles
+    ('winsorize') or as mean +/- k standard deviations ('clip').
+    transform() applies the stored bounds with a single broadcasted
+    np.clip, so new rows never see statistics from outside the window.
+    """
+
+    def __init__(self, method: str = 'winsorize',
+                 lower_quantile: float = 0.01,
+                 upper_quantile: float = 0.99,
+                 n_std: float = 3.0):
+        """
+        Initialize Winsorizer.
+
+        Args:
+            method: 'winsorize' for quantile bounds, 'clip' for mean +/- n_std * std
+            lower_quantile: Lower quantile for winsorization
+            upper_quantile: Upper quantile for winsorization
+            n_std: Number of standard deviations for clipping
+        """
+        if method not in ('winsorize', 'clip'):
+            raise ValueError(f"Unknown method: {method}")
+
+        self.method = method
+        self.lower_quantile = lower_quantile
+        self.upper_quantile = upper_quantile
+        self.n_std = n_std
+        self.columns = None
+        self.lower = None
+        self.upper = None
+
+    def fit(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> 'Winsorizer':
+        """
+        Compute clipping bounds for each column.
+
+        Args:
+            df: Training DataFrame
+            columns: Columns to fit. If None, uses all numeric columns.
+
+        Returns:
+            Self for method chaining
+        """
+        if columns is None:
+            columns = df.select_dtypes(include=[np.number]).columns.tolist()
+
+        X = df[columns].to_numpy(dtype=np.float64)
+
+        with np.errstate(invalid='ignore'):
+            if self.method == 'winsorize':
+                if len(X) > 0:
+                    lower, upper = np.nanquantile(X, [self.lower_quantile, self.upper_quantile], axis=0)
+                else:
+                    lower = upper = np.full(len(columns), np.nan)
+            else:
+                mean = np.nanmean(X, axis=0)
+                std = np.nanstd(X, axis=0, ddof=1)
+                lower = mean - self.n_std * std
+                upper = mean + self.n_std * std
+
+        self.columns = list(columns)
+        self.lower = lower
+        self.upper = upper
+
+        logger.info(f"Fitted {self.method} bounds for {len(self.columns)} columns on {len(df)} rows")
+
+        return self
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """
+        Clip columns to the fitted bounds.
+
+        Columns without a finite bound (e.g. all-NaN in the training window)
+        are left unclipped on that side.
+
+        Args:
+            df: Input DataFrame containing the fitted columns
+            inplace: Modify df instead of a copy
+
+        Returns:
+            DataFrame with clipped columns
+        """
+        if self.columns is None:
+            raise ValueError("Winsorizer is not fitted")
+
+        if not inplace:
+            df = df.copy()
+
+        X = df[self.columns].to_numpy(dtype=np.float64)
+        lower = np.where(np.isnan(self.lower), -np.inf, self.lower)
+        upper = np.where(np.isnan(self.upper), np.inf, self.upper)
+        df[self.columns] = np.clip(X, lower, upper)
+
+        return df
+
+    def fit_transform(self, df: pd.DataFrame, columns: Optional[List[str]] = None,
+                      inplace: bool = False) -> pd.DataFrame:
+        """
+        Fit bounds on df and clip it.
+
+        Args:
+            df: Input DataFrame
+            columns: Columns to fit. If None, uses all numeric columns.
+            inplace: Modify df instead of a copy
+
+        Returns:
+            DataFrame with clipped columns
+        """
+        return self.fit(df, columns).transform(df, inplace=inplace)
+
+    def to_dict(self) -> Dict:
+        """
+        Get the fitted state as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary with parameters and bounds
+        """
+        if self.columns is None:
+            raise ValueError("Winsorizer is not fitted")
+
+        return {
+            'method': self.method,
+            'lower_quantile': self.lower_quantile,
+            'upper_quantile': self.upper_quantile,
+            'n_std': self.n_std,
+            'columns': self.columns,
+            'lower': [None if np.isnan(v) else float(v) for v in self.lower],
+            'upper': [None if np.isnan(v) else float(v) for v in self.upper],
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'Winsorizer':
+        """
+        Restore a fitted Winsorizer from to_dict() output.
+
+        Args:
+            state: Dictionary with parameters and bounds
+
+        Returns:
+            Fitted Winsorizer
+        """
+        winsorizer = cls(method=state['method'],
+                         lower_quantile=state['lower_quantile'],
+                         upper_quantile=state['upper_quantile'],
+                         n_std=state['n_std'])
+        winsorizer.columns = list(state['columns'])
+        winsorizer.lower = np.array([np.nan if v is None else v for v in state['lower']], dtype=np.float64)
+        winsorizer.upper = np.array([np.nan if v is None else v for v in state['upper']], dtype=np.float64)
+        return winsorizer
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the fitted bounds to a JSON file.
+
+        Args:
+            path: Output file path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+
+        logger.info(f"Saved {self.method} bounds to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'Winsorizer':
+        """
+        Load fitted bounds from a JSON file.
+
+        Args:
+            path: Input file path
+
+        Returns:
+            Fitted Winsorizer
+        """
+        with open(path, 'r', encoding='utf-8') as fh:
+            return cls.from_dict(json.load(fh))
@@ -6,8 +6,13 @@ Handles data cleaning, missing value treatment, and basic transformations.
 
 import pandas as pd
 import numpy as np
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator
 import logging
 
+from .outliers import Winsorizer
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,10 +22,37 @@ class DataPreprocessor:
     def __init__(self):
         """Initialize DataPreprocessor."""
         self.fill_methods = {}
+        self.memory_report = {}
+        self.winsorizer = None
+        self._track_memory = False
+        
+    @contextmanager
+    def _measure(self, step: str) -> Iterator[None]:
+        """
+        Record the peak bytes allocated while a preprocessing step runs.
+        
+        Does nothing unless memory tracking was requested in preprocess().
+        
+        Args:
+            step: Name of the step
+        """
+        if not self._track_memory:
+            yield
+            return
+        
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            self.memory_report[step] = peak - start
+            logger.info(f"  {step}: peak {(peak - start) / 1e6:.2f} MB allocated")
         
     def handle_missing_values(self, df: pd.DataFrame, 
                              method: str = 'forward_fill',
-                             max_fill: int = 5) -> pd.DataFrame:
+                             max_fill: int = 5,
+                             inplace: bool = False) -> pd.DataFrame:
         """
         Handle missing values in the dataset.
         
@@ -28,26 +60,32 @@ class DataPreprocessor:
             df: Input DataFrame
             method: Method to handle missing values ('forward_fill', 'backward_fill', 'drop')
             max_fill: Maximum number of consecutive values to fill
+            inplace: Modify df instead of a copy
             
         Returns:
             DataFrame with missing values handled
         """
-        df = df.copy()
+        if method not in ('forward_fill', 'backward_fill', 'drop'):
+            raise ValueError(f"Unknown method: {method}")
+        
+        if not inplace:
+            df = df.copy()
         
+        log_counts = logger.isEnabledFor(logging.INFO)
         logger.info(f"Handling missing values using method: {method}")
-        logger.info(f"Missing values before: {df.isnull().sum().sum()}")
+        if log_counts:
+            logger.info(f"Missing values before: {df.isnull().sum().sum()}")
         
         if method == 'forward_fill':
             # Forward fill with limit
-            df = df.fillna(method='ffill', limit=max_fill)
+            df.ffill(limit=max_fill, inplace=True)
         elif method == 'backward_fill':
-            df = df.fillna(method='bfill', limit=max_fill)
-        elif method == 'drop':
-            df = df.dropna()
+            df.bfill(limit=max_fill, inplace=True)
         else:
-            raise ValueError(f"Unknown method: {method}")
+            df.dropna(inplace=True)
         
-        logger.info(f"Missing values after: {df.isnull().sum().sum()}")
+        if log_counts:
+            logger.info(f"Missing values after: {df.isnull().sum().sum()}")
         
         return df
     
@@ -55,7 +93,8 @@ class DataPreprocessor:
                        columns: list,
                        method: str = 'winsorize',
                        lower_quantile: float = 0.01,
-                       upper_quantile: float = 0.99) -> pd.DataFrame:
+                       upper_quantile: float = 0.99,
+                       inplace: bool = False) -> pd.DataFrame:
         """
         Handle outliers in specified columns.
         
@@ -65,56 +104,62 @@ class DataPreprocessor:
             method: Method to handle outliers ('winsorize', 'clip')
             lower_quantile: Lower quantile for winsorization
             upper_quantile: Upper quantile for winsorization
+            inplace: Modify df instead of a copy
             
         Returns:
             DataFrame with outliers handled
         """
-        df = df.copy()
+        if not inplace:
+            df = df.copy()
         
         logger.info(f"Handling outliers in {len(columns)} columns using method: {method}")
         
-        for col in columns:
-            if col not in df.columns:
-                logger.warning(f"Column {col} not found, skipping")
-                continue
-            
-            if method == 'winsorize':
-                lower = df[col].quantile(lower_quantile)
-                upper = df[col].quantile(upper_quantile)
-                df[col] = df[col].clip(lower=lower, upper=upper)
-            elif method == 'clip':
-                # Clip to +/- 3 standard deviations
-                mean = df[col].mean()
-                std = df[col].std()
-                lower = mean - 3 * std
-                upper = mean + 3 * std
-                df[col] = df[col].clip(lower=lower, upper=upper)
+        missing = [col for col in columns if col not in df.columns]
+        for col in missing:
+            logger.warning(f"Column {col} not found, skipping")
+        columns = [col for col in columns if col in df.columns]
+        
+        # Bounds come from df itself; fit a Winsorizer on a training window
+        # and reuse it to avoid look-ahead
+        self.winsorizer = Winsorizer(method=method,
+                                     lower_quantile=lower_quantile,
+                                     upper_quantile=upper_quantile,
+                                     n_std=3.0)
+        df = self.winsorizer.fit_transform(df, columns, inplace=True)
         
         return df
     
-    def handle_infinite_values(self, df: pd.DataFrame) -> pd.DataFrame:
+    def handle_infinite_values(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """
         Replace infinite values with NaN.
         
         Args:
             df: Input DataFrame
+            inplace: Modify df instead of a copy
             
         Returns:
             DataFrame with infinite values replaced
         """
-        df = df.copy()
+        if not inplace:
+            df = df.copy()
+        
+        # Counting is an extra pass, so only do it when it will be logged
+        if not logger.isEnabledFor(logging.INFO):
+            df.replace([np.inf, -np.inf], np.nan, inplace=True)
+            return df
         
         inf_count = np.isinf(df.select_dtypes(include=[np.number])).sum().sum()
         
         if inf_count > 0:
             logger.info(f"Replacing {inf_count} infinite values with NaN")
-            df = df.replace([np.inf, -np.inf], np.nan)
+            df.replace([np.inf, -np.inf], np.nan, inplace=True)
         
         return df
     
     def add_target_variable(self, df: pd.DataFrame, 
                            target_col: str = 'cad_ig_er_index',
-                           horizon: int = 1) -> pd.DataFrame:
+                           horizon: int = 1,
+                           inplace: bool = False) -> pd.DataFrame:
         """
         Add target return variable.
         
@@ -122,11 +167,13 @@ class DataPreprocessor:
             df: Input DataFrame
             target_col: Column to calculate returns from
             horizon: Number of periods ahead for target
+            inplace: Modify df instead of a copy
             
         Returns:
             DataFrame with target variable added
         """
-        df = df.copy()
+        if not inplace:
+            df = df.copy()
         
         df['target_return'] = df[target_col].pct_change(horizon).shift(-horizon)
         
@@ -137,42 +184,66 @@ class DataPreprocessor:
     def preprocess(self, df: pd.DataFrame, 
                   handle_missing: bool = True,
                   handle_outliers_flag: bool = False,
-                  add_target: bool = True) -> pd.DataFrame:
+                  add_target: bool = True,
+                  inplace: bool = False,
+                  track_memory: bool = False) -> pd.DataFrame:
         """
         Run full preprocessing pipeline.
         
+        The input is copied at most once; every step then works on that
+        single buffer.
+        
         Args:
             df: Input DataFrame
             handle_missing: Whether to handle missing values
             handle_outliers_flag: Whether to handle outliers
             add_target: Whether to add target variable
+            inplace: Modify df itself instead of a copy
+            track_memory: Record the peak bytes allocated by each step in
+                memory_report (uses tracemalloc, which slows allocation)
             
         Returns:
             Preprocessed DataFrame
         """
         logger.info("Starting preprocessing pipeline")
         
-        df = df.copy()
-        
-        # Handle infinite values first
-        df = self.handle_infinite_values(df)
-        
-        # Handle missing values
-        if handle_missing:
-            df = self.handle_missing_values(df, method='forward_fill', max_fill=5)
-        
-        # Handle outliers (optional, usually done after feature engineering)
-        if handle_outliers_flag:
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            # Exclude Date and index columns
-            numeric_cols = [col for col in numeric_cols if col not in ['Date']]
-            df = self.handle_outliers(df, numeric_cols, method='winsorize')
+        self.memory_report = {}
+        self._track_memory = track_memory
+        started_tracing = track_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
         
-        # Add target variable
-        if add_target:
-            df = self.add_target_variable(df)
+        try:
+            with self._measure('copy'):
+                if not inplace:
+                    df = df.copy()
+            
+            # Handle infinite values first
+            with self._measure('infinite_values'):
+                df = self.handle_infinite_values(df, inplace=True)
+            
+            # Handle missing values
+            if handle_missing:
+                with self._measure('missing_values'):
+                    df = self.handle_missing_values(df, method='forward_fill', max_fill=5, inplace=True)
+            
+            # Handle outliers (optional, usually done after feature engineering)
+            if handle_outliers_flag:
+                with self._measure('outliers'):
+                    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+                    # Exclude Date and index columns
+                    numeric_cols = [col for col in numeric_cols if col not in ['Date']]
+                    df = self.handle_outliers(df, numeric_cols, method='winsorize', inplace=True)
+            
+            # Add target variable
+            if add_target:
+                with self._measure('target'):
+                    df = self.add_target_variable(df, inplace=True)
+        finally:
+            self._track_memory = False
+            if started_tracing:
+                tracemalloc.stop()
         
         logger.info(f"Preprocessing complete. Shape: {df.shape}")
         
         return df
-
@@ -0,0 +1,134 @@
+"""
+Streaming Preprocessor Module
+
+Point-in-time preprocessing of one new row at a time.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Union
+import logging
+
+from .outliers import Winsorizer
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingPreprocessor:
+    """
+    Stateful row-by-row counterpart of DataPreprocessor.preprocess().
+
+    Keeps the last valid value and the number of consecutive missing rows
+    for every numeric column, so each incoming row is handled in
+    O(columns): infinite values become NaN, NaNs are forward filled up to
+    max_fill consecutive rows, and values are clipped to the bounds of a
+    fitted Winsorizer if one is given. Feeding a frame through update()
+    row by row gives the same values as the batch pipeline with
+    add_target=False (the target needs future rows and is not streamed).
+    """
+
+    def __init__(self, columns: List[str], max_fill: int = 5,
+                 winsorizer: Optional[Winsorizer] = None):
+        """
+        Initialize StreamingPreprocessor.
+
+        Args:
+            columns: Numeric columns to process. Other fields of a row are
+                passed through unchanged.
+            max_fill: Maximum number of consecutive values to forward fill
+            winsorizer: Fitted Winsorizer whose bounds clip each row
+        """
+        self.columns = list(columns)
+        self.max_fill = max_fill
+        self.winsorizer = winsorizer
+
+        self.last_valid = np.full(len(self.columns), np.nan)
+        self.missing_run = np.zeros(len(self.columns), dtype=np.int64)
+        self.n_rows = 0
+
+        self._lower = None
+        self._upper = None
+        if winsorizer is not None:
+            bounds = pd.DataFrame({'lower': winsorizer.lower, 'upper': winsorizer.upper},
+                                  index=winsorizer.columns).reindex(self.columns)
+            self._lower = bounds['lower'].fillna(-np.inf).to_numpy()
+            self._upper = bounds['upper'].fillna(np.inf).to_numpy()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, max_fill: int = 5,
+                   winsorizer: Optional[Winsorizer] = None) -> 'StreamingPreprocessor':
+        """
+        Create a streaming preprocessor for the numeric columns of df.
+
+        Args:
+            df: DataFrame with the raw schema
+            max_fill: Maximum number of consecutive values to forward fill
+            winsorizer: Fitted Winsorizer whose bounds clip each row
+
+        Returns:
+            StreamingPreprocessor
+        """
+        columns = df.select_dtypes(include=[np.number]).columns.tolist()
+        return cls(columns, max_fill=max_fill, winsorizer=winsorizer)
+
+    def update(self, row: Union[pd.Series, Dict]) -> pd.Series:
+        """
+        Preprocess one new row.
+
+        Args:
+            row: Raw row as a Series or dict
+
+        Returns:
+            Preprocessed row
+        """
+        values = np.array([row.get(col, np.nan) for col in self.columns], dtype=np.float64)
+        values = self._step(values)
+
+        out = dict(row)
+        out.update(zip(self.columns, values))
+        return pd.Series(out, name=getattr(row, 'name', None))
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Stream every row of a DataFrame through the preprocessor.
+
+        Useful to warm up the state on history; the result equals the
+        batch pipeline on the same rows.
+
+        Args:
+            df: Raw DataFrame in date order
+
+        Returns:
+            Preprocessed DataFrame
+        """
+        X = df[self.columns].to_numpy(dtype=np.float64)
+        for i in range(len(X)):
+            X[i] = self._step(X[i])
+
+        out = df.copy()
+        out[self.columns] = X
+        return out
+
+    def _step(self, values: np.ndarray) -> np.ndarray:
+        """
+        Advance the state by one row of numeric values.
+
+        Args:
+            values: Raw values in column order (modified in place)
+
+        Returns:
+            Preprocessed values
+        """
+        values[np.isinf(values)] = np.nan
+
+        missing = np.isnan(values)
+        self.missing_run = np.where(missing, self.missing_run + 1, 0)
+        fill = missing & (self.missing_run <= self.max_fill)
+        values[fill] = self.last_valid[fill]
+        self.last_valid = np.where(missing, self.last_valid, values)
+
+        if self._lower is not None:
+            values = np.clip(values, self._lower, self._upper)
+
+        self.n_rows += 1
+        return values
@@ -0,0 +1,278 @@
+"""
+Data Validation Module
+
+Profiles data quality in one vectorized pass and checks it against thresholds.
+"""
+
+import pandas as pd
+import numpy as np
+import yaml
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DataValidationError(ValueError):
+    """Raised when data fails the configured validation thresholds."""
+    pass
+
+
+class DataProfiler:
+    """
+    Vectorized data quality profiler.
+
+    All numeric columns are stacked into one 2D float64 block and every
+    statistic is computed with column-wise NumPy reductions over it: null
+    counts and longest null runs, inf counts, min/max, mean/std, outlier
+    counts and distinct values. The date column is checked for ordering,
+    duplicates and gaps.
+    """
+
+    def __init__(self, max_missing_pct: Optional[float] = 0.05,
+                 outlier_std: float = 5.0,
+                 max_outlier_pct: Optional[float] = None,
+                 max_gap_days: Optional[int] = None,
+                 date_column: str = 'Date'):
+        """
+        Initialize DataProfiler.
+
+        Args:
+            max_missing_pct: Maximum fraction of missing values per column
+                (0.05 = 5%). If None, missing values are not checked.
+            outlier_std: Number of standard deviations from the mean beyond
+                which a value counts as an outlier
+            max_outlier_pct: Maximum fraction of outliers per column. If
+                None, outliers are reported but not checked.
+            max_gap_days: Maximum calendar days between consecutive dates.
+                If None, gaps are reported but not checked.
+            date_column: Name of the date column
+        """
+        self.max_missing_pct = max_missing_pct
+        self.outlier_std = outlier_std
+        self.max_outlier_pct = max_outlier_pct
+        self.max_gap_days = max_gap_days
+        self.date_column = date_column
+        self.report = None
+        self.date_report = None
+
+    @classmethod
+    def from_config(cls, config_path: Union[str, Path]) -> 'DataProfiler':
+        """
+        Create a profiler from the data.validation section of a config file.
+
+        Args:
+            config_path: Path to a strategy config YAML file
+
+        Returns:
+            Configured DataProfiler
+        """
+        with open(config_path, 'r', encoding='utf-8') as fh:
+            config = yaml.safe_load(fh)
+
+        data_config = config.get('data', {})
+        validation = data_config.get('validation', {})
+
+        return cls(
+            max_missing_pct=validation.get('max_missing_pct') if validation.get('check_missing', True) else None,
+            outlier_std=validation.get('outlier_std', 5.0),
+            max_outlier_pct=validation.get('max_outlier_pct') if validation.get('check_outliers', True) else None,
+            max_gap_days=validation.get('max_gap_days'),
+            date_column=data_config.get('date_column', 'Date'),
+        )
+
+    def profile(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Profile every column of a DataFrame.
+
+        Args:
+            df: Input DataFrame
+
+        Returns:
+            DataFrame with one row of statistics per column
+        """
+        numeric_cols = [col for col in df.columns
+                        if col != self.date_column and pd.api.types.is_numeric_dtype(df[col].dtype)
+                        and not pd.api.types.is_bool_dtype(df[col].dtype)]
+        other_cols = [col for col in df.columns if col not in numeric_cols]
+
+        n = len(df)
+        stats = self._profile_block(df[numeric_cols].to_numpy(dtype=np.float64), n)
+        numeric_report = pd.DataFrame(stats, index=numeric_cols)
+
+        other_report = pd.DataFrame({
+            'null_count': df[other_cols].isnull().sum().to_numpy(),
+            'unique_values': df[other_cols].nunique().to_numpy(),
+        }, index=other_cols)
+        other_report['null_pct'] = other_report['null_count'] / max(n, 1) * 100
+
+        report = pd.concat([numeric_report, other_report]).reindex(df.columns)
+        report.insert(0, 'dtype', df.dtypes.values)
+        report.insert(0, 'column', df.columns)
+        report = report.reset_index(drop=True)
+
+        int_cols = ['null_count', 'unique_values', 'max_null_run', 'inf_count', 'outlier_count']
+        report[int_cols] = report[int_cols].fillna(0).astype(np.int64)
+
+        self.report = report
+        self.date_report = self._profile_dates(df) if self.date_column in df.columns else None
+
+        return report
+
+    def _profile_block(self, X: np.ndarray, n: int) -> Dict[str, np.ndarray]:
+        """
+        Compute column statistics over a 2D block.
+
+        Args:
+            X: 2D float64 array (rows x columns)
+            n: Number of rows
+
+        Returns:
+            Dictionary mapping statistic name to per-column array
+        """
+        is_nan = np.isnan(X)
+        is_inf = np.isinf(X)
+        finite = ~(is_nan | is_inf)
+        n_finite = finite.sum(axis=0)
+
+        # Longest run of consecutive NaNs: running NaN count minus the count
+        # at the last non-NaN row
+        nan_cum = np.cumsum(is_nan, axis=0)
+        nan_base = np.maximum.accumulate(np.where(is_nan, 0, nan_cum), axis=0)
+        max_null_run = (nan_cum - nan_base).max(axis=0) if n > 0 else np.zeros(X.shape[1], dtype=np.int64)
+
+        X_finite = np.where(finite, X, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = X_finite.sum(axis=0) / n_finite
+            deviation = np.where(finite, X - mean, 0.0)
+            std = np.sqrt((deviation ** 2).sum(axis=0) / (n_finite - 1))
+            outliers = finite & (np.abs(deviation) > self.outlier_std * std)
+
+        col_min = np.where(finite, X, np.inf).min(axis=0, initial=np.inf)
+        col_max = np.where(finite, X, -np.inf).max(axis=0, initial=-np.inf)
+        empty = n_finite == 0
+        col_min[empty] = np.nan
+        col_max[empty] = np.nan
+
+        # Distinct non-NaN values: NaNs sort last, so count value changes
+        # among the leading non-NaN entries of each sorted column
+        X_sorted = np.sort(X, axis=0)
+        not_nan = ~np.isnan(X_sorted)
+        if n > 0:
+            unique = not_nan[0].astype(np.int64) + ((X_sorted[1:] != X_sorted[:-1]) & not_nan[1:]).sum(axis=0)
+        else:
+            unique = np.zeros(X.shape[1], dtype=np.int64)
+
+        null_count = is_nan.sum(axis=0)
+
+        return {
+            'null_count': null_count,
+            'null_pct': null_count / max(n, 1) * 100,
+            'unique_values': unique,
+            'max_null_run': max_null_run,
+            'inf_count': is_inf.sum(axis=0),
+            'min': col_min,
+            'max': col_max,
+            'mean': mean,
+            'std': std,
+            'outlier_count': outliers.sum(axis=0),
+            'outlier_pct': outliers.sum(axis=0) / max(n, 1) * 100,
+        }
+
+    def _profile_dates(self, df: pd.DataFrame) -> Dict:
+        """
+        Check the date column for ordering, duplicates and gaps.
+
+        Args:
+            df: Input DataFrame
+
+        Returns:
+            Dictionary with date continuity statistics
+        """
+        dates = df[self.date_column].to_numpy(dtype='datetime64[ns]')
+        valid = ~np.isnat(dates)
+        values = dates[valid].view('i8')
+        steps = np.diff(values)
+        gap_days = steps / pd.Timedelta(days=1).value
+
+        report = {
+            'n_rows': len(dates),
+            'null_dates': int((~valid).sum()),
+            'start': pd.Timestamp(values.min()) if len(values) else None,
+            'end': pd.Timestamp(values.max()) if len(values) else None,
+            'is_sorted': bool((steps >= 0).all()),
+            'duplicate_dates': int(len(values) - len(np.unique(values))),
+            'max_gap_days': float(gap_days.max()) if len(gap_days) else 0.0,
+            'gaps_over_limit': int((gap_days > self.max_gap_days).sum()) if self.max_gap_days is not None else 0,
+        }
+        return report
+
+    def validate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Profile a DataFrame and check it against the thresholds.
+
+        Args:
+            df: Input DataFrame
+
+        Returns:
+            Profile report
+
+        Raises:
+            DataValidationError: If any threshold is violated
+        """
+        report = self.profile(df)
+        errors = self._check(report)
+
+        outliers = report[report['outlier_count'] > 0]
+        for _, row in outliers.iterrows():
+            logger.info(f"  {row['column']}: {row['outlier_count']} values beyond {self.outlier_std} std")
+
+        if errors:
+            for error in errors:
+                logger.error(f"Validation failed: {error}")
+            raise DataValidationError("; ".join(errors))
+
+        logger.info(f"Validation passed for {len(df)} rows, {df.shape[1]} columns")
+
+        return report
+
+    def _check(self, report: pd.DataFrame) -> List[str]:
+        """
+        Collect threshold violations from a profile report.
+
+        Args:
+            report: Profile report
+
+        Returns:
+            List of violation messages
+        """
+        errors = []
+
+        if self.max_missing_pct is not None:
+            over = report[report['null_pct'] > self.max_missing_pct * 100]
+            for _, row in over.iterrows():
+                errors.append(f"{row['column']} is {row['null_pct']:.2f}% missing "
+                              f"(max {self.max_missing_pct:.2%})")
+
+        for _, row in report[report['inf_count'] > 0].iterrows():
+            errors.append(f"{row['column']} has {row['inf_count']} infinite values")
+
+        if self.max_outlier_pct is not None:
+            over = report[report['outlier_pct'] > self.max_outlier_pct * 100]
+            for _, row in over.iterrows():
+                errors.append(f"{row['column']} has {row['outlier_pct']:.2f}% outliers "
+                              f"(max {self.max_outlier_pct:.2%})")
+
+        if self.date_report is not None:
+            if self.date_report['null_dates'] > 0:
+                errors.append(f"{self.date_report['null_dates']} rows have no {self.date_column}")
+            if not self.date_report['is_sorted']:
+                errors.append(f"{self.date_column} is not sorted")
+            if self.date_report['duplicate_dates'] > 0:
+                errors.append(f"{self.date_report['duplicate_dates']} duplicate dates")
+            if self.date_report['gaps_over_limit'] > 0:
+                errors.append(f"{self.date_report['gaps_over_limit']} date gaps longer than "
+                              f"{self.max_gap_days} days")
+
+        return errors
@@ -7,9 +7,11 @@ Provides base class and utilities for feature engineering.
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Union
 import logging
 
+from .moments import RollingMoments
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,17 +66,99 @@ class BaseFeature(ABC):
             raise ValueError(f"Missing required columns: {missing}")
 
 
+class FeatureSpec:
+    """
+    One node of the feature graph.
+    
+    Declares the columns a computation reads and the features it produces.
+    func receives an IntermediateCache whose series() resolves raw columns
+    and features produced upstream, and returns a Series (one output) or a
+    dict of Series keyed by output name.
+    """
+    
+    def __init__(self, outputs: Union[str, List[str]], inputs: List[str],
+                 func: Callable[..., Union[pd.Series, Dict[str, pd.Series]]]):
+        """
+        Initialize FeatureSpec.
+        
+        Args:
+            outputs: Name or names of the features produced
+            inputs: Columns read, raw or produced by other specs
+            func: Function of an IntermediateCache computing the outputs
+        """
+        self.outputs = [outputs] if isinstance(outputs, str) else list(outputs)
+        self.inputs = list(inputs)
+        self.func = func
+        
+    def compute(self, cache) -> Dict[str, pd.Series]:
+        """
+        Evaluate the spec.
+        
+        Args:
+            cache: IntermediateCache over the available columns
+            
+        Returns:
+            Dictionary mapping output name to Series
+        """
+        result = self.func(cache)
+        if not isinstance(result, dict):
+            result = {self.outputs[0]: result}
+        return {name: result[name] for name in self.outputs}
+
+
+class FeatureGroup(BaseFeature):
+    """
+    Feature set declared as FeatureSpecs with explicit inputs.
+    
+    Specs must be listed so that each one comes after the specs of the same
+    group it reads from; dependencies across groups are resolved by
+    FeatureGraph.
+    """
+    
+    def __init__(self, name: str, specs: List[FeatureSpec]):
+        """
+        Initialize FeatureGroup.
+        
+        Args:
+            name: Name of the feature set
+            specs: Feature specs of the group
+        """
+        super().__init__(name)
+        self.specs = specs
+        self.feature_names = [output for spec in specs for output in spec.outputs]
+        
+    def create_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Create the group's features on their own.
+        
+        Args:
+            df: Input DataFrame with every column the group reads
+            
+        Returns:
+            DataFrame with new features added
+        """
+        from .graph import FeatureGraph
+        
+        outputs = FeatureGraph([self]).run(df, max_workers=1)
+        return assemble_features(df, outputs)
+
+
 class FeaturePipeline:
     """Pipeline for applying multiple feature engineering steps."""
     
-    def __init__(self, features: Optional[List[BaseFeature]] = None):
+    def __init__(self, features: Optional[List[BaseFeature]] = None,
+                 max_workers: Optional[int] = None):
         """
         Initialize FeaturePipeline.
         
         Args:
             features: List of BaseFeature instances to apply
+            max_workers: Threads used to evaluate independent specs when
+                every feature is a FeatureGroup. None uses one per available CPU.
         """
         self.features = features or []
+        self.max_workers = max_workers
+        self.graph = None
         
     def add_feature(self, feature: BaseFeature) -> 'FeaturePipeline':
         """
@@ -99,15 +183,22 @@ class FeaturePipeline:
         Returns:
             DataFrame with all features added
         """
-        df = df.copy()
-        
         logger.info(f"Applying {len(self.features)} feature engineering steps")
         logger.info(f"Starting shape: {df.shape}")
         
-        for feature in self.features:
-            logger.info(f"Applying {feature.name}...")
-            df = feature.create_features(df)
-            logger.info(f"  Added {len(feature.get_feature_names())} features")
+        if all(isinstance(feature, FeatureGroup) for feature in self.features):
+            # Declared inputs: run independent specs concurrently
+            from .graph import FeatureGraph
+            
+            self.graph = FeatureGraph(self.features)
+            outputs = self.graph.run(df, max_workers=self.max_workers)
+            df = assemble_features(df, outputs)
+        else:
+            df = df.copy()
+            for feature in self.features:
+                logger.info(f"Applying {feature.name}...")
+                df = feature.create_features(df)
+                logger.info(f"  Added {len(feature.get_feature_names())} features")
         
         logger.info(f"Final shape: {df.shape}")
         logger.info(f"Total features added: {df.shape[1] - len(df.columns)}")
@@ -129,6 +220,28 @@ class FeaturePipeline:
 
 # Utility functions for feature engineering
 
+def assemble_features(df: pd.DataFrame, features: Dict[str, pd.Series]) -> pd.DataFrame:
+    """
+    Attach feature columns to a DataFrame in a single operation.
+    
+    All columns are passed to one DataFrame constructor, which copies each
+    dtype group once into a contiguous 2D block. Compared with inserting
+    columns one at a time this avoids a fragmented frame and repeated
+    consolidation copies. Existing columns keep their position (a feature
+    with the same name replaces the column); new features follow in order.
+    
+    Args:
+        df: Input DataFrame (not modified)
+        features: Dictionary mapping feature name to Series aligned with df
+        
+    Returns:
+        New DataFrame with the features added
+    """
+    columns = dict(df.items())
+    columns.update(features)
+    return pd.DataFrame(columns, index=df.index)
+
+
 def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
     """
     Calculate Relative Strength Index (RSI).
@@ -161,8 +274,9 @@ def calculate_bollinger_bands(prices: pd.Series, period: int = 20,
     Returns:
         Tuple of (upper_band, middle_band, lower_band)
     """
-    middle = prices.rolling(period).mean()
-    std = prices.rolling(period).std()
+    moments = RollingMoments(prices)
+    middle = moments.mean(period)
+    std = moments.std(period)
     upper = middle + num_std * std
     lower = middle - num_std * std
     return upper, middle, lower
@@ -194,8 +308,9 @@ def calculate_zscore(series: pd.Series, window: int = 252) -> pd.Series:
     Returns:
         Z-score series
     """
-    mean = series.rolling(window).mean()
-    std = series.rolling(window).std()
+    moments = RollingMoments(series)
+    mean = moments.mean(window)
+    std = moments.std(window)
     zscore = (series - mean) / std
     return zscore
 
@@ -0,0 +1,549 @@
+"""
+Rolling Covariance
+
+Rolling covariance and correlation matrices of many series at once, with
+selected pairs and eigen-summary features read from them.
+"""
+
+import pandas as pd
+import numpy as np
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+from .moments import _first_valid, _prefix_sum, _two_sum
+
+logger = logging.getLogger(__name__)
+
+# A window's sum of squared deviations below this fraction of its sum of
+# squares is rounding noise: the series is treated as constant
+_CONSTANT_TOLERANCE = 1e-14
+
+
+def _series_terms(nobs: np.ndarray, sx: np.ndarray,
+                  sxx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and root sum of squared deviations of a series from its window sums.
+
+    Args:
+        nobs: Number of observations
+        sx: Sum of the values
+        sxx: Sum of their squares
+
+    Returns:
+        Tuple of (mean, root sum of squared deviations); the latter is 0
+        when the deviations are rounding noise
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sx / nobs
+        ss = np.maximum(sxx - sx * mean, 0)
+    ss[ss <= _CONSTANT_TOLERANCE * sxx] = 0
+    return mean, np.sqrt(ss)
+
+
+def _pair_terms(nobs: np.ndarray, mean_x: np.ndarray, root_x: np.ndarray, root_y: np.ndarray,
+                sy: np.ndarray, sxy: np.ndarray, min_periods: int,
+                ddof: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Covariance and correlation of each pair from its series terms.
+
+    Args:
+        nobs: Observations valid in both series
+        mean_x: Mean of the first series (_series_terms)
+        root_x: Root sum of squared deviations of the first series
+        root_y: Root sum of squared deviations of the second series
+        sy: Sum of the second series
+        sxy: Sum of the cross products
+        min_periods: Minimum observations valid in both series
+        ddof: Delta degrees of freedom of the covariance
+
+    Returns:
+        Tuple of (covariance, correlation). Both are NaN for windows with
+        fewer than min_periods observations; the correlation is also NaN
+        when either series is constant over the window.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        deviation = sxy - mean_x * sy
+        cov = deviation / (nobs - ddof)
+        corr = np.clip(deviation / (root_x * root_y), -1, 1)
+
+    corr[(root_x == 0) | (root_y == 0)] = np.nan
+    short = nobs < max(min_periods, ddof + 1, 1)
+    cov[short] = np.nan
+    corr[short] = np.nan
+    return cov, corr
+
+
+def _pair_statistics(sums: Dict[str, np.ndarray], min_periods: int,
+                     ddof: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Covariance and correlation of each pair from its window sums.
+
+    Every step is elementwise, so computing the series terms once per
+    column and gathering them into pairs gives the same values.
+
+    Args:
+        sums: Window sums of each pair: 'nobs' (observations valid in
+            both series), 'sx' and 'sy' (sums of each series over them),
+            'sxx' and 'syy' (sums of squares) and 'sxy' (cross products)
+        min_periods: Minimum observations valid in both series
+        ddof: Delta degrees of freedom of the covariance
+
+    Returns:
+        Tuple of (covariance, correlation), as _pair_terms()
+    """
+    mean_x, root_x = _series_terms(sums['nobs'], sums['sx'], sums['sxx'])
+    root_y = _series_terms(sums['nobs'], sums['sy'], sums['syy'])[1]
+    return _pair_terms(sums['nobs'], mean_x, root_x, root_y, sums['sy'], sums['sxy'], min_periods, ddof)
+
+
+def eigen_summary(corr: np.ndarray, n_components: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Explained-variance shares of the leading principal components.
+
+    Args:
+        corr: Correlation matrix, or stack of them with shape (n, k, k)
+        n_components: Number of leading components
+
+    Returns:
+        Tuple of (shares with shape (..., n_components), mean off-diagonal
+        correlation). Matrices with missing entries give NaN.
+    """
+    k = corr.shape[-1]
+    stack = corr.reshape(-1, k, k)
+    shares = np.full((len(stack), n_components), np.nan)
+    mean_corr = np.full(len(stack), np.nan)
+
+    complete = np.isfinite(stack).all(axis=(1, 2))
+    if complete.any() and k > 0:
+        if not complete.all():
+            stack = stack[complete]
+        eigenvalues = np.linalg.eigvalsh(stack)[:, ::-1]
+        shares[complete] = eigenvalues[:, :n_components] / k
+        if k > 1:
+            mean_corr[complete] = (stack.sum(axis=(1, 2)) - k) / (k * (k - 1))
+    return shares.reshape(corr.shape[:-2] + (n_components,)), mean_corr.reshape(corr.shape[:-2])
+
+
+def _component_names(n_components: int) -> List[str]:
+    """Column names of eigen-summary features."""
+    return [f'pc{i + 1}_share' for i in range(n_components)] + ['mean_corr']
+
+
+class RollingCovariance:
+    """
+    Rolling covariance and correlation matrices of k columns.
+
+    The sliding sums of x and x x^T behind every pair's covariance are read
+    from compensated prefix sums over rows. The single-series terms (mean
+    and root sum of squared deviations) are computed once per column and
+    gathered into pairs, so a pair costs one prefix sum of its cross
+    products; pairs are computed on first use and cached, so reading a few
+    pairs never pays for the whole matrix, and the diagonal needs no cross
+    products. Missing values are deleted pairwise, correcting only the
+    windows that hold a missing value, and infinite values count as
+    missing, as in pandas' rolling cov/corr. Columns are centred on their
+    first valid value, which leaves the covariances unchanged, keeps the
+    sums small and depends on no later row, so appending rows never
+    changes earlier results and SlidingCovariance reproduces them exactly.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        """
+        Initialize RollingCovariance.
+
+        Args:
+            frame: DataFrame with one column per series (rows are time)
+        """
+        x = frame.to_numpy(dtype=np.float64)
+        self.index = frame.index
+        self.columns = list(frame.columns)
+        self.n, self.k = x.shape
+
+        finite = np.isfinite(x)
+        self.x = np.where(finite, x - _first_valid(x, finite), 0.0)
+        self.valid = finite.astype(np.float64)
+        self.missing_rows = np.flatnonzero(~finite.all(axis=1))
+
+        # Pairs of the upper triangle, diagonal included
+        self.first, self.second = np.triu_indices(self.k)
+        self._pair = {}
+        for p, (i, j) in enumerate(zip(self.first, self.second)):
+            self._pair[(i, j)] = p
+            self._pair[(j, i)] = p
+
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _window(self, prefix: Tuple[np.ndarray, np.ndarray], window: int) -> np.ndarray:
+        """Window sums of every row from (hi, lo) prefix sums."""
+        hi, lo = prefix
+        result = hi[1:] + lo[1:]
+        if window < self.n:
+            result[window:] = ((hi[window + 1:] - hi[1:self.n - window + 1])
+                               + (lo[window + 1:] - lo[1:self.n - window + 1]))
+        return result
+
+    def _column_sums(self, window: int) -> Dict[str, np.ndarray]:
+        """
+        Window sums of the single-series terms of every column, with shape
+        (n, k), and their series terms (mean, root).
+        """
+        key = ('columns', window)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+            if 'prefix' not in self._cache:
+                terms = {'nobs': self.valid, 'sx': self.x, 'sxx': self.x * self.x}
+                self._cache['prefix'] = {name: _prefix_sum(values) for name, values in terms.items()}
+            prefix = self._cache['prefix']
+
+        sums = {name: self._window(values, window) for name, values in prefix.items()}
+        sums['mean'], sums['root'] = _series_terms(sums['nobs'], sums['sx'], sums['sxx'])
+        with self._lock:
+            self._cache[key] = sums
+        return sums
+
+    def _cross_sums(self, pairs: np.ndarray, window: int) -> np.ndarray:
+        """Window sums of the cross products of off-diagonal pairs, with shape (n, len(pairs))."""
+        i, j = self.first[pairs], self.second[pairs]
+        return self._window(_prefix_sum(self.x[:, i] * self.x[:, j]), window)
+
+    def _unpaired(self, pairs: np.ndarray, sxy: np.ndarray,
+                  window: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Window sums of off-diagonal pairs without the values whose partner
+        is missing (pairwise deletion), for the rows whose window holds a
+        missing value.
+
+        Only rows with a missing value contribute, so the correction is
+        accumulated over those rows alone.
+
+        Returns:
+            Tuple of (affected rows, window sums of each pair on them)
+        """
+        rows = self.missing_rows
+        first, second = self.first[pairs], self.second[pairs]
+        x, valid = self.x[rows], self.valid[rows]
+        xi, xj = x[:, first], x[:, second]
+        vi, vj = valid[:, first], valid[:, second]
+        terms = {
+            'nobs': vi * (1 - vj),
+            'sx': xi * (1 - vj),
+            'sy': xj * (1 - vi),
+            'sxx': xi * xi * (1 - vj),
+            'syy': xj * xj * (1 - vi),
+        }
+
+        # Missing rows up to each row, and before the start of its window
+        end = np.searchsorted(rows, np.arange(1, self.n + 1))
+        start = np.searchsorted(rows, np.arange(1, self.n + 1) - window)
+        affected = np.flatnonzero(end > start)
+        end, start = end[affected], start[affected]
+
+        column = self._column_sums(window)
+        sums = {
+            'nobs': column['nobs'][np.ix_(affected, first)],
+            'sx': column['sx'][np.ix_(affected, first)],
+            'sy': column['sx'][np.ix_(affected, second)],
+            'sxx': column['sxx'][np.ix_(affected, first)],
+            'syy': column['sxx'][np.ix_(affected, second)],
+        }
+        for name, values in terms.items():
+            total = np.zeros((len(rows) + 1, values.shape[1]))
+            np.cumsum(values, axis=0, out=total[1:])
+            sums[name] -= total[end] - total[start]
+        sums['sxy'] = sxy[affected]
+        return affected, sums
+
+    def _statistics(self, pairs: np.ndarray, window: int, min_periods: Optional[int],
+                    ddof: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Covariance and correlation of the given pairs, with shape (n, len(pairs))."""
+        key = ('stats', window, min_periods, ddof)
+        with self._lock:
+            if key not in self._cache:
+                n_pairs = len(self.first)
+                self._cache[key] = (np.empty((self.n, n_pairs)), np.empty((self.n, n_pairs)),
+                                    np.zeros(n_pairs, dtype=bool))
+            cov_all, corr_all, done = self._cache[key]
+            todo = np.array([p for p in pairs if not done[p]], dtype=int)
+
+        if len(todo):
+            min_periods = window if min_periods is None else min_periods
+            column = self._column_sums(window)
+            first, second = self.first[todo], self.second[todo]
+            off = np.flatnonzero(first != second)
+
+            # Series terms come from the columns; the cross products of a
+            # series with itself are its squares
+            sxy = column['sxx'][:, first]
+            if len(off):
+                sxy[:, off] = self._cross_sums(todo[off], window)
+            cov, corr = _pair_terms(column['nobs'][:, first], column['mean'][:, first],
+                                    column['root'][:, first], column['root'][:, second],
+                                    column['sx'][:, second], sxy, min_periods, ddof)
+
+            # Windows holding a missing value, pair by pair
+            if len(off) and len(self.missing_rows):
+                affected, sums = self._unpaired(todo[off], sxy[:, off], window)
+                cov_pairs, corr_pairs = _pair_statistics(sums, min_periods, ddof)
+                cov[np.ix_(affected, off)] = cov_pairs
+                corr[np.ix_(affected, off)] = corr_pairs
+
+            diagonal = first == second
+            corr[:, diagonal] = np.where(np.isnan(corr[:, diagonal]), np.nan, 1.0)
+            with self._lock:
+                cov_all[:, todo] = cov
+                corr_all[:, todo] = corr
+                done[todo] = True
+
+        return cov_all[:, pairs], corr_all[:, pairs]
+
+    def _all_pairs(self) -> np.ndarray:
+        """Indices of every pair, diagonal included."""
+        return np.arange(len(self.first))
+
+    def _matrix(self, pairs: np.ndarray) -> np.ndarray:
+        """Expand per-pair values with shape (n, pairs) to (n, k, k) matrices."""
+        matrix = np.empty((self.n, self.k, self.k))
+        matrix[:, self.first, self.second] = pairs
+        matrix[:, self.second, self.first] = pairs
+        return matrix
+
+    def cov(self, window: int, min_periods: Optional[int] = None, ddof: int = 1) -> np.ndarray:
+        """
+        Rolling covariance matrices.
+
+        Args:
+            window: Window size
+            min_periods: Minimum observations valid in both series. Defaults to window.
+            ddof: Delta degrees of freedom
+
+        Returns:
+            Array with shape (n, k, k) in the order of the columns
+        """
+        return self._matrix(self._statistics(self._all_pairs(), window, min_periods, ddof)[0])
+
+    def corr(self, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+        """
+        Rolling correlation matrices.
+
+        Args:
+            window: Window size
+            min_periods: Minimum observations valid in both series. Defaults to window.
+
+        Returns:
+            Array with shape (n, k, k) in the order of the columns
+        """
+        return self._matrix(self._statistics(self._all_pairs(), window, min_periods, 1)[1])
+
+    def pair(self, a: str, b: str, window: int, stat: str = 'corr',
+             min_periods: Optional[int] = None) -> pd.Series:
+        """
+        Rolling covariance or correlation of one pair of columns.
+
+        Args:
+            a: First column
+            b: Second column
+            window: Window size
+            stat: 'corr' or 'cov'
+            min_periods: Minimum observations valid in both series. Defaults to window.
+
+        Returns:
+            Series aligned with the frame
+        """
+        if stat not in ('cov', 'corr'):
+            raise ValueError(f"Unknown pair statistic: {stat}")
+        p = self._pair[(self.columns.index(a), self.columns.index(b))]
+        values = self._statistics(np.array([p]), window, min_periods, 1)[0 if stat == 'cov' else 1][:, 0]
+        return pd.Series(values, index=self.index, name=f"{a}_{b}_{stat}_{window}")
+
+    def pairs(self, pairs: Sequence[Tuple[str, str]], window: int, stat: str = 'corr',
+              min_periods: Optional[int] = None) -> pd.DataFrame:
+        """
+        Rolling covariance or correlation of several pairs of columns.
+
+        Args:
+            pairs: (a, b) column pairs
+            window: Window size
+            stat: 'corr' or 'cov'
+            min_periods: Minimum observations valid in both series. Defaults to window.
+
+        Returns:
+            DataFrame with one column per pair, named a_b_<stat>_<window>
+        """
+        if stat not in ('cov', 'corr'):
+            raise ValueError(f"Unknown pair statistic: {stat}")
+        if not pairs:
+            return pd.DataFrame(index=self.index)
+        indices = np.array([self._pair[(self.columns.index(a), self.columns.index(b))] for a, b in pairs])
+        values = self._statistics(indices, window, min_periods, 1)[0 if stat == 'cov' else 1]
+        return pd.DataFrame(values, index=self.index, columns=[f"{a}_{b}_{stat}_{window}" for a, b in pairs])
+
+    def eigen_summary(self, window: int, n_components: int = 1,
+                      min_periods: Optional[int] = None) -> pd.DataFrame:
+        """
+        Principal-component summary of the rolling correlation matrices.
+
+        Args:
+            window: Window size
+            n_components: Number of leading components
+            min_periods: Minimum observations valid in both series. Defaults to window.
+
+        Returns:
+            DataFrame with the explained-variance share of each leading
+            component (pc1_share, ...) and the mean pairwise correlation
+        """
+        shares, mean_corr = eigen_summary(self.corr(window, min_periods), n_components)
+        data = np.column_stack([shares, mean_corr])
+        return pd.DataFrame(data, index=self.index, columns=_component_names(n_components))
+
+
+class SlidingCovariance:
+    """
+    Rolling covariance and correlation matrix updated one row at a time.
+
+    Online counterpart of RollingCovariance that reproduces it exactly: the
+    same compensated prefix sums of the single-series terms and of the
+    cross products of every pair gain one row per update, and the window
+    sums are their differences with the prefix sums from window rows ago,
+    kept in a ring of window + 1 snapshots. Missing values are deleted
+    pairwise through the same running correction over rows with a missing
+    value. An update costs O(k^2) however long the window.
+    """
+
+    def __init__(self, columns: List[str], window: int, min_periods: Optional[int] = None):
+        """
+        Initialize SlidingCovariance.
+
+        Args:
+            columns: Series names, in the order of the rows passed to update()
+            window: Window size
+            min_periods: Minimum observations valid in both series. Defaults to window.
+        """
+        self.columns = list(columns)
+        self.k = len(self.columns)
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+
+        self.centre = np.full(self.k, np.nan)
+        self.first, self.second = np.triu_indices(self.k)
+        self.off = np.flatnonzero(self.first != self.second)
+
+        # Prefix sums of valid counts, x and x^2 per column and of the cross
+        # products of the off-diagonal pairs, as (hi, lo) pairs
+        size = 3 * self.k + len(self.off)
+        self.hi = np.zeros(size)
+        self.lo = np.zeros(size)
+        # Rows with a missing value and the running sum of their pairwise
+        # deletion terms
+        self.missing = 0
+        self.missing_total = np.zeros((5, len(self.off)))
+        self.history = deque(maxlen=window + 1)
+
+    def update(self, row: Sequence[float]) -> None:
+        """
+        Push a new row, dropping the oldest one once the window is full.
+
+        Args:
+            row: Values in the order of columns (NaN allowed)
+        """
+        values = np.asarray(row, dtype=np.float64)
+        finite = np.isfinite(values)
+        # Centre each series on its first valid value
+        start = finite & np.isnan(self.centre)
+        self.centre[start] = values[start]
+
+        x = np.where(finite, values - self.centre, 0.0)
+        valid = finite.astype(np.float64)
+        xi, xj = x[self.first[self.off]], x[self.second[self.off]]
+        terms = np.concatenate([valid, x, x * x, xi * xj])
+        error = _two_sum(self.hi, terms)[1]
+        self.hi = self.hi + terms
+        self.lo = self.lo + error
+
+        if not finite.all():
+            vi, vj = valid[self.first[self.off]], valid[self.second[self.off]]
+            unpaired = np.stack([vi * (1 - vj), xi * (1 - vj), xj * (1 - vi),
+                                 xi * xi * (1 - vj), xj * xj * (1 - vi)])
+            self.missing += 1
+            self.missing_total = self.missing_total + unpaired
+
+        self.history.append((self.hi, self.lo, self.missing, self.missing_total))
+
+    def _statistics(self, ddof: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        hi, lo, missing, missing_total = self.history[-1]
+        if len(self.history) > self.window:
+            old_hi, old_lo, old_missing, old_total = self.history[0]
+            window = (hi - old_hi) + (lo - old_lo)
+        else:
+            old_missing, old_total = 0, np.zeros_like(missing_total)
+            window = hi + lo
+
+        k = self.k
+        nobs, sx, sxx = window[:k], window[k:2 * k], window[2 * k:3 * k]
+        sums = {
+            'nobs': nobs[self.first],
+            'sx': sx[self.first],
+            'sy': sx[self.second],
+            'sxx': sxx[self.first],
+            'syy': sxx[self.second],
+        }
+        sums['sxy'] = sums['sxx'].copy()
+        sums['sxy'][self.off] = window[3 * k:]
+        if missing > old_missing:
+            unpaired = missing_total - old_total
+            for t, name in enumerate(['nobs', 'sx', 'sy', 'sxx', 'syy']):
+                sums[name][self.off] -= unpaired[t]
+
+        cov, corr = _pair_statistics(sums, self.min_periods, ddof)
+        diagonal = self.first == self.second
+        corr[diagonal] = np.where(np.isnan(corr[diagonal]), np.nan, 1.0)
+        return self._matrix(cov), self._matrix(corr)
+
+    def _matrix(self, pairs: np.ndarray) -> np.ndarray:
+        """Expand per-pair values to a k x k matrix."""
+        matrix = np.empty((self.k, self.k))
+        matrix[self.first, self.second] = pairs
+        matrix[self.second, self.first] = pairs
+        return matrix
+
+    def cov(self, ddof: int = 1) -> np.ndarray:
+        """Covariance matrix of the current window."""
+        return self._statistics(ddof)[0]
+
+    def corr(self) -> np.ndarray:
+        """Correlation matrix of the current window."""
+        return self._statistics()[1]
+
+    def pair(self, a: str, b: str, stat: str = 'corr') -> float:
+        """
+        Covariance or correlation of one pair over the current window.
+
+        Args:
+            a: First series
+            b: Second series
+            stat: 'corr' or 'cov'
+
+        Returns:
+            Statistic, or NaN if the window is incomplete
+        """
+        if stat not in ('cov', 'corr'):
+            raise ValueError(f"Unknown pair statistic: {stat}")
+        matrix = self.cov() if stat == 'cov' else self.corr()
+        return float(matrix[self.columns.index(a), self.columns.index(b)])
+
+    def eigen_summary(self, n_components: int = 1) -> Dict[str, float]:
+        """
+        Principal-component summary of the current correlation matrix.
+
+        Args:
+            n_components: Number of leading components
+
+        Returns:
+            Dictionary with pc1_share, ... and mean_corr
+        """
+        shares, mean_corr = eigen_summary(self.corr(), n_components)
+        values = list(shares) + [float(mean_corr)]
+        return dict(zip(_component_names(n_components), map(float, values)))
@@ -0,0 +1,199 @@
+"""
+Intermediate Cache
+
+Keyed cache for intermediate series shared between feature groups.
+"""
+
+import pandas as pd
+import threading
+from typing import Callable, Dict, Hashable, Mapping, Sequence, Tuple, Union
+import logging
+
+from .covariance import RollingCovariance
+from .moments import MOMENT_STATS, RollingMoments
+from .order_stats import rolling_rank_pct, rolling_quantile
+
+logger = logging.getLogger(__name__)
+
+# A source is a column name or the key of another intermediate
+Source = Union[str, Tuple]
+
+
+class IntermediateCache:
+    """
+    Cache of intermediate series scoped to one feature build.
+
+    Every primitive (pct_change, diff, shift, rolling statistics) is keyed
+    by (op, source, params), where the source is a column of the frame or
+    the key of another intermediate, so each one is computed exactly once
+    however many features use it. Sources are read from the frame on first
+    use, so a column must not be overwritten after a feature derived from
+    it has been requested. Concurrent requests for the same key wait for
+    the first one instead of computing it again.
+    """
+
+    def __init__(self, df: Union[pd.DataFrame, Mapping[str, pd.Series]]):
+        """
+        Initialize IntermediateCache.
+
+        Args:
+            df: Frame, or mapping of column name to Series, the build
+                reads its columns from
+        """
+        self.df = df
+        self.store = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    @staticmethod
+    def key(op: str, source: Source, *params) -> Tuple:
+        """
+        Build the key of an intermediate.
+
+        Args:
+            op: Operation name
+            source: Column name or key of another intermediate
+            *params: Operation parameters
+
+        Returns:
+            Key tuple
+        """
+        return (op, source) + params
+
+    def get(self, key: Hashable, func: Callable[[], pd.Series]) -> pd.Series:
+        """
+        Return a cached intermediate, computing it with func on first use.
+
+        Args:
+            key: Cache key
+            func: Zero-argument function computing the value
+
+        Returns:
+            Cached value
+        """
+        with self._lock:
+            if key in self.store:
+                self.hits += 1
+                return self.store[key]
+            key_lock = self._pending.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self.store:
+                    self.hits += 1
+                    return self.store[key]
+
+            value = func()
+
+            with self._lock:
+                self.store[key] = value
+                self.misses += 1
+                self._pending.pop(key, None)
+
+        return value
+
+    def series(self, source: Source) -> pd.Series:
+        """
+        Resolve a source to a series.
+
+        Args:
+            source: Column name or key of a cached intermediate
+
+        Returns:
+            Series
+        """
+        if isinstance(source, tuple):
+            with self._lock:
+                if source in self.store:
+                    return self.store[source]
+            return self._compute(source)
+        return self.df[source]
+
+    def _compute(self, key: Tuple) -> pd.Series:
+        """Compute an intermediate from its key."""
+        op, source, *params = key
+        if op == 'pct_change':
+            return self.pct_change(source, *params)
+        if op == 'diff':
+            return self.diff(source, *params)
+        if op == 'shift':
+            return self.shift(source, *params)
+        if op == 'rolling':
+            return self.rolling(source, *params)
+        raise KeyError(f"Intermediate {key} is not cached and cannot be rebuilt from its key")
+
+    def pct_change(self, source: Source, periods: int = 1) -> pd.Series:
+        """Cached source.pct_change(periods)."""
+        return self.get(self.key('pct_change', source, periods),
+                        lambda: self.series(source).pct_change(periods))
+
+    def diff(self, source: Source, periods: int = 1) -> pd.Series:
+        """Cached source.diff(periods)."""
+        return self.get(self.key('diff', source, periods),
+                        lambda: self.series(source).diff(periods))
+
+    def shift(self, source: Source, periods: int) -> pd.Series:
+        """Cached source.shift(periods)."""
+        return self.get(self.key('shift', source, periods),
+                        lambda: self.series(source).shift(periods))
+
+    def moments(self, source: Source) -> RollingMoments:
+        """Cached RollingMoments of a source, shared by all of its rolling moments."""
+        return self.get(self.key('moments', source), lambda: RollingMoments(self.series(source)))
+
+    def covariance(self, sources: Sequence[Tuple[str, Source]]) -> RollingCovariance:
+        """
+        Cached rolling covariance engine over several sources.
+
+        Args:
+            sources: (label, source) pairs; labels name the engine's columns
+
+        Returns:
+            RollingCovariance shared by every feature reading these sources
+        """
+        sources = tuple(sources)
+        return self.get(self.key('covariance', sources),
+                        lambda: RollingCovariance(pd.DataFrame({label: self.series(source)
+                                                                for label, source in sources})))
+
+    def rolling(self, source: Source, window: int, stat: str, *args) -> pd.Series:
+        """
+        Cached rolling statistic with min_periods equal to the window.
+
+        Moments (sum, mean, var, std, zscore, skew, kurt) of a source for
+        every window are read from its shared RollingMoments; ranks,
+        quantiles and extrema use pandas' rolling kernels.
+
+        Args:
+            source: Column name or key of another intermediate
+            window: Window size
+            stat: A statistic of MOMENT_STATS, 'min', 'max', 'rank_pct'
+                or 'quantile'
+            *args: Extra statistic arguments (the quantile for 'quantile')
+
+        Returns:
+            Rolling statistic
+        """
+        def compute() -> pd.Series:
+            if stat in MOMENT_STATS:
+                return getattr(self.moments(source), stat)(window, *args)
+            series = self.series(source)
+            if stat == 'rank_pct':
+                return rolling_rank_pct(series, window)
+            if stat == 'quantile':
+                return rolling_quantile(series, window, *args)
+            return getattr(series.rolling(window), stat)(*args)
+
+        return self.get(self.key('rolling', source, window, stat, *args), compute)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache hit/miss counts.
+
+        Returns:
+            Dictionary with hits, misses and number of cached entries
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self.store)}
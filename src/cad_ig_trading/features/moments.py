@@ -0,0 +1,377 @@
+"""
+Rolling Moments
+
+Rolling mean, variance, z-score, skew and kurtosis of a column or a 2D
+block (time x asset) for any number of windows: pandas' kernels for the
+first two moments, one set of compensated prefix sums per column for the
+higher ones.
+"""
+
+import pandas as pd
+import numpy as np
+import threading
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
+import logging
+
+from .run_length import _last_true_index, run_length
+
+logger = logging.getLogger(__name__)
+
+
+def _two_sum(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Knuth's TwoSum: a + b as a rounded sum and its exact rounding error."""
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+
+def _prefix_sum(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compensated prefix sums of a sequence.
+
+    np.cumsum adds sequentially, so the rounding error of every step can be
+    recovered with TwoSum afterwards (the rounded sums are the prefix sums
+    themselves) and accumulated separately. 2D inputs are summed down each
+    column.
+
+    Returns:
+        (hi, lo) prefix sums of length n + 1 starting at 0
+    """
+    total = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=total[1:])
+    previous, current = total[:-1], total[1:]
+
+    # TwoSum error (a - (s - bb)) + (b - bb), with bb = s - a, in place
+    error = np.zeros_like(total)
+    bb = current - previous
+    np.subtract(current, bb, out=error[1:])
+    np.subtract(previous, error[1:], out=error[1:])
+    np.subtract(values, bb, out=bb)
+    error[1:] += bb
+    return total, np.cumsum(error, axis=0, out=error)
+
+
+def _first_valid(x: np.ndarray, finite: np.ndarray) -> np.ndarray:
+    """
+    First finite value of every column, or 0 for columns without one.
+
+    Args:
+        x: 1D or 2D array (rows are time)
+        finite: np.isfinite(x)
+
+    Returns:
+        Scalar array (1D input) or one value per column
+    """
+    first = np.take_along_axis(x, finite.argmax(axis=0)[None, ...], axis=0)[0]
+    return np.where(finite.any(axis=0), first, 0.0)
+
+
+class RollingMoments:
+    """
+    Rolling moments of one or more columns, shared by every window.
+
+    Sums, means, variances, standard deviations and z-scores come from
+    pandas' rolling kernels, a single compensated pass per window that is
+    faster than differencing prefix sums; each result is cached, so a mean
+    or std read by several features is computed once.
+
+    Skew and kurtosis read the power sums of every window from compensated
+    prefix sums of the first to fourth powers, built once per column and
+    shared by every window; one set of window sums feeds both statistics.
+    A window sum is the difference of two prefix sums, which is correctly
+    rounded, plus the difference of their accumulated rounding errors. The
+    values are shifted by each column's first valid value before the
+    powers are taken, which keeps the sums small without looking ahead:
+    a row's moments depend only on the rows up to it, so appending rows
+    never changes them. Skew and kurtosis use pandas' formulas on the
+    shifted window sums.
+
+    Conventions follow pandas' rolling aggregations: infinite values count
+    as missing, a window with fewer than min_periods valid values is NaN,
+    and a window of identical values has skew 0 and kurtosis -3.
+    """
+
+    def __init__(self, values: Union[pd.Series, pd.DataFrame, np.ndarray]):
+        """
+        Initialize RollingMoments.
+
+        Args:
+            values: Series, DataFrame or array (rows are time). Every column
+                of a DataFrame or 2D array is rolled independently.
+        """
+        x = np.asarray(values, dtype=np.float64)
+        self.is_array = not isinstance(values, (pd.Series, pd.DataFrame))
+        if self.is_array:
+            values = pd.DataFrame(x) if x.ndim == 2 else pd.Series(x)
+        self.frame = values
+        self.index = values.index
+        self.name = values.name if isinstance(values, pd.Series) else None
+        self.columns = values.columns if isinstance(values, pd.DataFrame) else None
+        self.values = x
+        self.n = len(x)
+
+        self.finite = np.isfinite(x)
+        self.all_finite = bool(self.finite.all())
+
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, key: Tuple, func: Callable[[], Any]) -> Any:
+        """Value of func cached under key."""
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        value = func()
+        with self._lock:
+            return self._cache.setdefault(key, value)
+
+    def _rolling(self, stat: str, window: int, min_periods: Optional[int],
+                 *args) -> Union[pd.Series, pd.DataFrame]:
+        """Cached pandas rolling aggregation of the input."""
+        return self._cached(('rolling', stat, window, min_periods) + args,
+                            lambda: getattr(self.frame.rolling(window, min_periods=min_periods), stat)(*args))
+
+    def _wrap(self, result: Union[pd.Series, pd.DataFrame]) -> Union[pd.Series, pd.DataFrame, np.ndarray]:
+        """Return a pandas result as an array if the input was one."""
+        return result.to_numpy() if self.is_array else result
+
+    def sum(self, window: int, min_periods: Optional[int] = None) -> Union[pd.Series, np.ndarray]:
+        """
+        Rolling sum.
+
+        Args:
+            window: Window size
+            min_periods: Minimum valid values in the window. Defaults to window.
+
+        Returns:
+            Rolling sums
+        """
+        return self._wrap(self._rolling('sum', window, min_periods))
+
+    def mean(self, window: int, min_periods: Optional[int] = None) -> Union[pd.Series, np.ndarray]:
+        """
+        Rolling mean.
+
+        Args:
+            window: Window size
+            min_periods: Minimum valid values in the window. Defaults to window.
+
+        Returns:
+            Rolling means
+        """
+        return self._wrap(self._rolling('mean', window, min_periods))
+
+    def var(self, window: int, min_periods: Optional[int] = None,
+            ddof: int = 1) -> Union[pd.Series, np.ndarray]:
+        """
+        Rolling variance.
+
+        Args:
+            window: Window size
+            min_periods: Minimum valid values in the window. Defaults to window.
+            ddof: Delta degrees of freedom
+
+        Returns:
+            Rolling variances
+        """
+        return self._wrap(self._rolling('var', window, min_periods, ddof))
+
+    def std(self, window: int, min_periods: Optional[int] = None,
+            ddof: int = 1) -> Union[pd.Series, np.ndarray]:
+        """
+        Rolling standard deviation.
+
+        Args:
+            window: Window size
+            min_periods: Minimum valid values in the window. Defaults to window.
+            ddof: Delta degrees of freedom
+
+        Returns:
+            Rolling standard deviations
+        """
+        return self._wrap(self._rolling('std', window, min_periods, ddof))
+
+    def zscore(self, window: int, min_periods: Optional[int] = None) -> Union[pd.Series, np.ndarray]:
+        """
+        Rolling z-score of each value against its trailing window.
+
+        Args:
+            window: Window size
+            min_periods: Minimum valid values in the window. Defaults to window.
+
+        Returns:
+            (x - rolling mean) / rolling std
+        """
+        mean = self._rolling('mean', window, min_periods)
+        std = self._rolling('std', window, min_periods, 1)
+        return self._wrap((self.frame - mean) / std)
+
+    def _window_diff(self, prefix: np.ndarray, window: int) -> np.ndarray:
+        """Difference of a prefix array across every row's trailing window."""
+        result = prefix[1:].copy()
+        if window < self.n:
+            result[window:] -= prefix[1:self.n - window + 1]
+        return result
+
+    def _power_prefix(self) -> Tuple[np.ndarray, list]:
+        """
+        Prefix count of valid values and compensated prefix sums of the
+        first to fourth powers of the shifted values.
+        """
+        def build():
+            shift = _first_valid(self.values, self.finite)
+            y = np.where(self.finite, self.values - shift, 0.0)
+            count = np.zeros((self.n + 1,) + y.shape[1:])
+            np.cumsum(self.finite, axis=0, out=count[1:])
+            prefixes = []
+            power = y
+            for _ in range(4):
+                prefixes.append(_prefix_sum(power))
+                power = power * y
+            return count, prefixes
+
+        return self._cached(('prefix',), build)
+
+    def _constant(self, nobs: np.ndarray) -> np.ndarray:
+        """
+        Rows whose window values are one repeated value, as pandas tracks them.
+
+        Missing values are skipped, so a run of equal valid values continues
+        across them.
+        """
+        def build():
+            if self.all_finite:
+                return run_length(self.values)
+            # Forward fill the last valid value and count valid values
+            # since the start of its run of equal values
+            latest = _last_true_index(self.finite)
+            seen = np.maximum.accumulate(self.finite, axis=0)
+            last = np.where(seen, np.take_along_axis(self.values, latest, axis=0), np.nan)
+            previous = np.full(self.values.shape, np.nan)
+            previous[1:] = last[:-1]
+            start = self.finite & (self.values != previous)
+            count = np.cumsum(self.finite, axis=0)
+            first = _last_true_index(start)
+            return np.where(seen, count - np.take_along_axis(count, first, axis=0) + 1, 0)
+
+        runs = self._cached(('runs',), build)
+        return (runs >= nobs) & (nobs > 0)
+
+    def _central(self, window: int) -> Tuple[np.ndarray, ...]:
+        """pandas' A, B, C and D moment terms of each window, with its count."""
+        def build():
+            count, prefixes = self._power_prefix()
+            nobs = self._window_diff(count, window)
+            sums = [self._window_diff(hi, window) + self._window_diff(lo, window) for hi, lo in prefixes]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                A = sums[0] / nobs
+                R = A * A
+                B = sums[1] / nobs - R
+                R = R * A
+                C = sums[2] / nobs - R - 3 * A * B
+                R = R * A
+                D = sums[3] / nobs - R - 6 * B * A * A - 4 * C * A
+            return nobs, A, B, C, D
+
+        return self._cached(('central', window), build)
+
+    def _finish(self, result: np.ndarray, window: int, min_periods: Optional[int],
+                nobs: np.ndarray, required: int = 1) -> Union[pd.Series, pd.DataFrame, np.ndarray]:
+        """
+        Blank windows without enough valid values and wrap the result.
+
+        Args:
+            result: Statistic of every window (modified in place)
+            window: Window size
+            min_periods: Minimum valid values in the window. Defaults to window.
+            nobs: Number of valid values in each window
+            required: Minimum valid values the statistic needs
+
+        Returns:
+            Series or DataFrame aligned with the input if it was one, else
+            the array
+        """
+        min_periods = window if min_periods is None else min_periods
+        result[nobs < max(min_periods, required)] = np.nan
+        if self.is_array:
+            return result
+        if self.columns is not None:
+            return pd.DataFrame(result, index=self.index, columns=self.columns)
+        return pd.Series(result, index=self.index, name=self.name)
+
+    def skew(self, window: int, min_periods: Optional[int] = None) -> Union[pd.Series, np.ndarray]:
+        """
+        Rolling unbiased skewness.
+
+        Args:
+            window: Window size
+            min_periods: Minimum valid values in the window. Defaults to window.
+
+        Returns:
+            Rolling skewness
+        """
+        nobs, A, B, C, _ = self._central(window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            R = np.sqrt(B)
+            result = (np.sqrt(nobs * (nobs - 1.)) * C) / ((nobs - 2) * R * R * R)
+        result[B <= 1e-14] = np.nan
+        result[self._constant(nobs)] = 0.0
+        return self._finish(result, window, min_periods, nobs, 3)
+
+    def kurt(self, window: int, min_periods: Optional[int] = None) -> Union[pd.Series, np.ndarray]:
+        """
+        Rolling unbiased excess kurtosis.
+
+        Args:
+            window: Window size
+            min_periods: Minimum valid values in the window. Defaults to window.
+
+        Returns:
+            Rolling kurtosis
+        """
+        nobs, A, B, C, D = self._central(window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            K = (nobs * nobs - 1.) * D / (B * B) - 3 * ((nobs - 1.) ** 2)
+            result = K / ((nobs - 2.) * (nobs - 3.))
+        result[B <= 1e-14] = np.nan
+        result[self._constant(nobs)] = -3.0
+        return self._finish(result, window, min_periods, nobs, 4)
+
+
+MOMENT_STATS = ['sum', 'mean', 'var', 'std', 'zscore', 'skew', 'kurt']
+
+
+def rolling_moments(values: Union[pd.Series, pd.DataFrame], windows: Sequence[int],
+                    stats: Sequence[str] = ('mean', 'std'),
+                    min_periods: Optional[int] = None) -> pd.DataFrame:
+    """
+    Rolling moments of every column for several windows as one 2D block.
+
+    The columns share one RollingMoments: every (window, statistic) is one
+    pandas pass over the block, or a few vector operations over the shared
+    prefix sums for skew and kurtosis.
+
+    Args:
+        values: Series or DataFrame (rows are time)
+        windows: Window sizes, e.g. [20, 60, 252]
+        stats: Statistics from MOMENT_STATS
+        min_periods: Minimum valid values in each window. Defaults to the window.
+
+    Returns:
+        DataFrame with (column, stat, window) MultiIndex columns
+    """
+    unknown = [stat for stat in stats if stat not in MOMENT_STATS]
+    if unknown:
+        raise ValueError(f"Unknown moment statistics: {unknown}")
+
+    frame = values.to_frame() if isinstance(values, pd.Series) else values
+    moments = RollingMoments(frame.to_numpy(dtype=np.float64))
+    keys = [(stat, window) for stat in stats for window in windows]
+    # (n, columns, statistics) block, laid out column by column
+    block = np.empty((len(frame), frame.shape[1], len(keys)))
+    for k, (stat, window) in enumerate(keys):
+        block[:, :, k] = getattr(moments, stat)(window, min_periods)
+
+    columns = pd.MultiIndex.from_tuples([(col,) + key for col in frame.columns for key in keys],
+                                        names=['column', 'stat', 'window'])
+    return pd.DataFrame(block.reshape(len(frame), -1), index=frame.index, columns=columns)
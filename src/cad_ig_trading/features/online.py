@@ -0,0 +1,677 @@
+"""
+Online Feature Engine
+
+Incremental counterpart of AllFeaturesEngineer that emits one feature row per
+new observation.
+"""
+
+import pandas as pd
+import numpy as np
+import math
+from collections import deque
+from typing import Dict, List, Optional, Union
+import logging
+
+from .covariance import SlidingCovariance, eigen_summary
+from .moments import _two_sum
+from .order_stats import SortedWindow
+from .pipeline import CROSS_ASSET_PAIRS, CROSS_ASSETS
+
+logger = logging.getLogger(__name__)
+
+
+def _isnan(x: float) -> bool:
+    return x != x
+
+
+def _div(a: float, b: float) -> float:
+    """Divide with NumPy semantics (x/0 -> +/-inf, 0/0 -> NaN)."""
+    if b == 0:
+        if a == 0 or _isnan(a):
+            return np.nan
+        return math.copysign(np.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+class _Lag:
+    """Value from k updates ago."""
+
+    def __init__(self, k: int):
+        self.buffer = deque(maxlen=k + 1)
+
+    def update(self, x: float) -> float:
+        self.buffer.append(x)
+        if len(self.buffer) < self.buffer.maxlen:
+            return np.nan
+        return self.buffer[0]
+
+
+class _RollingWindow:
+    """Fixed-size window that reports the value leaving it."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+
+    def push(self, x: float) -> Optional[float]:
+        self.values.append(x)
+        if len(self.values) > self.window:
+            return self.values.popleft()
+        return None
+
+
+class _RollingSum:
+    """
+    Rolling sum and mean with compensated add/remove updates.
+
+    Mirrors the add/remove order and compensation of pandas' rolling
+    sum/mean kernels, with min_periods equal to the window.
+    """
+
+    def __init__(self, window: int):
+        self.window = _RollingWindow(window)
+        self.nobs = 0
+        self.sum_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.neg_ct = 0
+        self.same_count = 0
+        self.prev_value = np.nan
+        self.started = False
+
+    def update(self, x: float) -> None:
+        if not self.started:
+            self.prev_value = x
+            self.started = True
+
+        removed = self.window.push(x)
+        if removed is not None and not _isnan(removed):
+            self.nobs -= 1
+            y = -removed - self.comp_remove
+            t = self.sum_x + y
+            self.comp_remove = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, removed) < 0:
+                self.neg_ct -= 1
+
+        if not _isnan(x):
+            self.nobs += 1
+            y = x - self.comp_add
+            t = self.sum_x + y
+            self.comp_add = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, x) < 0:
+                self.neg_ct += 1
+            if x == self.prev_value:
+                self.same_count += 1
+            else:
+                self.same_count = 1
+            self.prev_value = x
+
+    def sum(self) -> float:
+        if self.nobs < self.window.window:
+            return np.nan
+        if self.same_count >= self.nobs:
+            return self.prev_value * self.nobs
+        return self.sum_x
+
+    def mean(self) -> float:
+        if self.nobs < self.window.window or self.nobs == 0:
+            return np.nan
+        result = self.sum_x / self.nobs
+        if self.same_count >= self.nobs:
+            result = self.prev_value
+        elif self.neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self.neg_ct == self.nobs and result > 0:
+            result = 0.0
+        return result
+
+
+class _RollingVar:
+    """
+    Rolling variance (ddof=1) with Welford add/remove updates.
+
+    Mirrors pandas' rolling variance kernel, with min_periods equal to the
+    window.
+    """
+
+    def __init__(self, window: int):
+        self.window = _RollingWindow(window)
+        self.nobs = 0
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_count = 0
+        self.prev_value = np.nan
+        self.started = False
+
+    def update(self, x: float) -> None:
+        if not self.started:
+            self.prev_value = x
+            self.started = True
+
+        removed = self.window.push(x)
+        if removed is not None and not _isnan(removed):
+            self.nobs -= 1
+            if self.nobs:
+                prev_mean = self.mean_x - self.comp_remove
+                y = removed - self.comp_remove
+                t = y - self.mean_x
+                self.comp_remove = t + self.mean_x - y
+                self.mean_x = self.mean_x - t / self.nobs
+                self.ssqdm_x = self.ssqdm_x - (removed - prev_mean) * (removed - self.mean_x)
+            else:
+                self.mean_x = 0.0
+                self.ssqdm_x = 0.0
+
+        if not _isnan(x):
+            self.nobs += 1
+            if x == self.prev_value:
+                self.same_count += 1
+            else:
+                self.same_count = 1
+            self.prev_value = x
+            prev_mean = self.mean_x - self.comp_add
+            y = x - self.comp_add
+            t = y - self.mean_x
+            self.comp_add = t + self.mean_x - y
+            self.mean_x = self.mean_x + t / self.nobs
+            self.ssqdm_x = self.ssqdm_x + (x - prev_mean) * (x - self.mean_x)
+
+    def var(self) -> float:
+        if self.nobs < self.window.window or self.nobs <= 1:
+            return np.nan if self.nobs < self.window.window else 0.0
+        if self.same_count >= self.nobs:
+            return 0.0
+        result = self.ssqdm_x / (self.nobs - 1)
+        return max(result, 0.0)
+
+    def std(self) -> float:
+        var = self.var()
+        return math.sqrt(var) if var >= 0 else np.nan
+
+
+class _RollingHigherMoments:
+    """
+    Rolling skewness and excess kurtosis from compensated prefix sums.
+
+    Mirrors RollingMoments: the values are shifted by the first valid one,
+    the prefix sums of their first to fourth powers carry the TwoSum error
+    of every addition, and a window's power sums are the differences of
+    the current prefix sums and those from window rows ago, so every
+    result equals the batch one exactly. min_periods equals the window.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.shift = None
+        self.count = 0.0
+        self.hi = [0.0, 0.0, 0.0, 0.0]
+        self.lo = [0.0, 0.0, 0.0, 0.0]
+        # Prefix count and sums after each of the last window + 1 rows
+        self.prefixes = deque(maxlen=window + 1)
+        self.same_count = 0
+        self.prev_value = np.nan
+
+    def update(self, x: float) -> None:
+        finite = math.isfinite(x)
+        if finite and self.shift is None:
+            self.shift = x
+        y = x - self.shift if finite else 0.0
+
+        power = y
+        for k in range(4):
+            total = self.hi[k] + power
+            self.lo[k] += _two_sum(self.hi[k], power)[1]
+            self.hi[k] = total
+            power = power * y
+        self.count += finite
+        self.prefixes.append((self.count, tuple(self.hi), tuple(self.lo)))
+
+        if finite:
+            if x == self.prev_value:
+                self.same_count += 1
+            else:
+                self.same_count = 1
+            self.prev_value = x
+
+    def _central(self) -> tuple:
+        """Count of the window and pandas' A, B, C and D moment terms."""
+        count, hi, lo = self.prefixes[-1]
+        if len(self.prefixes) > self.window:
+            old_count, old_hi, old_lo = self.prefixes[0]
+            count = count - old_count
+            sums = [(hi[k] - old_hi[k]) + (lo[k] - old_lo[k]) for k in range(4)]
+        else:
+            sums = [hi[k] + lo[k] for k in range(4)]
+        n = count
+        A = _div(sums[0], n)
+        R = A * A
+        B = _div(sums[1], n) - R
+        R = R * A
+        C = _div(sums[2], n) - R - 3 * A * B
+        R = R * A
+        D = _div(sums[3], n) - R - 6 * B * A * A - 4 * C * A
+        return n, A, B, C, D
+
+    def skew(self) -> float:
+        n, A, B, C, _ = self._central()
+        if n < max(self.window, 3):
+            return np.nan
+        if self.same_count >= n:
+            return 0.0
+        if B <= 1e-14:
+            return np.nan
+        R = math.sqrt(B)
+        return (math.sqrt(n * (n - 1.0)) * C) / ((n - 2) * R * R * R)
+
+    def kurt(self) -> float:
+        n, A, B, C, D = self._central()
+        if n < max(self.window, 4):
+            return np.nan
+        if self.same_count >= n:
+            return -3.0
+        if B <= 1e-14:
+            return np.nan
+        K = (n * n - 1.0) * D / (B * B) - 3 * ((n - 1.0) ** 2)
+        return K / ((n - 2.0) * (n - 3.0))
+
+
+class _RollingExtrema:
+    """Rolling min and max with monotonic deques."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.count = 0
+        self.nan_positions = deque()
+        self.min_deque = deque()
+        self.max_deque = deque()
+
+    def update(self, x: float) -> None:
+        i = self.count
+        self.count += 1
+        start = i - self.window + 1
+
+        if _isnan(x):
+            self.nan_positions.append(i)
+        else:
+            while self.min_deque and self.min_deque[-1][1] >= x:
+                self.min_deque.pop()
+            self.min_deque.append((i, x))
+            while self.max_deque and self.max_deque[-1][1] <= x:
+                self.max_deque.pop()
+            self.max_deque.append((i, x))
+
+        while self.nan_positions and self.nan_positions[0] < start:
+            self.nan_positions.popleft()
+        while self.min_deque and self.min_deque[0][0] < start:
+            self.min_deque.popleft()
+        while self.max_deque and self.max_deque[0][0] < start:
+            self.max_deque.popleft()
+
+    def _ready(self) -> bool:
+        return self.count >= self.window and not self.nan_positions
+
+    def min(self) -> float:
+        return self.min_deque[0][1] if self._ready() else np.nan
+
+    def max(self) -> float:
+        return self.max_deque[0][1] if self._ready() else np.nan
+
+
+class _Series:
+    """Per-series state shared by several features: lags and returns."""
+
+    def __init__(self, lags: List[int]):
+        self.lags = {k: _Lag(k) for k in lags}
+        self.lagged = {}
+
+    def update(self, x: float) -> None:
+        for k, lag in self.lags.items():
+            self.lagged[k] = lag.update(x)
+
+    def diff(self, x: float, k: int) -> float:
+        return x - self.lagged[k]
+
+    def pct_change(self, x: float, k: int) -> float:
+        return _div(x, self.lagged[k]) - 1
+
+
+class OnlineFeatureEngine:
+    """
+    Incremental feature engine matching AllFeaturesEngineer.
+
+    Keeps rolling state for every feature: compensated running sums for
+    rolling means, Welford accumulators for rolling std and z-scores,
+    monotonic deques for rolling min/max, sorted windows for rolling ranks
+    and quantiles, ring buffers for lags, diffs and percent changes, and
+    counters for drawdown and streaks. update() consumes one preprocessed
+    row and returns the full feature row in O(features) time, independent
+    of the length of history.
+
+    Inputs are expected to be forward filled as DataPreprocessor or
+    StreamingPreprocessor produce them.
+
+    The accumulators reproduce the batch kernels step for step: pandas'
+    rolling kernels for the first two moments, and the causal prefix sums
+    of RollingMoments and RollingCovariance (columns centred on their first
+    valid value) for skew/kurtosis and the correlation and eigen-summary
+    features. Every feature, and the position of every missing value,
+    matches AllFeaturesEngineer exactly.
+    """
+
+    def __init__(self):
+        """Initialize online feature engine."""
+        self.feature_names = []
+        self.n_rows = 0
+
+        self.series = {
+            'cad_ig_er_index': _Series([1, 5, 10, 20, 40, 60, 120]),
+            'us_ig_er_index': _Series([1, 20]),
+            'us_hy_er_index': _Series([1, 20]),
+            'cad_oas': _Series([1, 5, 10, 20]),
+            'us_hy_oas': _Series([1, 5, 10, 20]),
+            'us_ig_oas': _Series([1, 5, 10, 20]),
+            'us_3m_10y': _Series([5, 20]),
+            'us_economic_regime': _Series([1]),
+            'us_growth_surprises': _Series([5]),
+            'us_inflation_surprises': _Series([5]),
+            'us_equity_revisions': _Series([5, 20]),
+            'tsx': _Series([1, 20, 60]),
+            'vix': _Series([1]),
+            'spx_1bf_eps': _Series([20]),
+            'spx_1bf_sales': _Series([20]),
+            'tsx_1bf_eps': _Series([20]),
+            'tsx_1bf_sales': _Series([20]),
+        }
+
+        # Regime
+        self.vol_20 = _RollingVar(20)
+        self.vol_60 = _RollingVar(60)
+        self.vol_20_quantile = SortedWindow(252)
+        self.vix_ma_20 = _RollingSum(20)
+        self.vix_ma_60 = _RollingSum(60)
+        self.zscore_252 = {col: (_RollingSum(252), _RollingVar(252))
+                           for col in ['vix', 'cad_oas', 'us_hy_oas', 'us_ig_oas']}
+
+        # Momentum
+        self.momentum_rank = {period: SortedWindow(252) for period in [5, 10, 20, 40, 60, 120]}
+        self.rsi = {period: (_RollingSum(period), _RollingSum(period)) for period in [14, 28]}
+        self.price_ma = {window: (_RollingSum(window), _RollingVar(window)) for window in [20, 60]}
+
+        # Macro
+        self.surprise_sums = {col: (_RollingSum(20), _RollingSum(60))
+                              for col in ['us_growth_surprises', 'us_inflation_surprises',
+                                          'us_hard_data_surprises']}
+
+        # Cross-asset
+        self.cross_asset_cov = SlidingCovariance([label for label, _ in CROSS_ASSETS], 60)
+
+        # Statistical
+        self.return_moments = _RollingHigherMoments(60)
+        self.running_max = np.nan
+        self.drawdown_duration = 0
+        self.prev_up_day = None
+        self.streak = 0
+
+        # Lags
+        self.feature_lags = {feat: {lag: _Lag(lag) for lag in [1, 5, 10]}
+                             for feat in ['vix', 'cad_oas', 'us_hy_oas', 'momentum_20d', 'volatility_20d']}
+
+        # Rolling stats
+        self.cad_oas_extrema = _RollingExtrema(60)
+        self.level_rank = {col: SortedWindow(252) for col in ['vix', 'cad_oas']}
+
+    def update(self, row: Union[pd.Series, Dict]) -> pd.Series:
+        """
+        Consume one preprocessed row and emit its feature row.
+
+        Args:
+            row: Preprocessed row with the raw columns
+
+        Returns:
+            Series with the raw fields followed by all features, in the
+            column order of AllFeaturesEngineer.create_all_features
+        """
+        raw = {key: row[key] for key in row.keys()}
+        r = {key: float(value) for key, value in raw.items() if key != 'Date'}
+
+        for col, state in self.series.items():
+            state.update(r[col])
+
+        f = {}
+        self._regime_features(r, f)
+        self._momentum_features(r, f)
+        self._spread_features(r, f)
+        self._yield_curve_features(r, f)
+        self._macro_features(r, f)
+        self._equity_features(r, f)
+        self._cross_asset_features(r, f)
+        self._statistical_features(r, f)
+        self._interaction_features(r, f)
+        self._lag_features(r, f)
+        self._rolling_stats(r, f)
+
+        for name, value in f.items():
+            if isinstance(value, float) and math.isinf(value):
+                f[name] = np.nan
+
+        if not self.feature_names:
+            self.feature_names = list(f)
+        self.n_rows += 1
+
+        return pd.Series({**raw, **f}, name=getattr(row, 'name', None))
+
+    def warm_up(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feed a history of preprocessed rows through the engine.
+
+        Args:
+            df: Preprocessed DataFrame in date order
+
+        Returns:
+            DataFrame with one feature row per input row
+        """
+        logger.info(f"Warming up online feature engine on {len(df)} rows")
+        rows = [self.update(row) for _, row in df.iterrows()]
+        return pd.DataFrame(rows, index=df.index)
+
+    def _regime_features(self, r: Dict[str, float], f: Dict[str, float]) -> None:
+        cad = self.series['cad_ig_er_index']
+        ret = cad.pct_change(r['cad_ig_er_index'], 1)
+
+        self.vol_20.update(ret)
+        self.vol_60.update(ret)
+        f['volatility_20d'] = self.vol_20.std()
+        f['volatility_60d'] = self.vol_60.std()
+        f['volatility_ratio'] = _div(f['volatility_20d'], f['volatility_60d'])
+        self.vol_20_quantile.update(f['volatility_20d'])
+        f['high_vol_regime'] = int(f['volatility_20d'] > self.vol_20_quantile.quantile(0.75))
+
+        self.vix_ma_20.update(r['vix'])
+        self.vix_ma_60.update(r['vix'])
+        f['vix_ma_20'] = self.vix_ma_20.mean()
+        f['vix_ma_60'] = self.vix_ma_60.mean()
+        f['vix_regime'] = int(r['vix'] > f['vix_ma_60'])
+        f['vix_zscore'] = self._zscore('vix', r['vix'])
+
+        f['economic_regime_change'] = self.series['us_economic_regime'].diff(r['us_economic_regime'], 1)
+
+        f['cad_oas_zscore'] = self._zscore('cad_oas', r['cad_oas'])
+        f['us_hy_oas_zscore'] = self._zscore('us_hy_oas', r['us_hy_oas'])
+        f['us_ig_oas_zscore'] = self._zscore('us_ig_oas', r['us_ig_oas'])
+
+        f['spread_widening'] = int(self.series['cad_oas'].diff(r['cad_oas'], 5) > 0)
+
+    def _zscore(self, col: str, x: float) -> float:
+        mean, var = self.zscore_252[col]
+        mean.update(x)
+        var.update(x)
+        return _div(x - mean.mean(), var.std())
+
+    def _momentum_features(self, r: Dict[str, float], f: Dict[str, float]) -> None:
+        price = r['cad_ig_er_index']
+        cad = self.series['cad_ig_er_index']
+
+        for period in [5, 10, 20, 40, 60, 120]:
+            momentum = cad.pct_change(price, period)
+            rank = self.momentum_rank[period]
+            rank.update(momentum)
+            f[f'momentum_{period}d'] = momentum
+            f[f'momentum_{period}d_rank'] = rank.rank_pct(momentum)
+
+        delta = cad.diff(price, 1)
+        for period in [14, 28]:
+            gain, loss = self.rsi[period]
+            gain.update(delta if delta > 0 else 0.0)
+            # Negated zero as in -delta.where(delta < 0, 0)
+            loss.update(-delta if delta < 0 else -0.0)
+            rs = _div(gain.mean(), loss.mean())
+            f[f'rsi_{period}'] = 100 - _div(100, 1 + rs)
+
+        for window in [20, 60]:
+            mean, var = self.price_ma[window]
+            mean.update(price)
+            var.update(price)
+            f[f'distance_from_ma_{window}'] = _div(price - mean.mean(), var.std())
+
+        bb_mean, bb_var = self.price_ma[20]
+        bb_middle = bb_mean.mean()
+        bb_std = bb_var.std()
+        f['bb_upper'] = bb_middle + 2 * bb_std
+        f['bb_lower'] = bb_middle - 2 * bb_std
+        f['bb_position'] = _div(price - f['bb_lower'], f['bb_upper'] - f['bb_lower'])
+
+    def _spread_features(self, r: Dict[str, float], f: Dict[str, float]) -> None:
+        for col in ['cad_oas', 'us_hy_oas', 'us_ig_oas']:
+            state = self.series[col]
+            for period in [1, 5, 10, 20]:
+                f[f'{col}_change_{period}d'] = state.diff(r[col], period)
+                f[f'{col}_pct_change_{period}d'] = state.pct_change(r[col], period)
+
+        f['cad_us_ig_spread_ratio'] = _div(r['cad_oas'], r['us_ig_oas'])
+        f['hy_ig_spread_ratio'] = _div(r['us_hy_oas'], r['us_ig_oas'])
+
+        f['cad_oas_momentum_10d'] = self.series['cad_oas'].diff(r['cad_oas'], 10)
+        f['us_hy_oas_momentum_10d'] = self.series['us_hy_oas'].diff(r['us_hy_oas'], 10)
+
+    def _yield_curve_features(self, r: Dict[str, float], f: Dict[str, float]) -> None:
+        state = self.series['us_3m_10y']
+        f['us_3m_10y_change_5d'] = state.diff(r['us_3m_10y'], 5)
+        f['us_3m_10y_change_20d'] = state.diff(r['us_3m_10y'], 20)
+        f['curve_steepening'] = int(f['us_3m_10y_change_5d'] > 0)
+
+    def _macro_features(self, r: Dict[str, float], f: Dict[str, float]) -> None:
+        for col, (sum_20, sum_60) in self.surprise_sums.items():
+            sum_20.update(r[col])
+            sum_60.update(r[col])
+            f[f'{col}_cumsum_20d'] = sum_20.sum()
+            f[f'{col}_cumsum_60d'] = sum_60.sum()
+            f[f'{col}_ma_20d'] = sum_20.mean()
+
+        f['growth_surprise_momentum'] = self.series['us_growth_surprises'].diff(r['us_growth_surprises'], 5)
+        f['inflation_surprise_momentum'] = self.series['us_inflation_surprises'].diff(r['us_inflation_surprises'], 5)
+
+        f['combined_surprise_index'] = (
+            r['us_growth_surprises'] +
+            r['us_hard_data_surprises'] -
+            r['us_inflation_surprises']
+        )
+
+    def _equity_features(self, r: Dict[str, float], f: Dict[str, float]) -> None:
+        revisions = self.series['us_equity_revisions']
+        f['us_equity_revisions_change_5d'] = revisions.diff(r['us_equity_revisions'], 5)
+        f['us_equity_revisions_change_20d'] = revisions.diff(r['us_equity_revisions'], 20)
+
+        f['tsx_momentum_20d'] = self.series['tsx'].pct_change(r['tsx'], 20)
+        f['tsx_momentum_60d'] = self.series['tsx'].pct_change(r['tsx'], 60)
+
+        f['spx_eps_change_20d'] = self.series['spx_1bf_eps'].pct_change(r['spx_1bf_eps'], 20)
+        f['spx_sales_change_20d'] = self.series['spx_1bf_sales'].pct_change(r['spx_1bf_sales'], 20)
+
+        f['tsx_eps_change_20d'] = self.series['tsx_1bf_eps'].pct_change(r['tsx_1bf_eps'], 20)
+        f['tsx_sales_change_20d'] = self.series['tsx_1bf_sales'].pct_change(r['tsx_1bf_sales'], 20)
+
+    def _cross_asset_features(self, r: Dict[str, float], f: Dict[str, float]) -> None:
+        cad = self.series['cad_ig_er_index']
+        us_ig = self.series['us_ig_er_index']
+
+        f['us_ig_er_momentum_20d'] = us_ig.pct_change(r['us_ig_er_index'], 20)
+        f['cad_ig_er_momentum_20d'] = cad.pct_change(r['cad_ig_er_index'], 20)
+        f['cad_us_ig_relative_momentum'] = f['cad_ig_er_momentum_20d'] - f['us_ig_er_momentum_20d']
+
+        f['us_hy_er_momentum_20d'] = self.series['us_hy_er_index'].pct_change(r['us_hy_er_index'], 20)
+
+        # Daily moves of the cross-asset universe, in the order of CROSS_ASSETS
+        moves = []
+        for _, (op, col, periods) in CROSS_ASSETS:
+            state = self.series[col]
+            moves.append(state.pct_change(r[col], periods) if op == 'pct_change' else state.diff(r[col], periods))
+        self.cross_asset_cov.update(moves)
+
+        corr = self.cross_asset_cov.corr()
+        labels = self.cross_asset_cov.columns
+        for name, a, b in CROSS_ASSET_PAIRS:
+            f[name] = float(corr[labels.index(a), labels.index(b)])
+        shares, mean_corr = eigen_summary(corr)
+        f['cross_asset_pc1_share_60d'] = float(shares[0])
+        f['cross_asset_mean_corr_60d'] = float(mean_corr)
+
+    def _statistical_features(self, r: Dict[str, float], f: Dict[str, float]) -> None:
+        price = r['cad_ig_er_index']
+        cad = self.series['cad_ig_er_index']
+
+        self.return_moments.update(cad.pct_change(price, 1))
+        f['returns_skew_60d'] = self.return_moments.skew()
+        f['returns_kurt_60d'] = self.return_moments.kurt()
+
+        if not _isnan(price) and not price <= self.running_max:
+            self.running_max = price
+        drawdown = _div(price - self.running_max, self.running_max) if not _isnan(price) else np.nan
+        f['drawdown'] = drawdown
+        if drawdown >= 0:
+            self.drawdown_duration = 0
+        elif drawdown < 0:
+            self.drawdown_duration += 1
+        f['drawdown_duration'] = self.drawdown_duration
+
+        up_day = int(cad.diff(price, 1) > 0)
+        self.streak = self.streak + 1 if up_day == self.prev_up_day else 1
+        self.prev_up_day = up_day
+        f['up_day'] = up_day
+        f['up_streak'] = self.streak if up_day else 0
+        f['down_streak'] = 0 if up_day else self.streak
+
+    def _interaction_features(self, r: Dict[str, float], f: Dict[str, float]) -> None:
+        f['vix_x_cad_oas'] = r['vix'] * r['cad_oas']
+        f['vix_x_spread_change'] = r['vix'] * f['cad_oas_change_5d']
+
+        f['momentum_20d_x_vol'] = f['momentum_20d'] * f['volatility_20d']
+
+        f['high_vol_x_momentum'] = f['high_vol_regime'] * f['momentum_20d']
+        f['vix_regime_x_momentum'] = f['vix_regime'] * f['momentum_20d']
+
+        f['econ_regime_x_cad_oas'] = r['us_economic_regime'] * r['cad_oas']
+
+        f['growth_x_inflation_surprise'] = r['us_growth_surprises'] * r['us_inflation_surprises']
+
+    def _lag_features(self, r: Dict[str, float], f: Dict[str, float]) -> None:
+        for feat, lags in self.feature_lags.items():
+            value = r[feat] if feat in r else f[feat]
+            for lag, state in lags.items():
+                f[f'{feat}_lag_{lag}'] = state.update(value)
+
+    def _rolling_stats(self, r: Dict[str, float], f: Dict[str, float]) -> None:
+        cad_oas = r['cad_oas']
+        self.cad_oas_extrema.update(cad_oas)
+        f['cad_oas_min_60d'] = self.cad_oas_extrema.min()
+        f['cad_oas_max_60d'] = self.cad_oas_extrema.max()
+        f['cad_oas_range_position'] = _div(cad_oas - f['cad_oas_min_60d'],
+                                           f['cad_oas_max_60d'] - f['cad_oas_min_60d'])
+
+        for col in ['vix', 'cad_oas']:
+            rank = self.level_rank[col]
+            rank.update(r[col])
+            f[f'{col}_rank_252d'] = rank.rank_pct(r[col])
@@ -0,0 +1,121 @@
+"""
+Panel Features
+
+Momentum, volatility, rank and drawdown features for several target series
+at once, computed on a (time x asset) block.
+"""
+
+import pandas as pd
+from typing import Dict, List
+import logging
+
+from .moments import RollingMoments
+from .order_stats import rolling_rank_pct
+from .run_length import drawdown_with_duration, streak
+
+logger = logging.getLogger(__name__)
+
+# Credit excess return indices covered by default
+PANEL_ASSETS = ['cad_ig_er_index', 'us_ig_er_index', 'us_hy_er_index']
+
+MOMENTUM_PERIODS = [5, 10, 20, 40, 60, 120]
+
+# Features computed for every asset, in output order
+PANEL_FEATURES = (
+    [f'momentum_{period}d' for period in MOMENTUM_PERIODS]
+    + [f'momentum_{period}d_rank' for period in MOMENTUM_PERIODS]
+    + ['volatility_20d', 'volatility_60d', 'volatility_ratio', 'rsi_14', 'rsi_28',
+       'distance_from_ma_20', 'distance_from_ma_60', 'bb_position',
+       'drawdown', 'drawdown_duration', 'up_streak', 'down_streak']
+)
+
+
+def panel_features(prices: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Calculate the panel features of every asset.
+
+    Each feature is computed for all assets in one call over the whole
+    block: percent changes, differences and rank windows run down the
+    columns, and the rolling moments of all assets come from one
+    RollingMoments over the block. The definitions match the single-asset
+    features of AllFeaturesEngineer, so the features of cad_ig_er_index equal
+    momentum_20d, volatility_20d, ... of the standard build.
+
+    Args:
+        prices: Index levels, one column per asset
+
+    Returns:
+        Dictionary mapping each name of PANEL_FEATURES to a DataFrame of
+        the feature (rows are time, columns are assets)
+    """
+    features = {}
+
+    # Multi-timeframe momentum and its percentile rank
+    momentum = {period: prices.pct_change(period) for period in MOMENTUM_PERIODS}
+    for period, block in momentum.items():
+        features[f'momentum_{period}d'] = block
+    ranks = rolling_rank_pct(pd.concat(momentum, axis=1), 252)
+    for period in MOMENTUM_PERIODS:
+        features[f'momentum_{period}d_rank'] = ranks[period]
+
+    # Volatility of daily returns
+    returns = RollingMoments(prices.pct_change())
+    features['volatility_20d'] = returns.std(20)
+    features['volatility_60d'] = returns.std(60)
+    features['volatility_ratio'] = features['volatility_20d'] / features['volatility_60d']
+
+    # RSI from average gains and losses, both read from one block
+    delta = prices.diff()
+    moves = RollingMoments(pd.concat({'gain': delta.where(delta > 0, 0),
+                                      'loss': -delta.where(delta < 0, 0)}, axis=1))
+    for period in [14, 28]:
+        average = moves.mean(period)
+        rs = average['gain'] / average['loss']
+        features[f'rsi_{period}'] = 100 - (100 / (1 + rs))
+
+    # Mean reversion and Bollinger Band position
+    levels = RollingMoments(prices)
+    for window in [20, 60]:
+        features[f'distance_from_ma_{window}'] = (prices - levels.mean(window)) / levels.std(window)
+    bb_middle = levels.mean(20)
+    bb_std = levels.std(20)
+    bb_upper = bb_middle + 2 * bb_std
+    bb_lower = bb_middle - 2 * bb_std
+    features['bb_position'] = (prices - bb_lower) / (bb_upper - bb_lower)
+
+    # Drawdown and up/down day streaks
+    features['drawdown'], features['drawdown_duration'] = drawdown_with_duration(prices)
+    up_day = (prices.diff() > 0).astype(int)
+    features['up_streak'] = streak(up_day)
+    features['down_streak'] = streak(up_day == 0)
+
+    return features
+
+
+def panel_feature_names(assets: List[str]) -> List[str]:
+    """
+    Names of the flattened panel features.
+
+    Args:
+        assets: Asset columns
+
+    Returns:
+        <asset>_<feature> names, asset by asset in PANEL_FEATURES order
+    """
+    return [f'{asset}_{name}' for asset in assets for name in PANEL_FEATURES]
+
+
+def flatten_panel(features: Dict[str, pd.DataFrame], assets: List[str]) -> Dict[str, pd.Series]:
+    """
+    Flatten panel features into one series per asset and feature.
+
+    Args:
+        features: Output of panel_features()
+        assets: Asset columns
+
+    Returns:
+        Dictionary mapping <asset>_<feature> to Series, in
+        panel_feature_names() order
+    """
+    return {f'{asset}_{name}': features[name][asset].rename(f'{asset}_{name}')
+            for asset in assets for name in PANEL_FEATURES}
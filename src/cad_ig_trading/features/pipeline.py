@@ -6,294 +6,450 @@ Implements all 140+ features from the research phase.
 
 import pandas as pd
 import numpy as np
-from .base import BaseFeature, FeaturePipeline, calculate_rsi, calculate_zscore
+from typing import List, Optional
+from .base import BaseFeature, FeatureGroup, FeaturePipeline, FeatureSpec, assemble_features
+from .graph import FeatureGraph
+from .intermediates import IntermediateCache
+from .panel import flatten_panel, panel_feature_names, panel_features
+from .run_length import drawdown_with_duration, streak
+from .store import FeatureStore
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Daily returns of the CAD IG excess return index
+RETURNS = IntermediateCache.key('pct_change', 'cad_ig_er_index', 1)
+
+# Daily moves of the cross-asset universe (ER index and TSX returns, spread
+# and VIX changes) whose rolling correlation matrix feeds the cross-asset
+# features, as (label, source) pairs
+CROSS_ASSETS = (
+    ('cad_ig', RETURNS),
+    ('us_ig', IntermediateCache.key('pct_change', 'us_ig_er_index', 1)),
+    ('us_hy', IntermediateCache.key('pct_change', 'us_hy_er_index', 1)),
+    ('tsx', IntermediateCache.key('pct_change', 'tsx', 1)),
+    ('cad_oas', IntermediateCache.key('diff', 'cad_oas', 1)),
+    ('us_ig_oas', IntermediateCache.key('diff', 'us_ig_oas', 1)),
+    ('us_hy_oas', IntermediateCache.key('diff', 'us_hy_oas', 1)),
+    ('vix', IntermediateCache.key('diff', 'vix', 1)),
+)
+CROSS_ASSET_COLUMNS = [source[1] for _, source in CROSS_ASSETS]
+
+# Correlation features: (feature, label, label) over CROSS_ASSETS
+CROSS_ASSET_PAIRS = (
+    ('cad_us_ig_corr_60d', 'cad_ig', 'us_ig'),
+    ('cad_ig_us_hy_corr_60d', 'cad_ig', 'us_hy'),
+    ('cad_ig_tsx_corr_60d', 'cad_ig', 'tsx'),
+    ('cad_ig_vix_corr_60d', 'cad_ig', 'vix'),
+    ('cad_us_oas_corr_60d', 'cad_oas', 'us_ig_oas'),
+    ('cad_oas_vix_corr_60d', 'cad_oas', 'vix'),
+)
+
+
+def _zscore(c: IntermediateCache, col: str, window: int) -> pd.Series:
+    """Rolling z-score from the cached rolling mean and std (see calculate_zscore)."""
+    mean = c.rolling(col, window, 'mean')
+    std = c.rolling(col, window, 'std')
+    return (c.series(col) - mean) / std
+
+
+def _rsi(c: IntermediateCache, col: str, period: int) -> pd.Series:
+    """RSI from cached price changes and gain/loss averages (see calculate_rsi)."""
+    delta = c.diff(col)
+    gain = c.key('gain', col)
+    loss = c.key('loss', col)
+    c.get(gain, lambda: delta.where(delta > 0, 0))
+    c.get(loss, lambda: -delta.where(delta < 0, 0))
+    rs = c.rolling(gain, period, 'mean') / c.rolling(loss, period, 'mean')
+    return 100 - (100 / (1 + rs))
+
 
 class AllFeaturesEngineer:
     """Complete feature engineering pipeline with all 140+ features."""
     
-    def __init__(self):
-        """Initialize feature engineer."""
+    def __init__(self, max_workers: Optional[int] = None,
+                 panel_assets: Optional[List[str]] = None):
+        """
+        Initialize feature engineer.
+        
+        Args:
+            max_workers: Threads used to evaluate independent features.
+                None uses one per available CPU, 1 builds sequentially.
+            panel_assets: Target series (e.g. PANEL_ASSETS) for which the
+                momentum, volatility, rank and drawdown features are also
+                built, as <asset>_<feature> columns after the standard
+                features. None builds the standard features only. Panel
+                features are not produced by the online engine.
+        """
+        self.max_workers = max_workers
+        self.panel_assets = list(panel_assets) if panel_assets else []
         self.feature_names = []
+        self.cache_stats = {}
         
-    def create_all_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def feature_groups(self) -> List[FeatureGroup]:
+        """
+        Declare every feature group.
+        
+        Returns:
+            List of FeatureGroup in output column order
+        """
+        groups = [
+            # 1. Regime Detection Features
+            self._create_regime_features(),
+            # 2. Momentum & Mean Reversion Features
+            self._create_momentum_features(),
+            # 3. Spread Dynamics Features
+            self._create_spread_features(),
+            # 4. Yield Curve Features
+            self._create_yield_curve_features(),
+            # 5. Macro Surprise Features
+            self._create_macro_features(),
+            # 6. Equity Market Features
+            self._create_equity_features(),
+            # 7. Cross-Asset Features
+            self._create_cross_asset_features(),
+            # 8. Statistical Features
+            self._create_statistical_features(),
+            # 9. Interaction Features
+            self._create_interaction_features(),
+            # 10. Lag Features
+            self._create_lag_features(),
+            # 11. Rolling Statistics
+            self._create_rolling_stats(),
+        ]
+        if self.panel_assets:
+            # 12. Panel Features
+            groups.append(self._create_panel_features())
+        return groups
+        
+    def create_all_features(self, df: pd.DataFrame,
+                            store: Optional[FeatureStore] = None,
+                            features: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Create all features at once.
         
+        Features are evaluated as a dependency graph, so groups that do not
+        read each other's outputs run concurrently.
+        
         Args:
             df: Input DataFrame with raw data
+            store: Feature store to read up-to-date groups from and write
+                recomputed groups to. None computes every group.
+            features: Features to build, e.g. a model's selected features.
+                Only these and the features they are derived from are
+                computed, with the same values as in the full build. None
+                builds every feature.
             
         Returns:
             DataFrame with all features added
+            
+        Raises:
+            ValueError: If a required feature is neither a column of df nor
+                produced by any group, or if features is combined with store
         """
-        df = df.copy()
-        
         logger.info("Creating all features...")
         logger.info(f"Starting shape: {df.shape}")
         
-        # 1. Regime Detection Features
-        df = self._create_regime_features(df)
-        
-        # 2. Momentum & Mean Reversion Features
-        df = self._create_momentum_features(df)
-        
-        # 3. Spread Dynamics Features
-        df = self._create_spread_features(df)
-        
-        # 4. Yield Curve Features
-        df = self._create_yield_curve_features(df)
-        
-        # 5. Macro Surprise Features
-        df = self._create_macro_features(df)
-        
-        # 6. Equity Market Features
-        df = self._create_equity_features(df)
-        
-        # 7. Cross-Asset Features
-        df = self._create_cross_asset_features(df)
-        
-        # 8. Statistical Features
-        df = self._create_statistical_features(df)
-        
-        # 9. Interaction Features
-        df = self._create_interaction_features(df)
-        
-        # 10. Lag Features
-        df = self._create_lag_features(df)
-        
-        # 11. Rolling Statistics
-        df = self._create_rolling_stats(df)
-        
-        # Handle infinite values
-        df = df.replace([np.inf, -np.inf], np.nan)
+        groups = self.feature_groups()
+        if features is not None:
+            if store is not None:
+                raise ValueError("A pruned feature build cannot use the feature store")
+            graph = FeatureGraph(groups)
+            unknown = [name for name in features if name not in graph.producer and name not in df.columns]
+            if unknown:
+                raise ValueError(f"Unknown features: {unknown}")
+            groups = graph.prune(features).groups
+        
+        if store is not None:
+            df = assemble_features(df, store.build(groups, df, max_workers=self.max_workers))
+            self.feature_names = [name for group in groups for name in group.feature_names]
+            self.cache_stats = store.cache_stats
+        else:
+            pipeline = FeaturePipeline(groups, max_workers=self.max_workers)
+            df = pipeline.fit_transform(df)
+            self.feature_names = pipeline.get_all_feature_names()
+            self.cache_stats = pipeline.graph.cache_stats
+        
+        # Handle infinite values, touching only the columns that have any
+        inf_cols = [col for col in df.columns
+                    if df[col].dtype.kind == 'f' and np.isinf(df[col].to_numpy()).any()]
+        if inf_cols:
+            df[inf_cols] = df[inf_cols].replace([np.inf, -np.inf], np.nan)
+        
+        logger.info(f"Intermediate cache: {self.cache_stats['hits']} hits, {self.cache_stats['misses']} misses")
         
         logger.info(f"Final shape: {df.shape}")
         logger.info(f"Total features created: {df.shape[1] - 18}")  # Subtract original columns
         
         return df
     
-    def _create_regime_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create regime detection features."""
-        logger.info("  Creating regime features...")
-        
-        # Volatility regimes
-        df['volatility_20d'] = df['cad_ig_er_index'].pct_change().rolling(20).std()
-        df['volatility_60d'] = df['cad_ig_er_index'].pct_change().rolling(60).std()
-        df['volatility_ratio'] = df['volatility_20d'] / df['volatility_60d']
-        df['high_vol_regime'] = (df['volatility_20d'] > df['volatility_20d'].rolling(252).quantile(0.75)).astype(int)
-        
-        # VIX regimes
-        df['vix_ma_20'] = df['vix'].rolling(20).mean()
-        df['vix_ma_60'] = df['vix'].rolling(60).mean()
-        df['vix_regime'] = (df['vix'] > df['vix_ma_60']).astype(int)
-        df['vix_zscore'] = calculate_zscore(df['vix'], 252)
-        
-        # Economic regime
-        df['economic_regime_change'] = df['us_economic_regime'].diff()
-        
-        # Spread regimes
-        df['cad_oas_zscore'] = calculate_zscore(df['cad_oas'], 252)
-        df['us_hy_oas_zscore'] = calculate_zscore(df['us_hy_oas'], 252)
-        df['us_ig_oas_zscore'] = calculate_zscore(df['us_ig_oas'], 252)
-        
-        # Credit spread widening regime
-        df['spread_widening'] = (df['cad_oas'].diff(5) > 0).astype(int)
-        
-        return df
+    def _create_regime_features(self) -> FeatureGroup:
+        """Declare regime detection features."""
+        specs = [
+            # Volatility regimes
+            FeatureSpec('volatility_20d', ['cad_ig_er_index'], lambda c: c.rolling(RETURNS, 20, 'std')),
+            FeatureSpec('volatility_60d', ['cad_ig_er_index'], lambda c: c.rolling(RETURNS, 60, 'std')),
+            FeatureSpec('volatility_ratio', ['volatility_20d', 'volatility_60d'],
+                        lambda c: c.series('volatility_20d') / c.series('volatility_60d')),
+            FeatureSpec('high_vol_regime', ['volatility_20d'],
+                        lambda c: (c.series('volatility_20d') > c.rolling('volatility_20d', 252, 'quantile', 0.75)).astype(int)),
+            
+            # VIX regimes
+            FeatureSpec('vix_ma_20', ['vix'], lambda c: c.rolling('vix', 20, 'mean')),
+            FeatureSpec('vix_ma_60', ['vix'], lambda c: c.rolling('vix', 60, 'mean')),
+            FeatureSpec('vix_regime', ['vix', 'vix_ma_60'],
+                        lambda c: (c.series('vix') > c.series('vix_ma_60')).astype(int)),
+            FeatureSpec('vix_zscore', ['vix'], lambda c: _zscore(c, 'vix', 252)),
+            
+            # Economic regime
+            FeatureSpec('economic_regime_change', ['us_economic_regime'], lambda c: c.diff('us_economic_regime')),
+            
+            # Spread regimes
+            FeatureSpec('cad_oas_zscore', ['cad_oas'], lambda c: _zscore(c, 'cad_oas', 252)),
+            FeatureSpec('us_hy_oas_zscore', ['us_hy_oas'], lambda c: _zscore(c, 'us_hy_oas', 252)),
+            FeatureSpec('us_ig_oas_zscore', ['us_ig_oas'], lambda c: _zscore(c, 'us_ig_oas', 252)),
+            
+            # Credit spread widening regime
+            FeatureSpec('spread_widening', ['cad_oas'], lambda c: (c.diff('cad_oas', 5) > 0).astype(int)),
+        ]
+        return FeatureGroup('regime', specs)
     
-    def _create_momentum_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create momentum and mean reversion features."""
-        logger.info("  Creating momentum features...")
+    def _create_momentum_features(self) -> FeatureGroup:
+        """Declare momentum and mean reversion features."""
+        specs = []
         
-        # Multi-timeframe momentum
+        # Multi-timeframe momentum, each ranked by its own spec
         for period in [5, 10, 20, 40, 60, 120]:
-            df[f'momentum_{period}d'] = df['cad_ig_er_index'].pct_change(period)
-            df[f'momentum_{period}d_rank'] = df[f'momentum_{period}d'].rolling(252).rank(pct=True)
+            momentum = IntermediateCache.key('pct_change', 'cad_ig_er_index', period)
+            specs.append(FeatureSpec(f'momentum_{period}d', ['cad_ig_er_index'],
+                                     lambda c, m=momentum: c.series(m)))
+            specs.append(FeatureSpec(f'momentum_{period}d_rank', ['cad_ig_er_index'],
+                                     lambda c, m=momentum: c.rolling(m, 252, 'rank_pct')))
         
         # RSI indicators
-        df['rsi_14'] = calculate_rsi(df['cad_ig_er_index'], 14)
-        df['rsi_28'] = calculate_rsi(df['cad_ig_er_index'], 28)
+        specs.append(FeatureSpec('rsi_14', ['cad_ig_er_index'], lambda c: _rsi(c, 'cad_ig_er_index', 14)))
+        specs.append(FeatureSpec('rsi_28', ['cad_ig_er_index'], lambda c: _rsi(c, 'cad_ig_er_index', 28)))
         
         # Mean reversion signals
-        df['distance_from_ma_20'] = (df['cad_ig_er_index'] - df['cad_ig_er_index'].rolling(20).mean()) / df['cad_ig_er_index'].rolling(20).std()
-        df['distance_from_ma_60'] = (df['cad_ig_er_index'] - df['cad_ig_er_index'].rolling(60).mean()) / df['cad_ig_er_index'].rolling(60).std()
+        for window in [20, 60]:
+            specs.append(FeatureSpec(
+                f'distance_from_ma_{window}', ['cad_ig_er_index'],
+                lambda c, w=window: (c.series('cad_ig_er_index') - c.rolling('cad_ig_er_index', w, 'mean')) / c.rolling('cad_ig_er_index', w, 'std')))
         
         # Bollinger Band position
-        bb_middle = df['cad_ig_er_index'].rolling(20).mean()
-        bb_std = df['cad_ig_er_index'].rolling(20).std()
-        df['bb_upper'] = bb_middle + 2 * bb_std
-        df['bb_lower'] = bb_middle - 2 * bb_std
-        df['bb_position'] = (df['cad_ig_er_index'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
+        def bollinger(c: IntermediateCache) -> dict:
+            bb_middle = c.rolling('cad_ig_er_index', 20, 'mean')
+            bb_std = c.rolling('cad_ig_er_index', 20, 'std')
+            bb_upper = bb_middle + 2 * bb_std
+            bb_lower = bb_middle - 2 * bb_std
+            bb_position = (c.series('cad_ig_er_index') - bb_lower) / (bb_upper - bb_lower)
+            return {'bb_upper': bb_upper, 'bb_lower': bb_lower, 'bb_position': bb_position}
         
-        return df
+        specs.append(FeatureSpec(['bb_upper', 'bb_lower', 'bb_position'], ['cad_ig_er_index'], bollinger))
+        
+        return FeatureGroup('momentum', specs)
     
-    def _create_spread_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create spread dynamics features."""
-        logger.info("  Creating spread features...")
+    def _create_spread_features(self) -> FeatureGroup:
+        """Declare spread dynamics features."""
+        specs = []
         
         # Spread changes
         for col in ['cad_oas', 'us_hy_oas', 'us_ig_oas']:
             for period in [1, 5, 10, 20]:
-                df[f'{col}_change_{period}d'] = df[col].diff(period)
-                df[f'{col}_pct_change_{period}d'] = df[col].pct_change(period)
+                specs.append(FeatureSpec(f'{col}_change_{period}d', [col],
+                                         lambda c, col=col, p=period: c.diff(col, p)))
+                specs.append(FeatureSpec(f'{col}_pct_change_{period}d', [col],
+                                         lambda c, col=col, p=period: c.pct_change(col, p)))
         
         # Spread ratios
-        df['cad_us_ig_spread_ratio'] = df['cad_oas'] / df['us_ig_oas']
-        df['hy_ig_spread_ratio'] = df['us_hy_oas'] / df['us_ig_oas']
+        specs.append(FeatureSpec('cad_us_ig_spread_ratio', ['cad_oas', 'us_ig_oas'],
+                                 lambda c: c.series('cad_oas') / c.series('us_ig_oas')))
+        specs.append(FeatureSpec('hy_ig_spread_ratio', ['us_hy_oas', 'us_ig_oas'],
+                                 lambda c: c.series('us_hy_oas') / c.series('us_ig_oas')))
         
         # Spread momentum
-        df['cad_oas_momentum_10d'] = df['cad_oas'].diff(10)
-        df['us_hy_oas_momentum_10d'] = df['us_hy_oas'].diff(10)
+        specs.append(FeatureSpec('cad_oas_momentum_10d', ['cad_oas'], lambda c: c.diff('cad_oas', 10)))
+        specs.append(FeatureSpec('us_hy_oas_momentum_10d', ['us_hy_oas'], lambda c: c.diff('us_hy_oas', 10)))
         
-        return df
+        return FeatureGroup('spread', specs)
     
-    def _create_yield_curve_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create yield curve features."""
-        logger.info("  Creating yield curve features...")
-        
-        # Yield curve changes
-        df['us_3m_10y_change_5d'] = df['us_3m_10y'].diff(5)
-        df['us_3m_10y_change_20d'] = df['us_3m_10y'].diff(20)
-        
-        # Yield curve steepening/flattening
-        df['curve_steepening'] = (df['us_3m_10y'].diff(5) > 0).astype(int)
-        
-        return df
+    def _create_yield_curve_features(self) -> FeatureGroup:
+        """Declare yield curve features."""
+        specs = [
+            # Yield curve changes
+            FeatureSpec('us_3m_10y_change_5d', ['us_3m_10y'], lambda c: c.diff('us_3m_10y', 5)),
+            FeatureSpec('us_3m_10y_change_20d', ['us_3m_10y'], lambda c: c.diff('us_3m_10y', 20)),
+            
+            # Yield curve steepening/flattening
+            FeatureSpec('curve_steepening', ['us_3m_10y'], lambda c: (c.diff('us_3m_10y', 5) > 0).astype(int)),
+        ]
+        return FeatureGroup('yield_curve', specs)
     
-    def _create_macro_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create macro surprise features."""
-        logger.info("  Creating macro features...")
+    def _create_macro_features(self) -> FeatureGroup:
+        """Declare macro surprise features."""
+        specs = []
         
         # Cumulative surprises
         for col in ['us_growth_surprises', 'us_inflation_surprises', 'us_hard_data_surprises']:
-            df[f'{col}_cumsum_20d'] = df[col].rolling(20).sum()
-            df[f'{col}_cumsum_60d'] = df[col].rolling(60).sum()
-            df[f'{col}_ma_20d'] = df[col].rolling(20).mean()
+            specs.append(FeatureSpec(f'{col}_cumsum_20d', [col], lambda c, col=col: c.rolling(col, 20, 'sum')))
+            specs.append(FeatureSpec(f'{col}_cumsum_60d', [col], lambda c, col=col: c.rolling(col, 60, 'sum')))
+            specs.append(FeatureSpec(f'{col}_ma_20d', [col], lambda c, col=col: c.rolling(col, 20, 'mean')))
         
         # Surprise momentum
-        df['growth_surprise_momentum'] = df['us_growth_surprises'].diff(5)
-        df['inflation_surprise_momentum'] = df['us_inflation_surprises'].diff(5)
+        specs.append(FeatureSpec('growth_surprise_momentum', ['us_growth_surprises'],
+                                 lambda c: c.diff('us_growth_surprises', 5)))
+        specs.append(FeatureSpec('inflation_surprise_momentum', ['us_inflation_surprises'],
+                                 lambda c: c.diff('us_inflation_surprises', 5)))
         
         # Combined surprise index
-        df['combined_surprise_index'] = (
-            df['us_growth_surprises'] + 
-            df['us_hard_data_surprises'] - 
-            df['us_inflation_surprises']
-        )
-        
-        return df
+        specs.append(FeatureSpec(
+            'combined_surprise_index', ['us_growth_surprises', 'us_hard_data_surprises', 'us_inflation_surprises'],
+            lambda c: (
+                c.series('us_growth_surprises') + 
+                c.series('us_hard_data_surprises') - 
+                c.series('us_inflation_surprises')
+            )))
+        
+        return FeatureGroup('macro', specs)
     
-    def _create_equity_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create equity market features."""
-        logger.info("  Creating equity features...")
-        
-        # Equity revisions momentum
-        df['us_equity_revisions_change_5d'] = df['us_equity_revisions'].diff(5)
-        df['us_equity_revisions_change_20d'] = df['us_equity_revisions'].diff(20)
-        
-        # TSX momentum
-        df['tsx_momentum_20d'] = df['tsx'].pct_change(20)
-        df['tsx_momentum_60d'] = df['tsx'].pct_change(60)
-        
-        # SPX earnings features
-        df['spx_eps_change_20d'] = df['spx_1bf_eps'].pct_change(20)
-        df['spx_sales_change_20d'] = df['spx_1bf_sales'].pct_change(20)
-        
-        # TSX earnings features
-        df['tsx_eps_change_20d'] = df['tsx_1bf_eps'].pct_change(20)
-        df['tsx_sales_change_20d'] = df['tsx_1bf_sales'].pct_change(20)
-        
-        return df
+    def _create_equity_features(self) -> FeatureGroup:
+        """Declare equity market features."""
+        specs = [
+            # Equity revisions momentum
+            FeatureSpec('us_equity_revisions_change_5d', ['us_equity_revisions'],
+                        lambda c: c.diff('us_equity_revisions', 5)),
+            FeatureSpec('us_equity_revisions_change_20d', ['us_equity_revisions'],
+                        lambda c: c.diff('us_equity_revisions', 20)),
+            
+            # TSX momentum
+            FeatureSpec('tsx_momentum_20d', ['tsx'], lambda c: c.pct_change('tsx', 20)),
+            FeatureSpec('tsx_momentum_60d', ['tsx'], lambda c: c.pct_change('tsx', 60)),
+            
+            # SPX earnings features
+            FeatureSpec('spx_eps_change_20d', ['spx_1bf_eps'], lambda c: c.pct_change('spx_1bf_eps', 20)),
+            FeatureSpec('spx_sales_change_20d', ['spx_1bf_sales'], lambda c: c.pct_change('spx_1bf_sales', 20)),
+            
+            # TSX earnings features
+            FeatureSpec('tsx_eps_change_20d', ['tsx_1bf_eps'], lambda c: c.pct_change('tsx_1bf_eps', 20)),
+            FeatureSpec('tsx_sales_change_20d', ['tsx_1bf_sales'], lambda c: c.pct_change('tsx_1bf_sales', 20)),
+        ]
+        return FeatureGroup('equity', specs)
     
-    def _create_cross_asset_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create cross-asset relationship features."""
-        logger.info("  Creating cross-asset features...")
-        
-        # US IG vs CAD IG relative performance
-        df['us_ig_er_momentum_20d'] = df['us_ig_er_index'].pct_change(20)
-        df['cad_ig_er_momentum_20d'] = df['cad_ig_er_index'].pct_change(20)
-        df['cad_us_ig_relative_momentum'] = df['cad_ig_er_momentum_20d'] - df['us_ig_er_momentum_20d']
-        
-        # US HY performance
-        df['us_hy_er_momentum_20d'] = df['us_hy_er_index'].pct_change(20)
-        
-        # Correlation features
-        df['cad_us_ig_corr_60d'] = df['cad_ig_er_index'].pct_change().rolling(60).corr(df['us_ig_er_index'].pct_change())
-        
-        return df
+    def _create_cross_asset_features(self) -> FeatureGroup:
+        """Declare cross-asset relationship features."""
+        def correlation(a: str, b: str):
+            return lambda c: c.covariance(CROSS_ASSETS).pair(a, b, 60)
+        
+        def eigen_summary(c: IntermediateCache) -> dict:
+            summary = c.covariance(CROSS_ASSETS).eigen_summary(60)
+            return {'cross_asset_pc1_share_60d': summary['pc1_share'],
+                    'cross_asset_mean_corr_60d': summary['mean_corr']}
+        
+        specs = [
+            # US IG vs CAD IG relative performance
+            FeatureSpec('us_ig_er_momentum_20d', ['us_ig_er_index'], lambda c: c.pct_change('us_ig_er_index', 20)),
+            FeatureSpec('cad_ig_er_momentum_20d', ['cad_ig_er_index'], lambda c: c.pct_change('cad_ig_er_index', 20)),
+            FeatureSpec('cad_us_ig_relative_momentum', ['cad_ig_er_momentum_20d', 'us_ig_er_momentum_20d'],
+                        lambda c: c.series('cad_ig_er_momentum_20d') - c.series('us_ig_er_momentum_20d')),
+            
+            # US HY performance
+            FeatureSpec('us_hy_er_momentum_20d', ['us_hy_er_index'], lambda c: c.pct_change('us_hy_er_index', 20)),
+        ]
+        
+        # Correlation features, read from one rolling correlation matrix
+        for name, a, b in CROSS_ASSET_PAIRS:
+            specs.append(FeatureSpec(name, CROSS_ASSET_COLUMNS, correlation(a, b)))
+        specs.append(FeatureSpec(['cross_asset_pc1_share_60d', 'cross_asset_mean_corr_60d'],
+                                 CROSS_ASSET_COLUMNS, eigen_summary))
+        return FeatureGroup('cross_asset', specs)
     
-    def _create_statistical_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create statistical features."""
-        logger.info("  Creating statistical features...")
-        
-        # Skewness and kurtosis
-        returns = df['cad_ig_er_index'].pct_change()
-        df['returns_skew_60d'] = returns.rolling(60).skew()
-        df['returns_kurt_60d'] = returns.rolling(60).kurt()
-        
-        # Drawdown
-        cummax = df['cad_ig_er_index'].cummax()
-        df['drawdown'] = (df['cad_ig_er_index'] - cummax) / cummax
-        df['drawdown_duration'] = (df['drawdown'] < 0).astype(int).groupby((df['drawdown'] >= 0).cumsum()).cumsum()
-        
-        # Up/down day streaks
-        df['up_day'] = (df['cad_ig_er_index'].diff() > 0).astype(int)
-        df['up_streak'] = df['up_day'].groupby((df['up_day'] != df['up_day'].shift()).cumsum()).cumsum()
-        df['down_streak'] = (1 - df['up_day']).groupby((df['up_day'] != df['up_day'].shift()).cumsum()).cumsum()
-        
-        return df
+    def _create_statistical_features(self) -> FeatureGroup:
+        """Declare statistical features."""
+        def drawdown(c: IntermediateCache) -> dict:
+            dd, duration = drawdown_with_duration(c.series('cad_ig_er_index'))
+            return {'drawdown': dd, 'drawdown_duration': duration}
+        
+        def streaks(c: IntermediateCache) -> dict:
+            up_day = c.series('up_day')
+            return {'up_streak': streak(up_day), 'down_streak': streak(up_day == 0)}
+        
+        specs = [
+            # Skewness and kurtosis
+            FeatureSpec('returns_skew_60d', ['cad_ig_er_index'], lambda c: c.rolling(RETURNS, 60, 'skew')),
+            FeatureSpec('returns_kurt_60d', ['cad_ig_er_index'], lambda c: c.rolling(RETURNS, 60, 'kurt')),
+            
+            # Drawdown
+            FeatureSpec(['drawdown', 'drawdown_duration'], ['cad_ig_er_index'], drawdown),
+            
+            # Up/down day streaks
+            FeatureSpec('up_day', ['cad_ig_er_index'], lambda c: (c.diff('cad_ig_er_index') > 0).astype(int)),
+            FeatureSpec(['up_streak', 'down_streak'], ['up_day'], streaks),
+        ]
+        return FeatureGroup('statistical', specs)
     
-    def _create_interaction_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create interaction features."""
-        logger.info("  Creating interaction features...")
-        
-        # VIX * Spread interactions
-        df['vix_x_cad_oas'] = df['vix'] * df['cad_oas']
-        df['vix_x_spread_change'] = df['vix'] * df['cad_oas_change_5d']
-        
-        # Momentum * Volatility
-        df['momentum_20d_x_vol'] = df['momentum_20d'] * df['volatility_20d']
-        
-        # Regime * Momentum
-        df['high_vol_x_momentum'] = df['high_vol_regime'] * df['momentum_20d']
-        df['vix_regime_x_momentum'] = df['vix_regime'] * df['momentum_20d']
-        
-        # Economic regime * Spreads
-        df['econ_regime_x_cad_oas'] = df['us_economic_regime'] * df['cad_oas']
-        
-        # Surprise interactions
-        df['growth_x_inflation_surprise'] = df['us_growth_surprises'] * df['us_inflation_surprises']
-        
-        return df
+    def _create_interaction_features(self) -> FeatureGroup:
+        """Declare interaction features."""
+        specs = [
+            # VIX * Spread interactions
+            FeatureSpec('vix_x_cad_oas', ['vix', 'cad_oas'], lambda c: c.series('vix') * c.series('cad_oas')),
+            FeatureSpec('vix_x_spread_change', ['vix', 'cad_oas_change_5d'],
+                        lambda c: c.series('vix') * c.series('cad_oas_change_5d')),
+            
+            # Momentum * Volatility
+            FeatureSpec('momentum_20d_x_vol', ['momentum_20d', 'volatility_20d'],
+                        lambda c: c.series('momentum_20d') * c.series('volatility_20d')),
+            
+            # Regime * Momentum
+            FeatureSpec('high_vol_x_momentum', ['high_vol_regime', 'momentum_20d'],
+                        lambda c: c.series('high_vol_regime') * c.series('momentum_20d')),
+            FeatureSpec('vix_regime_x_momentum', ['vix_regime', 'momentum_20d'],
+                        lambda c: c.series('vix_regime') * c.series('momentum_20d')),
+            
+            # Economic regime * Spreads
+            FeatureSpec('econ_regime_x_cad_oas', ['us_economic_regime', 'cad_oas'],
+                        lambda c: c.series('us_economic_regime') * c.series('cad_oas')),
+            
+            # Surprise interactions
+            FeatureSpec('growth_x_inflation_surprise', ['us_growth_surprises', 'us_inflation_surprises'],
+                        lambda c: c.series('us_growth_surprises') * c.series('us_inflation_surprises')),
+        ]
+        return FeatureGroup('interaction', specs)
     
-    def _create_lag_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create lag features."""
-        logger.info("  Creating lag features...")
+    def _create_lag_features(self) -> FeatureGroup:
+        """Declare lag features."""
+        specs = []
         
         # Key features with lags
         key_features = ['vix', 'cad_oas', 'us_hy_oas', 'momentum_20d', 'volatility_20d']
         for feat in key_features:
-            if feat in df.columns:
-                for lag in [1, 5, 10]:
-                    df[f'{feat}_lag_{lag}'] = df[feat].shift(lag)
+            for lag in [1, 5, 10]:
+                specs.append(FeatureSpec(f'{feat}_lag_{lag}', [feat],
+                                         lambda c, feat=feat, lag=lag: c.shift(feat, lag)))
         
-        return df
+        return FeatureGroup('lag', specs)
     
-    def _create_rolling_stats(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Create rolling statistics features."""
-        logger.info("  Creating rolling statistics...")
-        
-        # Rolling min/max
-        df['cad_oas_min_60d'] = df['cad_oas'].rolling(60).min()
-        df['cad_oas_max_60d'] = df['cad_oas'].rolling(60).max()
-        df['cad_oas_range_position'] = (df['cad_oas'] - df['cad_oas_min_60d']) / (df['cad_oas_max_60d'] - df['cad_oas_min_60d'])
+    def _create_rolling_stats(self) -> FeatureGroup:
+        """Declare rolling statistics features."""
+        specs = [
+            # Rolling min/max
+            FeatureSpec('cad_oas_min_60d', ['cad_oas'], lambda c: c.rolling('cad_oas', 60, 'min')),
+            FeatureSpec('cad_oas_max_60d', ['cad_oas'], lambda c: c.rolling('cad_oas', 60, 'max')),
+            FeatureSpec('cad_oas_range_position', ['cad_oas', 'cad_oas_min_60d', 'cad_oas_max_60d'],
+                        lambda c: (c.series('cad_oas') - c.series('cad_oas_min_60d')) / (c.series('cad_oas_max_60d') - c.series('cad_oas_min_60d'))),
+            
+            # Rolling rank
+            FeatureSpec('vix_rank_252d', ['vix'], lambda c: c.rolling('vix', 252, 'rank_pct')),
+            FeatureSpec('cad_oas_rank_252d', ['cad_oas'], lambda c: c.rolling('cad_oas', 252, 'rank_pct')),
+        ]
+        return FeatureGroup('rolling_stats', specs)
+    
+    def _create_panel_features(self) -> FeatureGroup:
+        """Declare per-asset features computed on the (time x asset) panel."""
+        assets = self.panel_assets
         
-        # Rolling rank
-        df['vix_rank_252d'] = df['vix'].rolling(252).rank(pct=True)
-        df['cad_oas_rank_252d'] = df['cad_oas'].rolling(252).rank(pct=True)
+        def panel(c: IntermediateCache) -> dict:
+            prices = pd.DataFrame({asset: c.series(asset) for asset in assets})
+            return flatten_panel(panel_features(prices), assets)
         
-        return df
-
+        specs = [FeatureSpec(panel_feature_names(assets), assets, panel)]
+        return FeatureGroup('panel', specs)
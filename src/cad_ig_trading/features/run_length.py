@@ -0,0 +1,138 @@
+"""
+Run-Length Kernels
+
+Vectorized counters over runs of consecutive observations (streaks,
+drawdown durations) for the feature pipeline. Every kernel runs down the
+rows, so a 2D block (time x asset) is processed in one call.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+ArrayLike = Union[pd.Series, pd.DataFrame, np.ndarray]
+
+
+def _last_true_index(flags: np.ndarray) -> np.ndarray:
+    """
+    Position of the most recent True at or before each row.
+
+    Rows before the first True map to 0.
+
+    Args:
+        flags: Boolean array (rows are time, 1D or 2D)
+
+    Returns:
+        Integer array of positions with the shape of flags
+    """
+    rows = np.arange(len(flags)).reshape((-1,) + (1,) * (flags.ndim - 1))
+    positions = np.where(flags, rows, 0)
+    return np.maximum.accumulate(positions, axis=0) if len(flags) else positions
+
+
+def _like(result: np.ndarray, template: ArrayLike) -> ArrayLike:
+    """Return result as a Series or DataFrame aligned with template if template is one."""
+    if isinstance(template, pd.Series):
+        return pd.Series(result, index=template.index, name=template.name)
+    if isinstance(template, pd.DataFrame):
+        return pd.DataFrame(result, index=template.index, columns=template.columns)
+    return result
+
+
+def cumsum_reset(values: ArrayLike, reset: ArrayLike) -> ArrayLike:
+    """
+    Cumulative sum that restarts at every row where reset is True.
+
+    Equivalent to values.groupby(reset.cumsum()).cumsum(): the sum on a
+    reset row includes that row's value, and rows before the first reset
+    accumulate from the start. Exact for integer values; for floats the
+    result can differ from the grouped sum in the last bits.
+
+    Args:
+        values: Values to accumulate (no missing values)
+        reset: Boolean flags marking the first row of each new run
+
+    Returns:
+        Running sums with the same type as values
+    """
+    x = np.asarray(values)
+    flags = np.asarray(reset, dtype=bool)
+    total = np.cumsum(x, axis=0)
+    before = total - x
+    # Rows before the first reset map to row 0, whose preceding sum is 0
+    return _like(total - np.take_along_axis(before, _last_true_index(flags), axis=0), values)
+
+
+def run_length(values: ArrayLike) -> ArrayLike:
+    """
+    Length of the run of equal consecutive values ending at each row.
+
+    The first row of a run has length 1. A missing value never equals
+    its neighbour, so each one is a run of its own (as in pandas).
+
+    Args:
+        values: Series, DataFrame or array (rows are time)
+
+    Returns:
+        int64 run lengths with the same type as values
+    """
+    x = np.asarray(values)
+    start = np.ones(x.shape, dtype=bool)
+    start[1:] = x[1:] != x[:-1]
+    rows = np.arange(len(x), dtype=np.int64).reshape((-1,) + (1,) * (x.ndim - 1))
+    lengths = rows - _last_true_index(start) + 1
+    return _like(lengths, values)
+
+
+def streak(flags: ArrayLike) -> ArrayLike:
+    """
+    Number of consecutive True (nonzero) rows ending at each row.
+
+    Args:
+        flags: Boolean or 0/1 series
+
+    Returns:
+        int64 streak lengths, 0 on rows where flags is False
+    """
+    active = np.asarray(flags) != 0
+    return _like(np.where(active, run_length(active), 0).astype(np.int64), flags)
+
+
+def drawdown_with_duration(prices: ArrayLike) -> Tuple[ArrayLike, ArrayLike]:
+    """
+    Drawdown from the running maximum and the number of rows spent in it.
+
+    The running maximum skips missing prices like Series.cummax(), so the
+    drawdown equals calculate_drawdown(). The duration counts rows with a
+    negative drawdown since the last row at a peak; rows with a missing
+    drawdown neither count nor reset it.
+
+    Args:
+        prices: Price series
+
+    Returns:
+        Tuple of (drawdown, int64 duration) with the same type as prices
+    """
+    p = np.asarray(prices, dtype=np.float64)
+    peak = np.fmax.accumulate(p, axis=0) if len(p) else p
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dd = (p - peak) / peak
+    duration = drawdown_duration(dd)
+    return _like(dd, prices), _like(duration, prices)
+
+
+def drawdown_duration(drawdown: ArrayLike) -> ArrayLike:
+    """
+    Number of rows since the last row at a peak (drawdown >= 0).
+
+    Args:
+        drawdown: Drawdown series (<= 0)
+
+    Returns:
+        int64 durations with the same type as drawdown
+    """
+    dd = np.asarray(drawdown, dtype=np.float64)
+    return _like(cumsum_reset((dd < 0).astype(np.int64), dd >= 0), drawdown)
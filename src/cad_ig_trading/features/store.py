@@ -0,0 +1,361 @@
+"""
+Feature Store
+
+Versioned on-disk store of feature groups with per-group invalidation.
+"""
+
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+import logging
+
+from . import covariance, intermediates, moments, order_stats, panel, run_length
+from .base import FeatureGroup
+from .graph import FeatureGraph
+
+logger = logging.getLogger(__name__)
+
+STORE_FORMAT_VERSION = 1
+
+# Modules whose primitives every feature computation goes through. Editing
+# one of them invalidates every group.
+SHARED_MODULES = [covariance, intermediates, moments, order_stats, panel, run_length]
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """
+    Calculate the SHA-256 digest of a DataFrame's content.
+
+    Covers the index, column names, dtypes and values.
+
+    Args:
+        df: DataFrame to hash
+
+    Returns:
+        Hex digest string
+    """
+    sha = hashlib.sha256()
+    sha.update(json.dumps([[str(col), str(dtype)] for col, dtype in df.dtypes.items()]).encode('utf-8'))
+    sha.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return sha.hexdigest()
+
+
+def function_fingerprint(func: Callable) -> str:
+    """
+    Calculate a fingerprint of a function's code and parameters.
+
+    Hashes the bytecode, constants and names of the function (including
+    nested lambdas), its default arguments and closure values, and the
+    fingerprints of the module-level functions and constants it refers to.
+    Line numbers and comments are not part of the bytecode, so moving or
+    commenting a feature does not change its fingerprint.
+
+    Args:
+        func: Function to fingerprint
+
+    Returns:
+        Hex digest string
+    """
+    sha = hashlib.sha256()
+    _hash_function(func, sha, set())
+    return sha.hexdigest()
+
+
+def _hash_function(func: Callable, sha, seen: set) -> None:
+    """Feed a function and the module-level objects it uses into sha."""
+    if id(func) in seen:
+        return
+    seen.add(id(func))
+
+    code = func.__code__
+    _hash_code(code, sha)
+    sha.update(repr(func.__defaults__).encode('utf-8'))
+    sha.update(repr(func.__kwdefaults__).encode('utf-8'))
+    for cell in func.__closure__ or ():
+        _hash_value(cell.cell_contents, func, sha, seen)
+
+    for name in _global_names(code):
+        if name in func.__globals__:
+            sha.update(name.encode('utf-8'))
+            _hash_value(func.__globals__[name], func, sha, seen)
+
+
+def _hash_value(value, func: Callable, sha, seen: set) -> None:
+    """Feed a referenced object into sha: functions of func's module by code, literals by repr."""
+    if isinstance(value, types.FunctionType):
+        if value.__module__ == func.__module__:
+            _hash_function(value, sha, seen)
+    elif isinstance(value, (str, bytes, int, float, bool, tuple, type(None))):
+        sha.update(repr(value).encode('utf-8'))
+
+
+def _hash_code(code: types.CodeType, sha) -> None:
+    """Feed a code object and its nested code objects into sha."""
+    sha.update(code.co_code)
+    sha.update(repr(code.co_names).encode('utf-8'))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(const, sha)
+        else:
+            sha.update(repr(const).encode('utf-8'))
+
+
+def _global_names(code: types.CodeType) -> List[str]:
+    """Names referenced by a code object and its nested code objects."""
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.extend(_global_names(const))
+    return names
+
+
+def shared_fingerprint() -> str:
+    """
+    Calculate the fingerprint of the code shared by every feature group.
+
+    Returns:
+        Hex digest string
+    """
+    sha = hashlib.sha256()
+    sha.update(f"{STORE_FORMAT_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}".encode('utf-8'))
+    sha.update(pd.__version__.encode('utf-8'))
+    sha.update(np.__version__.encode('utf-8'))
+    for module in SHARED_MODULES:
+        sha.update(Path(module.__file__).read_bytes())
+    return sha.hexdigest()
+
+
+class FeatureStore:
+    """
+    Columnar binary store of computed feature groups.
+
+    Each group is stored in its own entry: one raw binary file per feature
+    column plus a meta.json holding the dtypes, the digest of the input
+    frame and the group's fingerprint. The fingerprint covers the code and
+    parameters of every spec in the group and, through their inputs, of
+    every spec upstream of it, so changing one group invalidates that group
+    and the groups that read its features while every other group is read
+    back from disk.
+    """
+
+    def __init__(self, store_dir: Union[str, Path] = "data/features"):
+        """
+        Initialize FeatureStore.
+
+        Args:
+            store_dir: Directory where group entries are stored
+        """
+        self.store_dir = Path(store_dir)
+        self.loaded = []
+        self.computed = []
+        self.cache_stats = {'hits': 0, 'misses': 0, 'size': 0}
+
+    def entry_dir(self, group: FeatureGroup) -> Path:
+        """
+        Get the entry directory of a feature group.
+
+        Args:
+            group: Feature group
+
+        Returns:
+            Path to the entry directory
+        """
+        return self.store_dir / group.name
+
+    def fingerprints(self, groups: List[FeatureGroup]) -> Dict[str, str]:
+        """
+        Calculate the fingerprint of each feature group.
+
+        Args:
+            groups: Feature groups, as passed to FeatureGraph
+
+        Returns:
+            Dictionary mapping group name to hex digest
+        """
+        graph = FeatureGraph(groups)
+        shared = shared_fingerprint()
+
+        spec_digests = {}
+        for i in graph.order(self._raw_inputs(graph)):
+            spec = graph.specs[i]
+            sha = hashlib.sha256(shared.encode('utf-8'))
+            sha.update(json.dumps([spec.outputs, spec.inputs]).encode('utf-8'))
+            sha.update(function_fingerprint(spec.func).encode('utf-8'))
+            for name in spec.inputs:
+                if name in graph.producer:
+                    sha.update(spec_digests[graph.producer[name]].encode('utf-8'))
+            spec_digests[i] = sha.hexdigest()
+
+        fingerprints = {}
+        start = 0
+        for group in groups:
+            sha = hashlib.sha256(group.name.encode('utf-8'))
+            for i in range(start, start + len(group.specs)):
+                sha.update(spec_digests[i].encode('utf-8'))
+            start += len(group.specs)
+            fingerprints[group.name] = sha.hexdigest()
+        return fingerprints
+
+    @staticmethod
+    def _raw_inputs(graph: FeatureGraph) -> List[str]:
+        """Inputs of the graph that no spec produces."""
+        return [name for spec in graph.specs for name in spec.inputs if name not in graph.producer]
+
+    def read_meta(self, group: FeatureGroup) -> Optional[Dict]:
+        """
+        Read the metadata of a group entry.
+
+        Args:
+            group: Feature group
+
+        Returns:
+            Metadata dictionary, or None if there is no usable entry
+        """
+        meta_path = self.entry_dir(group) / 'meta.json'
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get('format_version') != STORE_FORMAT_VERSION:
+            return None
+        return meta
+
+    def load(self, group: FeatureGroup, data_digest: str, fingerprint: str,
+             index: pd.Index) -> Optional[Dict[str, pd.Series]]:
+        """
+        Load a feature group if its entry matches the data and code.
+
+        Args:
+            group: Feature group
+            data_digest: Digest of the input frame
+            fingerprint: Current fingerprint of the group
+            index: Index of the input frame
+
+        Returns:
+            Dictionary mapping feature name to Series, or None on a miss
+        """
+        meta = self.read_meta(group)
+        if (meta is None or meta['data_digest'] != data_digest
+                or meta['fingerprint'] != fingerprint or meta['nrows'] != len(index)):
+            return None
+
+        entry = self.entry_dir(group)
+        features = {}
+        try:
+            for col in meta['columns']:
+                values = np.fromfile(entry / col['file'], dtype=np.dtype(col['dtype']), count=meta['nrows'])
+                if len(values) != meta['nrows']:
+                    raise ValueError(f"Feature {col['name']} has {len(values)} rows, expected {meta['nrows']}")
+                features[col['name']] = pd.Series(values, index=index, name=col['name'], copy=False)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read feature store entry {entry}: {e}")
+            return None
+        return features
+
+    def save(self, group: FeatureGroup, features: Dict[str, pd.Series],
+             data_digest: str, fingerprint: str) -> None:
+        """
+        Write a feature group to its entry.
+
+        The entry is written to a temporary directory and then moved into
+        place, so readers never see a partially written entry.
+
+        Args:
+            group: Feature group
+            features: Dictionary mapping feature name to Series
+            data_digest: Digest of the input frame
+            fingerprint: Fingerprint of the group
+        """
+        entry = self.entry_dir(group)
+        tmp_entry = entry.with_name(f"{entry.name}.tmp-{os.getpid()}")
+        if tmp_entry.exists():
+            shutil.rmtree(tmp_entry)
+        tmp_entry.mkdir(parents=True)
+
+        columns = []
+        nrows = 0
+        for i, name in enumerate(group.feature_names):
+            values = np.ascontiguousarray(features[name].to_numpy())
+            if values.dtype == object:
+                raise ValueError(f"Feature {name} has object dtype and cannot be stored")
+            file_name = f"{i:04d}.bin"
+            values.tofile(tmp_entry / file_name)
+            columns.append({'name': name, 'dtype': values.dtype.str, 'file': file_name})
+            nrows = len(values)
+
+        meta = {
+            'format_version': STORE_FORMAT_VERSION,
+            'group': group.name,
+            'data_digest': data_digest,
+            'fingerprint': fingerprint,
+            'nrows': nrows,
+            'columns': columns,
+        }
+        with open(tmp_entry / 'meta.json', 'w', encoding='utf-8') as fh:
+            json.dump(meta, fh)
+
+        if entry.exists():
+            shutil.rmtree(entry)
+        os.replace(tmp_entry, entry)
+
+    def build(self, groups: List[FeatureGroup], df: pd.DataFrame,
+              max_workers: Optional[int] = None) -> Dict[str, pd.Series]:
+        """
+        Load the feature groups that are up to date and compute the rest.
+
+        Stale groups are evaluated with FeatureGraph, reading the features
+        of loaded groups as inputs, and written back to the store.
+
+        Args:
+            groups: Feature groups, as passed to FeatureGraph
+            df: Input DataFrame with the raw columns
+            max_workers: Threads used to evaluate stale groups
+
+        Returns:
+            Dictionary mapping feature name to Series, in declaration order
+        """
+        start = time.perf_counter()
+        data_digest = frame_digest(df)
+        fingerprints = self.fingerprints(groups)
+
+        columns = dict(df.items())
+        stale = []
+        self.loaded = []
+        for group in groups:
+            features = self.load(group, data_digest, fingerprints[group.name], df.index)
+            if features is None:
+                stale.append(group)
+            else:
+                columns.update(features)
+                self.loaded.append(group.name)
+        self.computed = [group.name for group in stale]
+        self.cache_stats = {'hits': 0, 'misses': 0, 'size': 0}
+
+        if stale:
+            graph = FeatureGraph(stale)
+            columns.update(graph.run(columns, max_workers=max_workers))
+            self.cache_stats = graph.cache_stats
+            for group in stale:
+                self.save(group, columns, data_digest, fingerprints[group.name])
+
+        logger.info(f"Feature store: loaded {len(self.loaded)} groups, computed {len(self.computed)} "
+                    f"{self.computed} in {time.perf_counter() - start:.3f}s")
+
+        return {name: columns[name] for group in groups for name in group.feature_names}
+
+    def clear(self) -> None:
+        """Remove every stored entry."""
+        if self.store_dir.exists():
+            for entry in self.store_dir.iterdir():
+                if entry.is_dir():
+                    shutil.rmtree(entry)
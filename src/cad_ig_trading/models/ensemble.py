@@ -7,12 +7,15 @@ Implements the validated ensemble that achieves 3.91-4.16% annualized returns.
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.feature_selection import SelectKBest, mutual_info_classif
 import lightgbm as lgb
 import xgboost as xgb
 import logging
 
+from ..features.order_stats import rolling_quantile
+from .binning import FeatureBinner
+from .feature_scoring import MutualInfoScorer
+from .scheduler import ModelJob, TrainingScheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,25 +26,44 @@ class WeeklyEnsembleStrategy:
     This is Strategy 9 from research - the best performing strategy.
     """
     
-    def __init__(self, n_features=60, threshold=0.45):
+    def __init__(self, n_features=60, threshold=0.45, n_jobs=None, mi_estimator='knn'):
         """
         Initialize ensemble strategy.
         
         Args:
             n_features: Number of top features to select
             threshold: Probability threshold for signals
+            n_jobs: Core budget shared by the base models during training.
+                None or -1 uses every CPU available to the process (the
+                affinity mask capped by the cgroup quota); set it lower
+                when several strategies train side by side. Feature
+                scoring uses the same budget.
+            mi_estimator: Mutual information estimator for feature
+                selection, 'knn' or the faster 'binned'
         """
         self.n_features = n_features
         self.threshold = threshold
-        self.scaler = StandardScaler()
-        self.selector = None
+        self.binner = FeatureBinner()
         self.selected_features = None
         
+        # Feature scores, cached across refits on overlapping windows
+        self.scorer = MutualInfoScorer(estimator=mi_estimator, n_jobs=n_jobs)
+        self.feature_scores = None
+        
         # Models
         self.model_lgbm = None
         self.model_xgb = None
         self.model_rf = None
         
+        # Training schedule and per-model fit times (seconds)
+        self.scheduler = TrainingScheduler(n_jobs)
+        self.jobs = self._model_jobs()
+        self.fit_times = {}
+        
+        # Trees each model adds when update() continues training
+        self.update_estimators = 10
+        self.update_jobs = self._update_jobs()
+        
         # Ensemble weights (optimized)
         self.weights = {
             'lgbm': 0.40,
@@ -53,12 +75,11 @@ class WeeklyEnsembleStrategy:
         """Select top features using mutual information."""
         logger.info(f"Selecting top {self.n_features} features...")
         
-        self.selector = SelectKBest(score_func=mutual_info_classif, k=self.n_features)
-        self.selector.fit(X, y)
+        self.feature_scores = self.scorer.score(X, y)
         
         feature_scores = pd.DataFrame({
             'feature': X.columns,
-            'score': self.selector.scores_
+            'score': self.feature_scores.values
         }).sort_values('score', ascending=False)
         
         self.selected_features = feature_scores.head(self.n_features)['feature'].tolist()
@@ -67,69 +88,158 @@ class WeeklyEnsembleStrategy:
         
         return X[self.selected_features]
     
+    def _model_jobs(self):
+        """
+        Declare the base models.
+        
+        Costs are single-thread fit times on the full training window, in
+        seconds; the scheduler replaces them with measured times after each
+        fit. Random Forest builds its trees independently and scales almost
+        linearly with cores; the boosters build one tree at a time and gain
+        much less from extra threads on data of this size.
+        """
+        def lgbm(threads):
+            return lgb.LGBMClassifier(
+                n_estimators=150,
+                max_depth=4,
+                learning_rate=0.03,
+                num_leaves=15,
+                min_child_samples=60,
+                subsample=0.7,
+                colsample_bytree=0.7,
+                reg_alpha=0.2,
+                reg_lambda=0.2,
+                random_state=42,
+                n_jobs=threads,
+                verbose=-1
+            )
+        
+        def xgboost(threads):
+            return xgb.XGBClassifier(
+                n_estimators=150,
+                max_depth=5,
+                learning_rate=0.03,
+                subsample=0.7,
+                colsample_bytree=0.7,
+                reg_alpha=0.1,
+                reg_lambda=0.1,
+                random_state=43,
+                n_jobs=threads,
+                verbosity=0
+            )
+        
+        def random_forest(threads):
+            return RandomForestClassifier(
+                n_estimators=200,
+                max_depth=8,
+                min_samples_split=60,
+                min_samples_leaf=30,
+                random_state=44,
+                n_jobs=threads
+            )
+        
+        return [
+            ModelJob('lgbm', lgbm, cost=0.4, serial_fraction=0.5),
+            ModelJob('xgb', xgboost, cost=1.0, serial_fraction=0.5),
+            ModelJob('rf', random_forest, cost=3.0, serial_fraction=0.05),
+        ]
+    
     def train(self, X_train, y_train):
-        """Train all models in the ensemble."""
-        logger.info("Training ensemble models...")
-        
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        
-        # Train LightGBM
-        logger.info("  Training LightGBM...")
-        self.model_lgbm = lgb.LGBMClassifier(
-            n_estimators=150,
-            max_depth=4,
-            learning_rate=0.03,
-            num_leaves=15,
-            min_child_samples=60,
-            subsample=0.7,
-            colsample_bytree=0.7,
-            reg_alpha=0.2,
-            reg_lambda=0.2,
-            random_state=42,
-            verbose=-1
-        )
-        self.model_lgbm.fit(X_train_scaled, y_train)
-        
-        # Train XGBoost
-        logger.info("  Training XGBoost...")
-        self.model_xgb = xgb.XGBClassifier(
-            n_estimators=150,
-            max_depth=5,
-            learning_rate=0.03,
-            subsample=0.7,
-            colsample_bytree=0.7,
-            reg_alpha=0.1,
-            reg_lambda=0.1,
-            random_state=43,
-            n_jobs=-1,
-            verbosity=0
-        )
-        self.model_xgb.fit(X_train_scaled, y_train)
-        
-        # Train Random Forest
-        logger.info("  Training Random Forest...")
-        self.model_rf = RandomForestClassifier(
-            n_estimators=200,
-            max_depth=8,
-            min_samples_split=60,
-            min_samples_leaf=30,
-            random_state=44,
-            n_jobs=-1
-        )
-        self.model_rf.fit(X_train_scaled, y_train)
+        """
+        Train all models in the ensemble.
+        
+        The base models are fitted concurrently within the core budget;
+        per-model fit times are stored in fit_times.
+        """
+        logger.info(f"Training ensemble models on {self.scheduler.n_jobs} cores...")
+        
+        # Bin features once for all models
+        X_train_binned = self.binner.fit_transform(X_train)
+        
+        # Train LightGBM, XGBoost and Random Forest
+        models = self.scheduler.fit(self.jobs, X_train_binned, y_train)
+        self.model_lgbm = models['lgbm']
+        self.model_xgb = models['xgb']
+        self.model_rf = models['rf']
+        self.fit_times = dict(self.scheduler.fit_times)
         
         logger.info("Ensemble training complete")
+    
+    def _update_jobs(self):
+        """
+        Declare the base models' continued training.
+        
+        The boosters are rebuilt with the hyperparameters of _model_jobs()
+        and update_estimators rounds, and fitted from the current boosters;
+        Random Forest grows update_estimators more trees on the current
+        forest. Costs start from the full fits scaled by the number of trees.
+        """
+        full = {job.name: job for job in self.jobs}
+        
+        def lgbm(threads):
+            return full['lgbm'].build(threads).set_params(n_estimators=self.update_estimators)
+        
+        def xgboost(threads):
+            return full['xgb'].build(threads).set_params(n_estimators=self.update_estimators)
+        
+        def random_forest(threads):
+            return self.model_rf.set_params(
+                warm_start=True,
+                n_estimators=len(self.model_rf.estimators_) + self.update_estimators,
+                n_jobs=threads
+            )
+        
+        return [
+            ModelJob('lgbm', lgbm, cost=0.4 * 10 / 150, serial_fraction=0.5),
+            ModelJob('xgb', xgboost, cost=1.0 * 10 / 150, serial_fraction=0.5),
+            ModelJob('rf', random_forest, cost=3.0 * 10 / 200, serial_fraction=0.05),
+        ]
+    
+    def update(self, X_train, y_train, n_estimators=None):
+        """
+        Continue training the fitted models on an extended window.
+        
+        LightGBM and XGBoost add boosting rounds starting from their current
+        boosters and Random Forest adds trees grown on the new window, so an
+        update costs a fraction of train(). The selected features and the
+        bin edges stay those of the last train(): the existing trees split
+        on the bin codes of those features.
+        
+        Args:
+            X_train: Training features (the selected features)
+            y_train: Training target
+            n_estimators: Trees each model adds (default update_estimators)
+        """
+        if self.model_lgbm is None:
+            raise ValueError("Models must be trained before they can be updated")
+        if n_estimators is not None:
+            self.update_estimators = n_estimators
+        
+        logger.info(f"Updating ensemble models with {self.update_estimators} trees each...")
+        
+        X_train_binned = self.binner.transform(X_train)
+        
+        fit_params = {
+            'lgbm': {'init_model': self.model_lgbm.booster_},
+            'xgb': {'xgb_model': self.model_xgb.get_booster()}
+        }
+        models = self.scheduler.fit(self.update_jobs, X_train_binned, y_train, fit_params)
+        self.model_lgbm = models['lgbm']
+        self.model_xgb = models['xgb']
+        self.model_rf = models['rf']
+        self.fit_times = dict(self.scheduler.fit_times)
+        
+        logger.info("Ensemble update complete")
         
     def predict_proba(self, X_test):
         """Get ensemble probability predictions."""
-        # Scale features
-        X_test_scaled = self.scaler.transform(X_test)
+        # Bin features with the training edges
+        X_test_binned = self.binner.transform(X_test)
         
         # Get predictions from each model
-        probs_lgbm = self.model_lgbm.predict_proba(X_test_scaled)[:, 1]
-        probs_xgb = self.model_xgb.predict_proba(X_test_scaled)[:, 1]
-        probs_rf = self.model_rf.predict_proba(X_test_scaled)[:, 1]
+        probs_lgbm = self.model_lgbm.predict_proba(X_test_binned)[:, 1]
+        probs_xgb = self.model_xgb.predict_proba(X_test_binned)[:, 1]
+        probs_rf = self.model_rf.predict_proba(X_test_binned)[:, 1]
         
         # Weighted ensemble
         ensemble_probs = (
@@ -140,19 +250,18 @@ class WeeklyEnsembleStrategy:
         
         return ensemble_probs
     
-    def generate_signals(self, df, train_size=0.6):
+    def prepare_data(self, df):
         """
-        Generate trading signals for the full dataset.
+        Build the ML dataset from a feature frame.
         
         Args:
             df: DataFrame with features
-            train_size: Fraction of data to use for training
             
         Returns:
-            DataFrame with signals added
+            Tuple of (DataFrame with Date, cad_ig_er_index, the features,
+            weekly_return and binary_target, without missing values;
+            list of feature columns)
         """
-        logger.info("Generating signals...")
-        
         # Prepare data
         feature_cols = [col for col in df.columns if col not in [
             'Date', 'cad_ig_er_index', 'target_return', 'weekly_return', 'binary_target'
@@ -173,6 +282,23 @@ class WeeklyEnsembleStrategy:
         
         logger.info(f"ML dataset shape: {df_ml.shape}")
         
+        return df_ml, valid_features
+    
+    def generate_signals(self, df, train_size=0.6):
+        """
+        Generate trading signals for the full dataset.
+        
+        Args:
+            df: DataFrame with features
+            train_size: Fraction of data to use for training
+            
+        Returns:
+            DataFrame with signals added
+        """
+        logger.info("Generating signals...")
+        
+        df_ml, valid_features = self.prepare_data(df)
+        
         # Split data
         split_idx = int(len(df_ml) * train_size)
         train_df = df_ml.iloc[:split_idx]
@@ -201,7 +327,7 @@ class WeeklyEnsembleStrategy:
         
         returns = test_df['cad_ig_er_index'].pct_change()
         test_df['volatility_60d'] = returns.rolling(60).std()
-        test_df['vol_filter'] = (test_df['volatility_60d'] < test_df['volatility_60d'].rolling(252).quantile(0.90)).astype(int)
+        test_df['vol_filter'] = (test_df['volatility_60d'] < rolling_quantile(test_df['volatility_60d'], 252, 0.90)).astype(int)
         
         # Apply filters
         test_df['signal'] = 0
@@ -0,0 +1,351 @@
+"""
+Feature Scoring
+
+Cached, parallel mutual-information scores of candidate features against a
+classification target.
+"""
+
+import numpy as np
+import pandas as pd
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from sklearn.feature_selection import mutual_info_classif
+import logging
+
+from .scheduler import available_cpus
+
+logger = logging.getLogger(__name__)
+
+MI_ESTIMATORS = ['knn', 'binned']
+
+
+def array_digest(values: np.ndarray) -> str:
+    """
+    Calculate the SHA-256 digest of an array's values.
+
+    Args:
+        values: Array to hash
+
+    Returns:
+        Hex digest string
+    """
+    values = np.ascontiguousarray(values)
+    sha = hashlib.sha256(values.dtype.str.encode('utf-8'))
+    sha.update(values.tobytes())
+    return sha.hexdigest()
+
+
+def quantile_edges(X: np.ndarray, n_bins: int) -> np.ndarray:
+    """
+    Inner quantile bin edges of every column.
+
+    Args:
+        X: 2D array (rows are samples)
+        n_bins: Number of bins
+
+    Returns:
+        Array of shape (n_bins - 1, columns)
+    """
+    return np.quantile(X, np.linspace(0, 1, n_bins + 1)[1:-1], axis=0)
+
+
+def bin_counts(X: np.ndarray, y: np.ndarray, edges: np.ndarray, n_classes: int) -> np.ndarray:
+    """
+    Joint counts of feature bins and classes for every column.
+
+    A value falls in the bin above every edge it exceeds, so equal values
+    always share a bin and repeated edges leave empty bins.
+
+    Args:
+        X: 2D array (rows are samples)
+        y: Class labels in [0, n_classes)
+        edges: Inner bin edges from quantile_edges()
+        n_classes: Number of classes
+
+    Returns:
+        Array of shape (columns, n_bins, n_classes)
+    """
+    n_bins = len(edges) + 1
+    n_features = X.shape[1]
+    bins = (X[:, None, :] > edges[None, :, :]).sum(axis=1)
+    cells = (np.arange(n_features) * n_bins + bins) * n_classes + y[:, None]
+    counts = np.bincount(cells.ravel(), minlength=n_features * n_bins * n_classes)
+    return counts.reshape(n_features, n_bins, n_classes).astype(np.float64)
+
+
+def binned_mutual_info(counts: np.ndarray) -> np.ndarray:
+    """
+    Plug-in mutual information (nats) of binned features and classes.
+
+    Args:
+        counts: Joint counts from bin_counts()
+
+    Returns:
+        Mutual information of every column
+    """
+    total = counts.sum(axis=(1, 2), keepdims=True)
+    p = counts / total
+    px = p.sum(axis=2, keepdims=True)
+    py = p.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        terms = np.where(p > 0, p * np.log(p / (px * py)), 0.0)
+    return np.maximum(terms.sum(axis=(1, 2)), 0.0)
+
+
+class MutualInfoScorer:
+    """
+    Mutual-information scores of features, cached per feature and window.
+
+    Every feature is scored on its own, so its score depends only on its
+    values and the target over the training window. Scores are cached per
+    window (estimator and digest of the target) and feature digest, which
+    makes a repeated selection on an overlapping window (a parameter sweep,
+    or a walk-forward refit where most features are unchanged) pay only
+    for the features whose values differ. Missing scores are computed in
+    chunks of features on a thread pool. The caches keep the max_windows
+    most recently scored windows.
+
+    Two estimators are available: 'knn' is scikit-learn's
+    mutual_info_classif (Kraskov nearest-neighbour estimate), 'binned'
+    a plug-in estimate on quantile bins that is computed for all features
+    in a few vector operations. The binned estimator cuts an n-row window
+    at the quantiles of its leading edge_rows(n) rows, the largest length
+    of a geometric grid (ratio 1 + edge_growth) not above n, so the edges
+    are re-derived whenever the window grows past the next grid length.
+    A window's scores therefore depend on that window alone, not on which
+    windows were scored before; and a window that extends a scored one
+    with the same edge rows is rescored by adding the counts of the new
+    rows to the kept joint counts of each unchanged feature.
+    """
+
+    def __init__(self, estimator: str = 'knn', n_neighbors: int = 3, n_bins: int = 16,
+                 n_jobs: Optional[int] = None, chunk_size: int = 16, random_state: int = 0,
+                 edge_growth: float = 0.25, max_windows: int = 4):
+        """
+        Initialize MutualInfoScorer.
+
+        Args:
+            estimator: 'knn' or 'binned'
+            n_neighbors: Neighbours of the knn estimator
+            n_bins: Quantile bins per feature of the binned estimator
+            n_jobs: Threads scoring chunks of features. None or -1 uses
+                every CPU available to the process.
+            chunk_size: Features per task
+            random_state: Seed of the noise the knn estimator adds to
+                break ties
+            edge_growth: Growth of the window, as a fraction of the rows
+                the binned edges were taken from, past which the edges are
+                re-derived
+            max_windows: Windows whose scores and count tables are kept
+        """
+        if estimator not in MI_ESTIMATORS:
+            raise ValueError(f"Unknown mutual information estimator: {estimator}")
+        if edge_growth <= 0:
+            raise ValueError(f"edge_growth must be positive, got {edge_growth}")
+        if max_windows < 1:
+            raise ValueError(f"max_windows must be at least 1, got {max_windows}")
+        self.estimator = estimator
+        self.n_neighbors = n_neighbors
+        self.n_bins = n_bins
+        if n_jobs is None or n_jobs == -1:
+            n_jobs = available_cpus()
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self.random_state = random_state
+        self.edge_growth = edge_growth
+        self.max_windows = max_windows
+
+        # Keyed by window (params, target digest), least recently used first
+        self.scores = OrderedDict()
+        self.tables = {}
+        self.windows = {}
+        self.cache_stats = {'hits': 0, 'misses': 0, 'extended': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def params(self) -> Tuple:
+        """Estimator settings that scores depend on."""
+        if self.estimator == 'knn':
+            return ('knn', self.n_neighbors, self.random_state)
+        return ('binned', self.n_bins, self.edge_growth)
+
+    def score(self, X: pd.DataFrame, y) -> pd.Series:
+        """
+        Score every feature against the target.
+
+        Args:
+            X: Features (rows are samples, no missing values)
+            y: Class labels
+
+        Returns:
+            Series of mutual information scores (nats) indexed by feature
+        """
+        values = X.to_numpy(dtype=np.float64)
+        y = np.asarray(y)
+        params = self.params
+        target = array_digest(y)
+        window = (params, target)
+        digests = [array_digest(values[:, j]) for j in range(values.shape[1])]
+
+        scores = np.empty(values.shape[1])
+        missing = []
+        with self._lock:
+            cached = self.scores.get(window, {})
+            for j, digest in enumerate(digests):
+                if digest in cached:
+                    scores[j] = cached[digest]
+                else:
+                    missing.append(j)
+        hits = values.shape[1] - len(missing)
+
+        extended = 0
+        if missing:
+            if self.estimator == 'knn':
+                computed = self._score_knn(values[:, missing], y)
+            else:
+                computed, extended = self._score_binned(values[:, missing], y, target,
+                                                        [digests[j] for j in missing])
+            scores[missing] = computed
+
+        with self._lock:
+            cached = self.scores.setdefault(window, {})
+            for j, score in zip(missing, scores[missing]):
+                cached[digests[j]] = score
+            self._touch(window)
+            self.cache_stats['hits'] += hits
+            self.cache_stats['misses'] += len(missing) - extended
+            self.cache_stats['extended'] += extended
+        logger.info(f"Scored {values.shape[1]} features ({self.estimator}): {hits} cached, "
+                    f"{extended} extended, {len(missing) - extended} computed")
+
+        return pd.Series(scores, index=X.columns, name='mutual_info')
+
+    def _touch(self, window: Tuple) -> None:
+        """Mark a window as most recently used and evict the oldest beyond max_windows (lock held)."""
+        self.scores.move_to_end(window)
+        while len(self.scores) > self.max_windows:
+            oldest, _ = self.scores.popitem(last=False)
+            self.tables.pop(oldest, None)
+            self.windows.pop(oldest, None)
+
+    def edge_rows(self, n: int) -> int:
+        """
+        Number of leading rows whose quantiles give the binned edges of an
+        n-row window.
+
+        Args:
+            n: Window length
+
+        Returns:
+            Largest length of the grid 1, ceil(1 * (1 + edge_growth)), ...
+            that is at most n (n itself when n < 1)
+        """
+        rows = 1
+        if n < rows:
+            return n
+        while True:
+            grown = max(math.ceil(rows * (1 + self.edge_growth)), rows + 1)
+            if grown > n:
+                return rows
+            rows = grown
+
+    def _chunks(self, n: int) -> List[slice]:
+        return [slice(start, min(start + self.chunk_size, n)) for start in range(0, n, self.chunk_size)]
+
+    def _score_knn(self, values: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Nearest-neighbour estimates, one feature at a time, in parallel chunks."""
+        def score_chunk(chunk: slice) -> np.ndarray:
+            return np.array([mutual_info_classif(values[:, [j]], y, n_neighbors=self.n_neighbors,
+                                                 random_state=self.random_state)[0]
+                             for j in range(chunk.start, chunk.stop)])
+
+        chunks = self._chunks(values.shape[1])
+        if self.n_jobs == 1 or len(chunks) == 1:
+            results = [score_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+                results = list(executor.map(score_chunk, chunks))
+        return np.concatenate(results) if results else np.empty(0)
+
+    def _score_binned(self, values: np.ndarray, y: np.ndarray, target: str,
+                      digests: List[str]) -> Tuple[np.ndarray, int]:
+        """
+        Binned estimates, extending the counts of a scored prefix window
+        where possible.
+
+        Returns:
+            Tuple of (scores, number of features rescored incrementally)
+        """
+        params = self.params
+        classes, codes = np.unique(y, return_inverse=True)
+        n_classes = max(len(classes), 2)
+        n = len(y)
+        edge_rows = self.edge_rows(n)
+
+        # Longest scored window that the current one extends with the same edge rows
+        prefix = None
+        with self._lock:
+            windows = sorted(self.windows.items(), key=lambda item: -item[1][0])
+        for (window_params, window_target), (length, window_classes) in windows:
+            if (window_params == params and length < n and self.edge_rows(length) == edge_rows
+                    and np.array_equal(window_classes, classes)
+                    and array_digest(y[:length]) == window_target):
+                prefix = ((params, window_target), length)
+                break
+
+        edges = np.empty((self.n_bins - 1, values.shape[1]))
+        counts = np.empty((values.shape[1], self.n_bins, n_classes))
+        fresh = []
+        extended = []
+        for j in range(values.shape[1]):
+            table = None
+            if prefix is not None:
+                with self._lock:
+                    table = self.tables.get(prefix[0], {}).get(array_digest(values[:prefix[1], j]))
+            if table is None:
+                fresh.append(j)
+            else:
+                extended.append(j)
+                edges[:, j], counts[j] = table
+
+        if extended:
+            length = prefix[1]
+            counts[extended] += bin_counts(values[length:, extended], codes[length:],
+                                           edges[:, extended], n_classes)
+        if fresh:
+            def count_chunk(chunk: slice) -> Tuple[np.ndarray, np.ndarray]:
+                block = values[:, fresh[chunk]]
+                chunk_edges = quantile_edges(block[:edge_rows], self.n_bins)
+                return chunk_edges, bin_counts(block, codes, chunk_edges, n_classes)
+
+            chunks = self._chunks(len(fresh))
+            if self.n_jobs == 1 or len(chunks) == 1:
+                results = [count_chunk(chunk) for chunk in chunks]
+            else:
+                with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+                    results = list(executor.map(count_chunk, chunks))
+            for chunk, (chunk_edges, chunk_counts) in zip(chunks, results):
+                edges[:, fresh[chunk]] = chunk_edges
+                counts[fresh[chunk]] = chunk_counts
+
+        with self._lock:
+            window = (params, target)
+            self.windows[window] = (n, classes)
+            tables = self.tables.setdefault(window, {})
+            for j, digest in enumerate(digests):
+                tables[digest] = (edges[:, j].copy(), counts[j].copy())
+            self.scores.setdefault(window, {})
+            self._touch(window)
+
+        return binned_mutual_info(counts), len(extended)
+
+    def clear(self) -> None:
+        """Drop every cached score and count table."""
+        with self._lock:
+            self.scores = OrderedDict()
+            self.tables = {}
+            self.windows = {}
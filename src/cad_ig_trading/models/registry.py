@@ -0,0 +1,253 @@
+"""
+Model Registry
+
+Versioned on-disk bundles of trained ensemble strategies, loaded lazily.
+"""
+
+import numpy as np
+import os
+import json
+import shutil
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+import joblib
+import lightgbm as lgb
+import sklearn
+import xgboost as xgb
+import logging
+
+from .ensemble import WeeklyEnsembleStrategy
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_FORMAT_VERSION = 1
+
+
+def library_versions() -> Dict[str, str]:
+    """Versions of the libraries whose formats a bundle depends on."""
+    return {
+        'numpy': np.__version__,
+        'scikit-learn': sklearn.__version__,
+        'lightgbm': lgb.__version__,
+        'xgboost': xgb.__version__
+    }
+
+
+class LazyModel:
+    """
+    Stand-in for a fitted model that loads it on first use.
+
+    Any attribute access (predict_proba, booster_, ...) loads the model once
+    and is forwarded to it.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        """
+        Initialize LazyModel.
+
+        Args:
+            name: Model name, for logging
+            loader: Zero-argument function returning the model
+        """
+        self._name = name
+        self._loader = loader
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the model has been loaded."""
+        return self._model is not None
+
+    def load(self) -> Any:
+        """
+        Load the model if needed.
+
+        Returns:
+            The model
+        """
+        with self._lock:
+            if self._model is None:
+                self._model = self._loader()
+                logger.info(f"Loaded model {self._name}")
+        return self._model
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.load(), attr)
+
+
+class ModelRegistry:
+    """
+    Versioned bundles of trained WeeklyEnsembleStrategy instances.
+
+    Each version is a directory holding a meta.json (selected features,
+    weights, threshold, feature-selection estimator, bin edges and
+    missing-value flags, library versions) and one file per model: XGBoost
+    in its native UBJSON format, LightGBM and Random Forest as joblib pickles
+    of their scikit-learn estimators, so a loaded strategy can still be
+    updated. Versions are written to a temporary directory and renamed into
+    place, so readers never see a partial bundle.
+
+    Loading reads only meta.json and the bin edges; every model is a
+    LazyModel read on first predict. Joblib files are opened with
+    mmap_mode='r', so their numpy arrays are mapped from the page cache and
+    shared between processes loading the same version (scikit-learn copies
+    the node arrays of its trees out of the map when it rebuilds them).
+    """
+
+    def __init__(self, registry_dir: Union[str, Path] = "models/registry/weekly"):
+        """
+        Initialize ModelRegistry.
+
+        Args:
+            registry_dir: Directory holding one subdirectory per version
+        """
+        self.registry_dir = Path(registry_dir)
+
+    def versions(self) -> List[str]:
+        """
+        List saved versions, oldest first.
+
+        Returns:
+            Version names
+        """
+        if not self.registry_dir.exists():
+            return []
+        return sorted(path.name for path in self.registry_dir.iterdir()
+                      if path.is_dir() and path.name.startswith('v') and (path / 'meta.json').exists())
+
+    def latest(self) -> Optional[str]:
+        """Name of the newest version, or None if the registry is empty."""
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def read_meta(self, version: str) -> Dict:
+        """
+        Read the metadata of a version.
+
+        Args:
+            version: Version name
+
+        Returns:
+            Metadata dictionary
+        """
+        meta_path = self.registry_dir / version / 'meta.json'
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No model version {version} in {self.registry_dir}")
+        with open(meta_path, 'r', encoding='utf-8') as fh:
+            meta = json.load(fh)
+        if meta.get('format_version') != REGISTRY_FORMAT_VERSION:
+            raise ValueError(f"Model version {version} has unsupported format "
+                             f"{meta.get('format_version')}")
+        return meta
+
+    def save(self, strategy: WeeklyEnsembleStrategy, metadata: Optional[Dict] = None) -> str:
+        """
+        Save a trained strategy as a new version.
+
+        Args:
+            strategy: Trained strategy
+            metadata: Optional JSON-serializable information to store
+                with the bundle (training window, config, ...)
+
+        Returns:
+            Name of the new version
+        """
+        if strategy.model_lgbm is None or strategy.selected_features is None:
+            raise ValueError("Strategy must be trained before it can be saved")
+
+        latest = self.latest()
+        version = f"v{int(latest[1:]) + 1 if latest else 1:04d}"
+        entry = self.registry_dir / version
+        tmp_entry = entry.with_name(f"{entry.name}.tmp-{os.getpid()}")
+        if tmp_entry.exists():
+            shutil.rmtree(tmp_entry)
+        tmp_entry.mkdir(parents=True)
+
+        # Loaded models that were never used are saved from their files
+        models = {name: getattr(strategy, f'model_{name}') for name in ['lgbm', 'xgb', 'rf']}
+        models = {name: model.load() if isinstance(model, LazyModel) else model
+                  for name, model in models.items()}
+        joblib.dump(models['lgbm'], tmp_entry / 'lgbm.joblib')
+        models['xgb'].save_model(tmp_entry / 'xgb.ubj')
+        joblib.dump(models['rf'], tmp_entry / 'rf.joblib')
+
+        binner = strategy.binner
+        np.save(tmp_entry / 'bin_edges.npy', np.concatenate(binner.edges))
+
+        meta = {
+            'format_version': REGISTRY_FORMAT_VERSION,
+            'version': version,
+            'created': datetime.now(timezone.utc).isoformat(),
+            'libraries': library_versions(),
+            'n_features': strategy.n_features,
+            'threshold': strategy.threshold,
+            'mi_estimator': strategy.scorer.estimator,
+            'weights': strategy.weights,
+            'selected_features': strategy.selected_features,
+            'max_bins': binner.max_bins,
+            'bin_counts': [len(edges) for edges in binner.edges],
+            'bin_missing': binner.has_missing,
+            'update_estimators': strategy.update_estimators,
+            'fit_times': strategy.fit_times,
+            'metadata': metadata or {}
+        }
+        with open(tmp_entry / 'meta.json', 'w', encoding='utf-8') as fh:
+            json.dump(meta, fh, indent=2)
+
+        os.replace(tmp_entry, entry)
+        logger.info(f"Saved model version {version} to {entry}")
+        return version
+
+    def load(self, version: Optional[str] = None, n_jobs: Optional[int] = None) -> WeeklyEnsembleStrategy:
+        """
+        Load a saved strategy.
+
+        Args:
+            version: Version name (default the latest)
+            n_jobs: Core budget of the loaded strategy
+
+        Returns:
+            WeeklyEnsembleStrategy whose models load on first use
+        """
+        version = version or self.latest()
+        if version is None:
+            raise FileNotFoundError(f"No model versions in {self.registry_dir}")
+        meta = self.read_meta(version)
+        entry = self.registry_dir / version
+
+        for library, saved in meta['libraries'].items():
+            current = library_versions()[library]
+            if current != saved:
+                logger.warning(f"Model version {version} was saved with {library} {saved}, "
+                               f"running {current}")
+
+        strategy = WeeklyEnsembleStrategy(n_features=meta['n_features'], threshold=meta['threshold'],
+                                          n_jobs=n_jobs, mi_estimator=meta.get('mi_estimator', 'knn'))
+        strategy.weights = meta['weights']
+        strategy.selected_features = meta['selected_features']
+        strategy.update_estimators = meta['update_estimators']
+        strategy.fit_times = meta['fit_times']
+
+        binner = strategy.binner
+        binner.max_bins = meta['max_bins']
+        binner.columns = list(meta['selected_features'])
+        edges = np.load(entry / 'bin_edges.npy')
+        binner.edges = np.split(edges, np.cumsum(meta['bin_counts'])[:-1])
+        binner.has_missing = meta['bin_missing']
+
+        def load_xgb():
+            model = xgb.XGBClassifier()
+            model.load_model(entry / 'xgb.ubj')
+            return model
+
+        strategy.model_lgbm = LazyModel('lgbm', lambda: joblib.load(entry / 'lgbm.joblib', mmap_mode='r'))
+        strategy.model_xgb = LazyModel('xgb', load_xgb)
+        strategy.model_rf = LazyModel('rf', lambda: joblib.load(entry / 'rf.joblib', mmap_mode='r'))
+
+        logger.info(f"Opened model version {version} ({len(strategy.selected_features)} features)")
+        return strategy
@@ -0,0 +1,247 @@
+"""
+Training Scheduler
+
+Concurrent fitting of several models within one core budget.
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = Path('/sys/fs/cgroup')
+
+
+def _cgroup_cpu_limit(root: Path = CGROUP_ROOT) -> Optional[float]:
+    """
+    CPU quota of the process's cgroup in cores, or None without a limit.
+
+    Reads cpu.max (cgroup v2) or cpu.cfs_quota_us and cpu.cfs_period_us
+    (cgroup v1), which is where container CPU limits such as docker-compose
+    `cpus: '2'` end up.
+    """
+    try:
+        quota, period = (root / 'cpu.max').read_text().split()[:2]
+        if quota == 'max':
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int((root / 'cpu' / 'cpu.cfs_quota_us').read_text())
+        period = int((root / 'cpu' / 'cpu.cfs_period_us').read_text())
+        if quota <= 0 or period <= 0:
+            return None
+        return quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus() -> int:
+    """
+    Number of cores this process may use.
+
+    The CPUs the process is allowed to run on (its affinity mask), capped by
+    the cgroup CPU quota rounded up, so a container limited to 2 CPUs gets a
+    budget of 2 however many cores the host has.
+
+    Returns:
+        Core count, at least 1
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(cpus, 1)
+
+
+class ModelJob:
+    """
+    One model to fit.
+
+    cost and serial_fraction describe how long the fit takes: with t
+    threads it is expected to run for cost * (serial_fraction +
+    (1 - serial_fraction) / t) seconds (Amdahl's law). They only steer the
+    schedule; the scheduler replaces cost with the measured fit time after
+    every fit.
+    """
+
+    def __init__(self, name: str, build: Callable[[int], Any], cost: float = 1.0,
+                 serial_fraction: float = 0.5):
+        """
+        Initialize ModelJob.
+
+        Args:
+            name: Model name
+            build: Function of a thread count returning an unfitted
+                estimator that uses that many threads
+            cost: Estimated single-thread fit time in seconds
+            serial_fraction: Share of the fit that does not parallelize
+        """
+        self.name = name
+        self.build = build
+        self.cost = cost
+        self.serial_fraction = serial_fraction
+
+    def duration(self, threads: int) -> float:
+        """Expected fit time with the given number of threads."""
+        return self.cost * (self.serial_fraction + (1 - self.serial_fraction) / threads)
+
+
+def _partitions(items: List) -> List[List[List]]:
+    """Every partition of items into non-empty groups."""
+    if not items:
+        return [[]]
+    first, rest = items[0], items[1:]
+    result = []
+    for partition in _partitions(rest):
+        result.append([[first]] + partition)
+        for i in range(len(partition)):
+            result.append(partition[:i] + [[first] + partition[i]] + partition[i + 1:])
+    return result
+
+
+def split_threads(jobs: List[ModelJob], budget: int) -> Dict[str, int]:
+    """
+    Split a core budget between jobs that run side by side.
+
+    Every job gets one thread and the rest are handed out in proportion to
+    cost (largest remainder first), so the slowest fits get the most cores.
+
+    Args:
+        jobs: Jobs to run concurrently (at most budget of them)
+        budget: Number of cores
+
+    Returns:
+        Dictionary mapping job name to thread count, summing to budget
+    """
+    threads = {job.name: 1 for job in jobs}
+    spare = budget - len(jobs)
+    total = sum(job.cost for job in jobs)
+    if spare <= 0 or total <= 0:
+        return threads
+
+    shares = {job.name: spare * job.cost / total for job in jobs}
+    for name, share in shares.items():
+        threads[name] += int(share)
+    left = budget - sum(threads.values())
+    for name in sorted(shares, key=lambda name: shares[name] - int(shares[name]), reverse=True)[:left]:
+        threads[name] += 1
+    return threads
+
+
+class TrainingScheduler:
+    """
+    Fits models concurrently without using more than a fixed number of cores.
+
+    The jobs are split into stages that run one after another; the models
+    of a stage are fitted side by side on threads, each with its share of
+    the budget as its own thread count, so the stage never runs more
+    threads than there are cores in the budget. The stages are chosen to
+    minimize the expected wall-clock time from each job's cost and serial
+    fraction: models that scale well with cores are given the whole budget
+    on their own, while models that do not are fitted next to each other.
+    Measured fit times are fed back into the costs, so the schedule of a
+    walk-forward refit adapts to the data it is trained on.
+    """
+
+    def __init__(self, n_jobs: Optional[int] = None):
+        """
+        Initialize TrainingScheduler.
+
+        Args:
+            n_jobs: Core budget shared by all models. None or -1 uses every
+                CPU available to the process (see available_cpus).
+        """
+        if n_jobs is None or n_jobs == -1:
+            n_jobs = available_cpus()
+        if n_jobs < 1:
+            raise ValueError(f"Core budget must be at least 1, got {n_jobs}")
+        self.n_jobs = n_jobs
+        self.stages = []
+        self.threads = {}
+        self.fit_times = {}
+
+    def plan(self, jobs: List[ModelJob]) -> Tuple[List[List[ModelJob]], Dict[str, int]]:
+        """
+        Choose the stages and thread counts with the lowest expected time.
+
+        Args:
+            jobs: Jobs to schedule
+
+        Returns:
+            Tuple of (stages, dictionary mapping job name to thread count)
+        """
+        best = None
+        for partition in _partitions(list(jobs)):
+            if any(len(stage) > self.n_jobs for stage in partition):
+                continue
+            # Longest stages first, so the slowest fits start earliest
+            partition.sort(key=lambda stage: -max(job.cost for job in stage))
+            threads = {}
+            for stage in partition:
+                threads.update(split_threads(stage, self.n_jobs))
+            expected = sum(max(job.duration(threads[job.name]) for job in stage) for stage in partition)
+            key = (expected, len(partition))
+            if best is None or key < best[0]:
+                best = (key, partition, threads)
+        return best[1], best[2]
+
+    def fit(self, jobs: List[ModelJob], X, y,
+            fit_params: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Fit every job on the same data.
+
+        Args:
+            jobs: Jobs to fit
+            X: Training features
+            y: Training target
+            fit_params: Optional keyword arguments to the fit() of each job,
+                by job name
+
+        Returns:
+            Dictionary mapping job name to fitted estimator, in job order
+        """
+        self.stages, self.threads = self.plan(jobs)
+        self.fit_times = {}
+        fit_params = fit_params or {}
+        lock = threading.Lock()
+        models = {}
+
+        def fit_one(job: ModelJob) -> None:
+            start = time.perf_counter()
+            model = job.build(self.threads[job.name])
+            model.fit(X, y, **fit_params.get(job.name, {}))
+            elapsed = time.perf_counter() - start
+            with lock:
+                models[job.name] = model
+                self.fit_times[job.name] = elapsed
+            logger.info(f"  Fitted {job.name} in {elapsed:.2f}s on {self.threads[job.name]} threads")
+
+        start = time.perf_counter()
+        for stage in self.stages:
+            if len(stage) == 1:
+                fit_one(stage[0])
+                continue
+            with ThreadPoolExecutor(max_workers=len(stage)) as executor:
+                for future in [executor.submit(fit_one, job) for job in stage]:
+                    future.result()
+
+        for job in jobs:
+            # Back out the single-thread cost for the next plan
+            threads = self.threads[job.name]
+            job.cost = self.fit_times[job.name] / (job.serial_fraction + (1 - job.serial_fraction) / threads)
+
+        stages = ' then '.join('+'.join(job.name for job in stage) for stage in self.stages)
+        logger.info(f"Trained {len(jobs)} models in {time.perf_counter() - start:.2f}s "
+                    f"on {self.n_jobs} cores ({stages})")
+        return {job.name: models[job.name] for job in jobs}
@@ -0,0 +1,187 @@
+"""
+Walk-Forward Trainer
+
+Expanding-window walk-forward retraining of the weekly ensemble, producing
+out-of-sample probabilities for every step.
+"""
+
+import pandas as pd
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+import yaml
+import logging
+
+from .ensemble import WeeklyEnsembleStrategy
+
+logger = logging.getLogger(__name__)
+
+
+class WalkForwardTrainer:
+    """
+    Walk-forward retraining with warm-started models.
+
+    The first step trains on the initial window and predicts the next
+    step_size rows; every later step extends the training window by those
+    rows and predicts the next ones. A full refit reselects the features,
+    relearns the bin edges and trains every model from scratch. In between,
+    a warm step keeps the selected features and bin edges and continues the
+    fitted models on the extended window (WeeklyEnsembleStrategy.update):
+    the boosters add trees from their current state and Random Forest grows
+    extra trees, so a step costs a fraction of a refit. Full refits run on
+    the first step, every full_refit_every steps (bounding the growth of
+    the models and letting the feature set follow the data), and whenever
+    a warm step fails.
+    """
+
+    def __init__(self, strategy: Optional[WeeklyEnsembleStrategy] = None,
+                 initial_train_size: float = 0.5, step_size: int = 252,
+                 min_train_samples: int = 500, embargo: int = 5,
+                 warm_start: bool = True, full_refit_every: int = 5,
+                 warm_estimators: int = 10):
+        """
+        Initialize WalkForwardTrainer.
+
+        Args:
+            strategy: Strategy to train (default WeeklyEnsembleStrategy())
+            initial_train_size: Fraction of the dataset in the first
+                training window
+            step_size: Rows predicted per step (trading days)
+            min_train_samples: Minimum rows in the first training window
+            embargo: Rows dropped from the end of every training window.
+                The target looks 5 days ahead, so the last rows' labels
+                overlap the rows being predicted.
+            warm_start: Continue the models between full refits; False
+                refits at every step
+            full_refit_every: Steps between full refits
+            warm_estimators: Trees each model adds on a warm step
+        """
+        self.strategy = strategy or WeeklyEnsembleStrategy()
+        self.initial_train_size = initial_train_size
+        self.step_size = step_size
+        self.min_train_samples = min_train_samples
+        self.embargo = embargo
+        self.warm_start = warm_start
+        self.full_refit_every = full_refit_every
+        self.warm_estimators = warm_estimators
+        self.history = []
+
+    @classmethod
+    def from_config(cls, config_path: Union[str, Path],
+                    strategy: Optional[WeeklyEnsembleStrategy] = None) -> 'WalkForwardTrainer':
+        """
+        Create a trainer from the strategy.training section of a config file.
+
+        Args:
+            config_path: Path to a strategy config YAML file
+            strategy: Strategy to train (default WeeklyEnsembleStrategy()
+                with the core budget of strategy.training.n_jobs)
+
+        Returns:
+            Configured WalkForwardTrainer
+        """
+        with open(config_path, 'r', encoding='utf-8') as fh:
+            config = yaml.safe_load(fh)
+
+        training = config.get('strategy', {}).get('training', {})
+        walk_forward = training.get('walk_forward', {})
+
+        if strategy is None:
+            strategy = WeeklyEnsembleStrategy(n_jobs=training.get('n_jobs'))
+
+        return cls(
+            strategy=strategy,
+            initial_train_size=walk_forward.get('initial_train_size', 0.5),
+            step_size=walk_forward.get('step_size', training.get('retraining_frequency', 252)),
+            min_train_samples=training.get('min_training_samples', 500),
+            warm_start=walk_forward.get('warm_start', True),
+            full_refit_every=walk_forward.get('full_refit_every', 5),
+            warm_estimators=walk_forward.get('warm_estimators', 10),
+        )
+
+    def splits(self, n: int) -> List[Tuple[int, int]]:
+        """
+        Walk-forward steps over a dataset.
+
+        Args:
+            n: Number of rows
+
+        Returns:
+            List of (train_end, test_end) row positions; step i trains on
+            rows [0, train_end - embargo) and predicts rows [train_end, test_end)
+        """
+        start = max(int(n * self.initial_train_size), self.min_train_samples)
+        return [(train_end, min(train_end + self.step_size, n))
+                for train_end in range(start, n, self.step_size)]
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Walk forward over a feature frame.
+
+        Args:
+            df: DataFrame with features
+
+        Returns:
+            DataFrame with Date, probability, step and mode ('full' or
+            'warm') for every out-of-sample row
+        """
+        strategy = self.strategy
+        df_ml, valid_features = strategy.prepare_data(df)
+        steps = self.splits(len(df_ml))
+        logger.info(f"Walking forward over {len(steps)} steps of {self.step_size} rows...")
+
+        self.history = []
+        results = []
+        last_refit = None
+        start = time.perf_counter()
+        for step, (train_end, test_end) in enumerate(steps):
+            step_start = time.perf_counter()
+            train_df = df_ml.iloc[:train_end - self.embargo]
+            test_df = df_ml.iloc[train_end:test_end]
+            y_train = train_df['binary_target']
+
+            mode = 'full'
+            if self.warm_start and last_refit is not None and step - last_refit < self.full_refit_every:
+                try:
+                    strategy.update(train_df[strategy.selected_features], y_train, self.warm_estimators)
+                    mode = 'warm'
+                except Exception as e:
+                    logger.warning(f"Warm update failed at step {step}, refitting: {e}")
+            if mode == 'full':
+                X_train = strategy.select_features(train_df[valid_features], y_train)
+                strategy.train(X_train, y_train)
+                last_refit = step
+
+            probs = strategy.predict_proba(test_df[strategy.selected_features])
+            results.append(pd.DataFrame({
+                'Date': test_df['Date'].values,
+                'probability': probs,
+                'step': step,
+                'mode': mode
+            }, index=test_df.index))
+
+            elapsed = time.perf_counter() - step_start
+            self.history.append({
+                'step': step,
+                'train_rows': len(train_df),
+                'test_rows': len(test_df),
+                'mode': mode,
+                'seconds': elapsed
+            })
+            logger.info(f"Step {step} ({mode}): trained on {len(train_df)} rows, "
+                        f"predicted {len(test_df)} in {elapsed:.2f}s")
+
+        logger.info(f"Walk-forward complete in {time.perf_counter() - start:.2f}s")
+
+        if not results:
+            return pd.DataFrame(columns=['Date', 'probability', 'step', 'mode'])
+        return pd.concat(results)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Get per-step training statistics of the last run.
+
+        Returns:
+            DataFrame with one row per step
+        """
+        return pd.DataFrame(self.history)
@@ -0,0 +1,22 @@
+"""
+Shared test fixtures.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from cad_ig_trading.data.loader import DataLoader  # noqa: E402
+
+RAW_DATA_PATH = ROOT / "data" / "raw" / "with_er_daily.csv"
+
+
+@pytest.fixture(scope="session")
+def raw_data() -> pd.DataFrame:
+    """Bundled daily panel as loaded by DataLoader."""
+    return DataLoader(RAW_DATA_PATH).load()
@@ -0,0 +1,39 @@
+"""
+Tests for the data loader.
+"""
+
+import pytest
+import yaml
+
+from cad_ig_trading.data.loader import DataLoader
+from cad_ig_trading.data.validation import DataValidationError
+
+
+def write_config(path, data_path, **validation):
+    config = {'data': {'path': str(data_path), 'validation': validation}}
+    path.write_text(yaml.safe_dump(config), encoding='utf-8')
+    return path
+
+
+def test_from_config_reads_path_and_validator(tmp_path, raw_data):
+    data_path = tmp_path / "panel.csv"
+    raw_data.iloc[:100].to_csv(data_path, index=False)
+    config_path = write_config(tmp_path / "config.yaml", data_path, max_missing_pct=0.05)
+
+    loader = DataLoader.from_config(config_path)
+
+    assert loader.data_path == data_path
+    assert loader.validator is not None
+    assert loader.validator.max_missing_pct == 0.05
+    assert len(loader.load()) == 100
+
+
+def test_from_config_validates_loads(tmp_path, raw_data):
+    data_path = tmp_path / "panel.csv"
+    df = raw_data.iloc[:100].copy()
+    df.loc[df.index[:20], 'vix'] = None
+    df.to_csv(data_path, index=False)
+    config_path = write_config(tmp_path / "config.yaml", data_path, max_missing_pct=0.05)
+
+    with pytest.raises(DataValidationError):
+        DataLoader.from_config(config_path).load()
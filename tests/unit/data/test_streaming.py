@@ -0,0 +1,48 @@
+"""
+Tests for the streaming preprocessor.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cad_ig_trading.data.preprocessor import DataPreprocessor
+from cad_ig_trading.data.streaming import StreamingPreprocessor
+
+
+@pytest.fixture(scope="module")
+def dirty_data(raw_data):
+    """Bundled data with missing and infinite runs shorter and longer than max_fill."""
+    df = raw_data.copy()
+    rng = np.random.default_rng(0)
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    for col in rng.choice(numeric_cols, size=8, replace=False):
+        for length in [1, 3, 5, 6, 12]:
+            start = rng.integers(0, len(df) - length)
+            df.loc[df.index[start:start + length], col] = np.nan
+        df.loc[df.index[rng.integers(0, len(df))], col] = np.inf
+        df.loc[df.index[rng.integers(0, len(df))], col] = -np.inf
+    return df
+
+
+@pytest.mark.parametrize("handle_outliers", [False, True])
+def test_transform_matches_batch(dirty_data, handle_outliers):
+    preprocessor = DataPreprocessor()
+    batch = preprocessor.preprocess(dirty_data, add_target=False, handle_outliers_flag=handle_outliers)
+
+    streaming = StreamingPreprocessor.from_frame(dirty_data, winsorizer=preprocessor.winsorizer)
+    streamed = streaming.transform(dirty_data)
+
+    pd.testing.assert_frame_equal(streamed, batch, check_exact=True)
+
+
+@pytest.mark.parametrize("handle_outliers", [False, True])
+def test_update_matches_batch(dirty_data, handle_outliers):
+    preprocessor = DataPreprocessor()
+    batch = preprocessor.preprocess(dirty_data, add_target=False, handle_outliers_flag=handle_outliers)
+
+    streaming = StreamingPreprocessor.from_frame(dirty_data, winsorizer=preprocessor.winsorizer)
+    streamed = pd.DataFrame([streaming.update(row) for _, row in dirty_data.iterrows()])
+    streamed = streamed.astype(batch.dtypes.to_dict())
+
+    pd.testing.assert_frame_equal(streamed, batch, check_exact=True)
@@ -0,0 +1,56 @@
+"""
+Tests for the online feature engine.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cad_ig_trading.data.preprocessor import DataPreprocessor
+from cad_ig_trading.features.online import OnlineFeatureEngine
+from cad_ig_trading.features.pipeline import AllFeaturesEngineer
+
+N_STREAMED = 50
+
+
+@pytest.fixture(scope="module")
+def preprocessed(raw_data):
+    return DataPreprocessor().preprocess(raw_data, add_target=False)
+
+
+@pytest.fixture(scope="module")
+def batch(preprocessed):
+    return AllFeaturesEngineer().create_all_features(preprocessed)
+
+
+@pytest.fixture(scope="module")
+def online(preprocessed):
+    """Warm up on the history, then stream the last rows one at a time."""
+    engine = OnlineFeatureEngine()
+    history = engine.warm_up(preprocessed.iloc[:-N_STREAMED])
+    streamed = pd.DataFrame([engine.update(row) for _, row in preprocessed.iloc[-N_STREAMED:].iterrows()])
+    return pd.concat([history, streamed])
+
+
+def test_columns_match(batch, online):
+    assert list(online.columns) == list(batch.columns)
+    assert online.index.equals(batch.index)
+    assert (online['Date'] == batch['Date']).all()
+
+
+def test_features_match(batch, online):
+    """Every feature, streamed or warmed up, equals the batch build bit for bit."""
+    mismatched = {}
+    for col in batch.columns.drop('Date'):
+        expected = batch[col].to_numpy(dtype=np.float64)
+        actual = online[col].to_numpy(dtype=np.float64)
+
+        if not np.array_equal(np.isnan(expected), np.isnan(actual)):
+            mismatched[col] = 'missing values differ'
+            continue
+
+        differs = ~np.isnan(expected) & (actual != expected)
+        if differs.any():
+            mismatched[col] = int(differs.sum())
+
+    assert not mismatched, mismatched
@@ -0,0 +1,38 @@
+"""
+Tests for the panel features.
+"""
+
+import pandas as pd
+import pytest
+
+from cad_ig_trading.data.preprocessor import DataPreprocessor
+from cad_ig_trading.features.panel import PANEL_ASSETS, PANEL_FEATURES, panel_features
+from cad_ig_trading.features.pipeline import AllFeaturesEngineer
+
+
+@pytest.fixture(scope="module")
+def preprocessed(raw_data):
+    return DataPreprocessor().preprocess(raw_data, add_target=False)
+
+
+@pytest.fixture(scope="module")
+def standard(preprocessed):
+    return AllFeaturesEngineer().create_all_features(preprocessed)
+
+
+@pytest.mark.parametrize("assets", [['cad_ig_er_index'], PANEL_ASSETS], ids=['single', 'all'])
+def test_panel_matches_standard_build(preprocessed, standard, assets):
+    features = panel_features(preprocessed[assets])
+
+    for name in PANEL_FEATURES:
+        pd.testing.assert_series_equal(features[name]['cad_ig_er_index'], standard[name],
+                                       check_exact=True, check_names=False)
+
+
+def test_panel_group_matches_standard_build(preprocessed, standard):
+    built = AllFeaturesEngineer(panel_assets=PANEL_ASSETS).create_all_features(preprocessed)
+
+    pd.testing.assert_frame_equal(built[standard.columns], standard, check_exact=True)
+    for name in PANEL_FEATURES:
+        pd.testing.assert_series_equal(built[f'cad_ig_er_index_{name}'], standard[name],
+                                       check_exact=True, check_names=False)
@@ -0,0 +1,40 @@
+"""
+Tests for the feature pipeline.
+"""
+
+import pandas as pd
+import pytest
+
+from cad_ig_trading.data.preprocessor import DataPreprocessor
+from cad_ig_trading.features.pipeline import AllFeaturesEngineer
+
+
+@pytest.fixture(scope="module")
+def preprocessed(raw_data):
+    return DataPreprocessor().preprocess(raw_data, add_target=False)
+
+
+@pytest.fixture(scope="module")
+def full(preprocessed):
+    return AllFeaturesEngineer().create_all_features(preprocessed)
+
+
+@pytest.mark.parametrize("features", [
+    ['momentum_20d_rank'],
+    ['cad_us_ig_relative_momentum', 'cad_oas_vix_corr_60d'],
+    ['cross_asset_pc1_share_60d', 'returns_kurt_60d'],
+    ['high_vol_x_momentum', 'volatility_20d_lag_5', 'drawdown_duration'],
+    ['vix_regime_x_momentum', 'cad_oas_range_position', 'down_streak'],
+])
+def test_pruned_build_matches_full_build(preprocessed, full, features):
+    pruned = AllFeaturesEngineer().create_all_features(preprocessed, features=features)
+
+    assert set(features) <= set(pruned.columns)
+    assert len(pruned.columns) < len(full.columns)
+    for col in pruned.columns:
+        pd.testing.assert_series_equal(pruned[col], full[col], check_exact=True)
+
+
+def test_pruned_build_rejects_unknown_features(preprocessed):
+    with pytest.raises(ValueError, match="Unknown features"):
+        AllFeaturesEngineer().create_all_features(preprocessed, features=['no_such_feature'])
@@ -0,0 +1,102 @@
+"""
+Tests for the run-length kernels against the pandas groupby/cumsum idioms
+they replace.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cad_ig_trading.features.base import calculate_drawdown
+from cad_ig_trading.features.run_length import (
+    cumsum_reset, drawdown_duration, drawdown_with_duration, run_length, streak
+)
+
+
+def run_ids(series):
+    return (series != series.shift()).cumsum()
+
+
+def reference_run_length(series):
+    return series.groupby(run_ids(series)).cumcount() + 1
+
+
+def reference_streak(flags):
+    flags = flags.astype(int)
+    return flags.groupby(run_ids(flags)).cumsum()
+
+
+def reference_duration(drawdown):
+    return (drawdown < 0).astype(int).groupby((drawdown >= 0).cumsum()).cumsum()
+
+
+def random_walk(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))), name='price')
+
+
+def with_missing(series, seed):
+    series = series.copy()
+    rng = np.random.default_rng(seed)
+    series.iloc[:3] = np.nan
+    series.iloc[rng.choice(len(series), size=len(series) // 10, replace=False)] = np.nan
+    series.iloc[-1] = np.nan
+    return series
+
+
+PRICES = {
+    'random_walk': random_walk(500, 0),
+    'missing': with_missing(random_walk(500, 1), 1),
+    'all_equal': pd.Series(np.full(50, 100.0), name='price'),
+    'all_missing': pd.Series(np.full(20, np.nan), name='price'),
+    'single_row': pd.Series([100.0], name='price'),
+    'empty': pd.Series([], dtype=np.float64, name='price'),
+}
+
+
+@pytest.fixture(params=list(PRICES), ids=list(PRICES))
+def prices(request):
+    return PRICES[request.param]
+
+
+def test_run_length_matches_groupby(prices):
+    rounded = prices.round(0)
+    expected = reference_run_length(rounded).astype(np.int64)
+    pd.testing.assert_series_equal(run_length(rounded), expected, check_names=False)
+
+
+def test_streak_matches_groupby(prices):
+    up_day = (prices.diff() > 0).astype(int)
+    pd.testing.assert_series_equal(streak(up_day), reference_streak(up_day), check_names=False)
+    pd.testing.assert_series_equal(streak(up_day == 0), reference_streak(1 - up_day), check_names=False)
+
+
+def test_drawdown_matches_cummax_and_groupby(prices):
+    dd, duration = drawdown_with_duration(prices)
+    expected = calculate_drawdown(prices)
+
+    pd.testing.assert_series_equal(dd, expected, check_exact=True)
+    pd.testing.assert_series_equal(duration, reference_duration(expected).astype(np.int64),
+                                   check_names=False)
+    pd.testing.assert_series_equal(drawdown_duration(expected), duration)
+
+
+def test_cumsum_reset_matches_groupby(prices):
+    values = (prices.fillna(0) * 100).round().astype(np.int64)
+    reset = prices.isna() | (prices.diff() > 0)
+    expected = values.groupby(reset.cumsum()).cumsum()
+    pd.testing.assert_series_equal(cumsum_reset(values, reset), expected, check_names=False)
+
+
+def test_block_matches_columns():
+    block = pd.DataFrame({name: PRICES[name].iloc[:50].reset_index(drop=True)
+                          for name in ['random_walk', 'missing', 'all_equal', 'all_missing']})
+    dd, duration = drawdown_with_duration(block)
+    up_day = (block.diff() > 0).astype(int)
+    streaks = streak(up_day)
+
+    for col in block.columns:
+        col_dd, col_duration = drawdown_with_duration(block[col])
+        pd.testing.assert_series_equal(dd[col], col_dd, check_exact=True)
+        pd.testing.assert_series_equal(duration[col], col_duration)
+        pd.testing.assert_series_equal(streaks[col], streak(up_day[col]))
@@ -0,0 +1,91 @@
+"""
+Tests for the feature store.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cad_ig_trading.data.preprocessor import DataPreprocessor
+from cad_ig_trading.features.base import FeatureGroup, FeatureSpec
+from cad_ig_trading.features.pipeline import AllFeaturesEngineer
+from cad_ig_trading.features.store import FeatureStore
+
+
+def toy_groups(scale=2.0):
+    """Three groups: 'derived' reads 'source', 'other' is independent."""
+    return [
+        FeatureGroup('source', [FeatureSpec('x_scaled', ['x'], lambda c: c.series('x') * scale)]),
+        FeatureGroup('derived', [FeatureSpec('x_scaled_diff', ['x_scaled'], lambda c: c.series('x_scaled').diff())]),
+        FeatureGroup('other', [FeatureSpec('y_lag_1', ['y'], lambda c: c.shift('y', 1))]),
+    ]
+
+
+@pytest.fixture
+def toy_data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({'x': rng.normal(size=200), 'y': rng.normal(size=200)})
+
+
+def assert_features_equal(actual, expected):
+    assert list(actual) == list(expected)
+    for name in expected:
+        pd.testing.assert_series_equal(actual[name], expected[name], check_exact=True, check_names=False)
+
+
+def test_round_trip(tmp_path, raw_data):
+    df = DataPreprocessor().preprocess(raw_data, add_target=False)
+    engineer = AllFeaturesEngineer()
+    groups = engineer.feature_groups()
+    expected = engineer.create_all_features(df)
+
+    store = FeatureStore(tmp_path)
+    computed = store.build(groups, df)
+    assert store.computed == [group.name for group in groups]
+
+    reloaded = FeatureStore(tmp_path)
+    loaded = reloaded.build(groups, df)
+    assert reloaded.computed == []
+    assert reloaded.loaded == [group.name for group in groups]
+    assert_features_equal(loaded, computed)
+    for name in loaded:
+        pd.testing.assert_series_equal(loaded[name], expected[name], check_exact=True, check_names=False)
+
+
+def test_fingerprint_change_recomputes_group_and_downstream(tmp_path, toy_data):
+    store = FeatureStore(tmp_path)
+    store.build(toy_groups(), toy_data)
+
+    changed = store.build(toy_groups(scale=3.0), toy_data)
+
+    assert store.computed == ['source', 'derived']
+    assert store.loaded == ['other']
+    assert_features_equal(changed, FeatureStore(tmp_path / 'fresh').build(toy_groups(scale=3.0), toy_data))
+
+
+def test_data_change_is_full_miss(tmp_path, toy_data):
+    store = FeatureStore(tmp_path)
+    store.build(toy_groups(), toy_data)
+
+    changed_data = toy_data.copy()
+    changed_data.loc[100, 'y'] += 1.0
+    store.build(toy_groups(), changed_data)
+
+    assert store.computed == ['source', 'derived', 'other']
+    assert store.loaded == []
+
+
+def test_truncated_column_is_miss(tmp_path, toy_data):
+    store = FeatureStore(tmp_path)
+    expected = store.build(toy_groups(), toy_data)
+
+    column = next((tmp_path / 'other').glob('*.bin'))
+    column.write_bytes(column.read_bytes()[:-8])
+    rebuilt = store.build(toy_groups(), toy_data)
+
+    assert store.computed == ['other']
+    assert store.loaded == ['source', 'derived']
+    assert_features_equal(rebuilt, expected)
+
+    store.build(toy_groups(), toy_data)
+    assert store.loaded == ['source', 'derived', 'other']
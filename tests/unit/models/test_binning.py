@@ -0,0 +1,72 @@
+"""
+Tests for the feature binner.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cad_ig_trading.models.binning import MISSING_CODE, FeatureBinner
+
+
+@pytest.fixture
+def features():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'continuous': rng.normal(size=1000),
+        'binary': rng.integers(0, 2, size=1000).astype(float),
+        'gappy': rng.normal(size=1000),
+    })
+
+
+def test_few_distinct_values_binned_losslessly(features):
+    binner = FeatureBinner()
+    codes = binner.fit_transform(features)
+
+    assert codes.dtype == np.uint8
+    np.testing.assert_array_equal(codes[:, 1], features['binary'].to_numpy())
+    assert binner.n_bins[0] == binner.max_bins
+
+
+def test_missing_values_get_reserved_code(features):
+    features.loc[::10, 'gappy'] = np.nan
+    binner = FeatureBinner()
+    codes = binner.fit_transform(features)
+
+    assert not np.isnan(np.concatenate(binner.edges)).any()
+    missing = features['gappy'].isna().to_numpy()
+    assert (codes[missing, 2] == MISSING_CODE).all()
+    assert (codes[~missing, 2] < binner.max_bins).all()
+
+    live = features.iloc[:3].copy()
+    live['gappy'] = np.nan
+    assert (binner.transform(live)[:, 2] == MISSING_CODE).all()
+
+
+def test_unseen_missing_values_raise(features):
+    binner = FeatureBinner()
+    binner.fit_transform(features)
+
+    live = features.iloc[:3].copy()
+    live.loc[live.index[0], 'continuous'] = np.nan
+    with pytest.raises(ValueError, match='continuous'):
+        binner.transform(live)
+
+
+def test_extended_window_bins_only_new_rows(features, monkeypatch):
+    binner = FeatureBinner()
+    binner.fit_transform(features.iloc[:800])
+
+    binned_rows = []
+    bin_rows = binner._bin
+    monkeypatch.setattr(binner, '_bin', lambda values: binned_rows.append(len(values)) or bin_rows(values))
+    extended = binner.transform(features)
+    again = binner.transform(features)
+
+    assert binned_rows == [200]
+    assert again is extended
+
+    reference = FeatureBinner()
+    reference.edges, reference.columns = binner.edges, binner.columns
+    reference.has_missing = binner.has_missing
+    np.testing.assert_array_equal(extended, reference.transform(features))
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+Tests for the mutual-information scorer.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cad_ig_trading.models.feature_scoring import MutualInfoScorer
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(2000, 6)), columns=[f'f{j}' for j in range(6)])
+    y = (X['f0'] + rng.normal(size=2000) > 0).astype(int)
+    return X, y
+
+
+def test_binned_scores_do_not_depend_on_scoring_order(data):
+    X, y = data
+    scorer = MutualInfoScorer(estimator='binned', n_jobs=1)
+    lengths = [1000, 1050, 1100, 1700, 2000]
+    assert scorer.edge_rows(1000) == scorer.edge_rows(1100) < scorer.edge_rows(1700)
+
+    walked = [scorer.score(X.iloc[:n], y.iloc[:n]) for n in lengths]
+    assert scorer.cache_stats['extended'] > 0
+
+    for n, scores in zip(lengths, walked):
+        fresh = MutualInfoScorer(estimator='binned', n_jobs=1).score(X.iloc[:n], y.iloc[:n])
+        pd.testing.assert_series_equal(scores, fresh, check_exact=True)
+
+
+def test_caches_keep_recent_windows(data):
+    X, y = data
+    scorer = MutualInfoScorer(estimator='binned', n_jobs=1, max_windows=2)
+    for n in [500, 600, 700]:
+        scorer.score(X.iloc[:n], y.iloc[:n])
+
+    assert len(scorer.scores) == len(scorer.tables) == len(scorer.windows) == 2
+    assert [length for length, _ in scorer.windows.values()] == [600, 700]
+
+    scorer.score(X.iloc[:700], y.iloc[:700])
+    assert scorer.cache_stats['hits'] == X.shape[1]